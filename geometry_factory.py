@@ -16,13 +16,17 @@ import numpy as np
 def update_transform_for_actor(actor, transform_matrix):
     """更新 actor 的变换矩阵
 
+    已有 vtkTransform 时原地写入矩阵，否则新建一个。
+
     Args:
         actor: VTK actor
         transform_matrix: 4x4 numpy 变换矩阵
     """
-    vtk_transform = vtk.vtkTransform()
-    vtk_transform.SetMatrix(transform_matrix.flatten())
-    actor.SetUserTransform(vtk_transform)
+    vtk_transform = actor.GetUserTransform()
+    if vtk_transform is None or not vtk_transform.IsA('vtkTransform'):
+        vtk_transform = vtk.vtkTransform()
+        actor.SetUserTransform(vtk_transform)
+    vtk_transform.SetMatrix(np.ascontiguousarray(transform_matrix, dtype=np.float64).ravel())
 
 
 class GeometryFactory:
@@ -154,7 +158,7 @@ class GeometryFactory:
             transform_matrix: 4x4 numpy 变换矩阵
         """
         vtk_transform = vtk.vtkTransform()
-        vtk_transform.SetMatrix(transform_matrix.flatten())
+        vtk_transform.SetMatrix(transform_matrix.ravel())
         actor.SetUserTransform(vtk_transform)
 
     @staticmethod
@@ -435,7 +439,7 @@ class GeometryFactory:
         vtk_transform = vtk.vtkTransform()
         if isinstance(position, np.ndarray) and position.shape == (4, 4):
             # 是变换矩阵
-            vtk_transform.SetMatrix(position.flatten())
+            vtk_transform.SetMatrix(position.ravel())
         else:
             # 是位置向量
             vtk_transform.Translate(position[0], position[1], position[2])
@@ -536,7 +540,7 @@ class GeometryFactory:
 
         # 应用世界坐标变换
         vtk_transform = vtk.vtkTransform()
-        vtk_transform.SetMatrix(transform_matrix.flatten())
+        vtk_transform.SetMatrix(transform_matrix.ravel())
         assembly.SetUserTransform(vtk_transform)
 
         return assembly
@@ -580,8 +584,6 @@ class GeometryFactory:
         Returns:
             vtkAssembly: 组合 actor
         """
-        import math
-
         assembly = vtk.vtkAssembly()
 
         # 1. 主体圆柱 - 洋红色
@@ -649,7 +651,23 @@ class GeometryFactory:
         torus_actor.SetUserTransform(torus_transform)
         assembly.AddPart(torus_actor)
 
-        # 创建世界坐标变换
+        assembly.SetUserTransform(
+            GeometryFactory._joint_axis_world_transform(joint_frame, joint_axis_local))
+        return assembly
+
+    @staticmethod
+    def _joint_axis_world_transform(joint_frame, joint_axis_local):
+        """计算把局部 +Y 方向的关节轴模型放到世界坐标的 vtkTransform
+
+        Args:
+            joint_frame: 4x4 关节坐标系变换矩阵
+            joint_axis_local: 局部坐标系中的轴方向 [x, y, z]
+
+        Returns:
+            vtkTransform
+        """
+        import math
+
         vtk_transform = vtk.vtkTransform()
         joint_position = joint_frame[:3, 3]
 
@@ -669,6 +687,131 @@ class GeometryFactory:
                 axis_rot = cross / np.linalg.norm(cross)
                 vtk_transform.RotateWXYZ(math.degrees(angle),
                                          axis_rot[0], axis_rot[1], axis_rot[2])
+        return vtk_transform
 
-        assembly.SetUserTransform(vtk_transform)
-        return assembly
+    # (axis_length, radius) -> 局部坐标下的关节轴箭头模板 vtkPolyData
+    _joint_axis_arrow_templates = {}
+
+    @staticmethod
+    def _colored_piece(source_output, transform, rgba):
+        """对几何体施加局部变换并附加逐点 RGBA 颜色"""
+        tf_filter = vtk.vtkTransformPolyDataFilter()
+        tf_filter.SetInputData(source_output)
+        tf_filter.SetTransform(transform)
+        tf_filter.Update()
+        piece = vtk.vtkPolyData()
+        piece.ShallowCopy(tf_filter.GetOutput())
+
+        colors = vtk.vtkUnsignedCharArray()
+        colors.SetName("Colors")
+        colors.SetNumberOfComponents(4)
+        n_points = piece.GetNumberOfPoints()
+        colors.SetNumberOfTuples(n_points)
+        for i in range(n_points):
+            colors.SetTypedTuple(i, rgba)
+        piece.GetPointData().SetScalars(colors)
+        return piece
+
+    @staticmethod
+    def _joint_axis_arrow_template(axis_length, radius):
+        """构建（并缓存）与 create_joint_axis_arrow 外观一致的局部箭头模板"""
+        key = (axis_length, radius)
+        template = GeometryFactory._joint_axis_arrow_templates.get(key)
+        if template is not None:
+            return template
+
+        magenta = (204, 51, 204, 255)
+        cyan = (0, 204, 204, 178)
+
+        cylinder_length = axis_length * 0.80
+        cylinder = vtk.vtkCylinderSource()
+        cylinder.SetRadius(radius)
+        cylinder.SetHeight(cylinder_length)
+        cylinder.SetResolution(16)
+        cylinder.Update()
+        cylinder_transform = vtk.vtkTransform()
+        cylinder_transform.Translate(0, cylinder_length / 2, 0)
+
+        cone_height = axis_length * 0.20
+        cone = vtk.vtkConeSource()
+        cone.SetRadius(radius * 2.5)
+        cone.SetHeight(cone_height)
+        cone.SetResolution(16)
+        cone.SetDirection(0, 1, 0)
+        cone.Update()
+        cone_transform = vtk.vtkTransform()
+        cone_transform.Translate(0, cylinder_length + cone_height / 2, 0)
+
+        torus = vtk.vtkParametricTorus()
+        torus.SetRingRadius(radius * 4)
+        torus.SetCrossSectionRadius(radius * 0.8)
+        torus_source = vtk.vtkParametricFunctionSource()
+        torus_source.SetParametricFunction(torus)
+        torus_source.SetUResolution(32)
+        torus_source.SetVResolution(12)
+        torus_source.Update()
+        torus_transform = vtk.vtkTransform()
+        torus_transform.Translate(0, cylinder_length * 0.25, 0)
+        torus_transform.RotateX(90)
+
+        append = vtk.vtkAppendPolyData()
+        append.AddInputData(GeometryFactory._colored_piece(cylinder.GetOutput(), cylinder_transform, magenta))
+        append.AddInputData(GeometryFactory._colored_piece(cone.GetOutput(), cone_transform, magenta))
+        append.AddInputData(GeometryFactory._colored_piece(torus_source.GetOutput(), torus_transform, cyan))
+        append.Update()
+
+        template = vtk.vtkPolyData()
+        template.ShallowCopy(append.GetOutput())
+        GeometryFactory._joint_axis_arrow_templates[key] = template
+        return template
+
+    @staticmethod
+    def build_joint_axis_arrow_polydata(joint_frame, joint_axis_local,
+                                        axis_length=0.06, radius=0.004):
+        """创建关节轴箭头的 vtkPolyData（已变换到世界坐标）
+
+        与 create_joint_axis_arrow 外观相同，但颜色以逐点 RGBA 标量保存，
+        便于多个关节轴经 vtkAppendPolyData 合并后用单个 actor 绘制。
+
+        Args:
+            joint_frame: 4x4 关节坐标系变换矩阵
+            joint_axis_local: 局部坐标系中的轴方向 [x, y, z]
+            axis_length: 轴总长度
+            radius: 圆柱半径
+
+        Returns:
+            vtkPolyData
+        """
+        tf_filter = vtk.vtkTransformPolyDataFilter()
+        tf_filter.SetInputData(GeometryFactory._joint_axis_arrow_template(axis_length, radius))
+        tf_filter.SetTransform(
+            GeometryFactory._joint_axis_world_transform(joint_frame, joint_axis_local))
+        tf_filter.Update()
+        return tf_filter.GetOutput()
+
+    @staticmethod
+    def create_merged_actor(polydatas):
+        """把多个带 RGBA 点标量的 vtkPolyData 合并为单个 actor
+
+        Args:
+            polydatas: vtkPolyData 列表
+
+        Returns:
+            vtkActor，列表为空时返回 None
+        """
+        if not polydatas:
+            return None
+        append = vtk.vtkAppendPolyData()
+        for polydata in polydatas:
+            append.AddInputData(polydata)
+        append.Update()
+
+        mapper = vtk.vtkPolyDataMapper()
+        mapper.SetInputConnection(append.GetOutputPort())
+        mapper.SetScalarModeToUsePointData()
+        mapper.SetColorModeToDirectScalars()
+        mapper.ScalarVisibilityOn()
+
+        actor = vtk.vtkActor()
+        actor.SetMapper(mapper)
+        return actor
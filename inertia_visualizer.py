@@ -15,7 +15,7 @@ import math
 import numpy as np
 import vtk
 
-from geometry_factory import GeometryFactory
+from geometry_factory import GeometryFactory, update_transform_for_actor
 
 
 class InertiaVisualizer:
@@ -45,20 +45,22 @@ class InertiaVisualizer:
         self.show_com = False
         self.show_inertia = False
 
-    def clear(self):
-        """清除所有惯量可视化元素"""
-        for actor in self.com_actors:
-            self.renderer.RemoveActor(actor)
+    def clear(self, remove_from_renderer=True):
+        """清除所有惯量可视化元素
+
+        Args:
+            remove_from_renderer: 为 False 时只清空引用（调用方已整体清空 renderer）
+        """
+        if remove_from_renderer:
+            for actor in self.com_actors + self.com_axes_actors + self.inertia_actors:
+                self.renderer.RemoveActor(actor)
+
         self.com_actors = []
         self.com_actor_info = []
 
-        for actor in self.com_axes_actors:
-            self.renderer.RemoveActor(actor)
         self.com_axes_actors = []
         self.com_axes_actor_info = []
 
-        for actor in self.inertia_actors:
-            self.renderer.RemoveActor(actor)
         self.inertia_actors = []
         self.inertia_actor_info = []
 
@@ -128,7 +130,7 @@ class InertiaVisualizer:
             axes_actor.AxisLabelsOff()
 
             vtk_transform = vtk.vtkTransform()
-            vtk_transform.SetMatrix(T_world.flatten())
+            vtk_transform.SetMatrix(T_world.ravel())
             axes_actor.SetUserTransform(vtk_transform)
             axes_actor.SetVisibility(self.show_com)
 
@@ -233,47 +235,20 @@ class InertiaVisualizer:
         # 构建连杆名称到坐标系的映射
         link_name_to_frame = {name: frame for name, frame in zip(link_names, link_frames)}
 
-        # 更新质心标记
-        for info in self.com_actor_info:
-            actor = info['actor']
-            link_name = info['link_name']
-            T_com_rel = info['T_com_rel']
-
-            if link_name in link_name_to_frame:
-                link_frame = link_name_to_frame[link_name]
-                T_world = link_frame @ T_com_rel
-
-                vtk_transform = vtk.vtkTransform()
-                vtk_transform.SetMatrix(T_world.flatten())
-                actor.SetUserTransform(vtk_transform)
-
-        # 更新质心坐标系轴
-        for info in self.com_axes_actor_info:
-            actor = info['actor']
-            link_name = info['link_name']
-            T_com_rel = info['T_com_rel']
-
-            if link_name in link_name_to_frame:
-                link_frame = link_name_to_frame[link_name]
-                T_world = link_frame @ T_com_rel
-
-                vtk_transform = vtk.vtkTransform()
-                vtk_transform.SetMatrix(T_world.flatten())
-                actor.SetUserTransform(vtk_transform)
-
-        # 更新惯量盒
-        for info in self.inertia_actor_info:
-            actor = info['actor']
-            link_name = info['link_name']
-            T_com_rel = info['T_com_rel']
-
-            if link_name in link_name_to_frame:
-                link_frame = link_name_to_frame[link_name]
-                T_world = link_frame @ T_com_rel
-
-                vtk_transform = vtk.vtkTransform()
-                vtk_transform.SetMatrix(T_world.flatten())
-                actor.SetUserTransform(vtk_transform)
+        # 质心标记、质心坐标系轴、惯量盒使用相同的更新方式
+        infos = [info for info in self.com_actor_info + self.com_axes_actor_info + self.inertia_actor_info
+                 if info['link_name'] in link_name_to_frame]
+        if not infos:
+            return
+
+        # 一次批量 matmul 得到所有世界位姿
+        T_worlds = np.matmul(
+            np.asarray([link_name_to_frame[info['link_name']] for info in infos], dtype=np.float64),
+            np.asarray([info['T_com_rel'] for info in infos], dtype=np.float64))
+
+        for info, T_world in zip(infos, T_worlds):
+            # 写入创建时设置的 vtkTransform，不再每次新建
+            update_transform_for_actor(info['actor'], T_world)
 
     def set_com_visibility(self, visible):
         """设置质心标记可见性"""
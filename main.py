@@ -2,11 +2,13 @@
 # -*- coding: utf-8 -*-
 
 import sys
-import copy
 import os
 import math
 import numpy as np
 import tempfile
+import hashlib
+from contextlib import contextmanager
+from operator import itemgetter
 from math import pi
 from PyQt5.QtWidgets import (
     QApplication,
@@ -16,7 +18,6 @@ from PyQt5.QtWidgets import (
     QHBoxLayout,
     QPushButton,
     QListWidget,
-    QListWidgetItem,
     QFileDialog,
     QLabel,
     QLineEdit,
@@ -44,30 +45,53 @@ from PyQt5.QtWidgets import (
     QTextBrowser,
     QToolButton,
 )
-from xml_editor import XMLEditor
-from mdh_dialog import MDHDialog
-from decomp_dialog import DecompDialog
-from PyQt5.QtCore import Qt, QUrl, QSize, QEvent, QSettings
+from PyQt5.QtCore import Qt, QUrl, QSize, QEvent, QSettings, QTimer
 from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QKeySequence, QIcon, QDesktopServices, QColor
 from vtk.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
 import vtk
 
-from urdf_parser import URDFParser
-from urdf_vtk_model import URDFModel
-from simplify_mesh import create_detailed_approximation
+from urdf_parser import URDFParser, mdh_rest_relative
+from urdf_vtk_model import URDFModel, preload_meshes, z_axis_endpoints
 from translations import TranslationManager, tr, get_translation_manager
 from geometry_factory import GeometryFactory
-from topology_dialog import TopologyDialog, JOINT_COLORS
-from inertia_visualizer import InertiaVisualizer
 from drag_interaction_style import DragJointInteractorStyle
 from theme import ThemeManager, themed_icon
 from widgets import CollapsibleSection, ColorSwatchButton
 
-try:
-    from mjcf_parser import MJCFParser
-    HAS_MJCF = True
-except ImportError:
-    HAS_MJCF = False
+# 重量级模块（mujoco、sympy 代码生成、网格分解、拓扑图等）均在首次使用时再导入，
+# 以缩短启动时间
+
+
+def _is_mjcf_parser(parser):
+    """parser 是否为 MJCFParser（mjcf_parser 尚未导入时必然不是）"""
+    module = sys.modules.get('mjcf_parser')
+    return module is not None and isinstance(parser, module.MJCFParser)
+
+
+def _create_mjcf_parser(filename):
+    """校验 MJCF 根节点后创建 MJCFParser"""
+    # 验证是否为有效的 MJCF 文件
+    try:
+        from xml.etree import ElementTree as ET
+        tree = ET.parse(filename)
+        root = tree.getroot()
+        if root.tag != 'mujoco':
+            raise ValueError(tr("invalid_mjcf_file"))
+    except ET.ParseError as e:
+        raise ValueError(tr("invalid_mjcf_file"))
+
+    try:
+        from mjcf_parser import MJCFParser
+    except ImportError:
+        raise ImportError("MJCF 支持需要安装 mujoco: pip install mujoco")
+    return MJCFParser(filename)
+
+
+# 文件扩展名 -> parser 工厂
+_PARSER_TABLE = {
+    '.urdf': URDFParser,
+    '.xml': _create_mjcf_parser,
+}
 
 
 class _SimpleCollisionModel:
@@ -82,15 +106,20 @@ class _SimpleCollisionModel:
         self.text_actor = None
         self.name = ""
         self.transparency = 1.0
+        self.transform = None  # 首次 apply_transform 时创建，之后原地更新
 
     def set_transparency(self, transparency):
         self.transparency = transparency
         self.actor.GetProperty().SetOpacity(transparency)
 
     def apply_transform(self, transform_matrix):
-        vtk_transform = vtk.vtkTransform()
-        vtk_transform.SetMatrix(transform_matrix.flatten())
-        self.actor.SetUserTransform(vtk_transform)
+        if self.transform is None:
+            self.transform = vtk.vtkTransform()
+            self.actor.SetUserTransform(self.transform)
+        self.transform.SetMatrix(transform_matrix.ravel())
+
+    def update_frame(self, transform_matrix, axis_length=0.05):
+        pass
 
 
 class DragDropVTKWidget(QVTKRenderWindowInteractor):
@@ -131,6 +160,10 @@ class DragDropVTKWidget(QVTKRenderWindowInteractor):
 class URDFViewer(QMainWindow):
     """Main application window for URDF viewer"""
 
+    # 关节拖拽期间 / 静止时的 VTK 期望帧率（与 vtkRenderWindowInteractor 的默认值一致）
+    INTERACTIVE_UPDATE_RATE = 15.0
+    STILL_UPDATE_RATE = 0.0001
+
     def __init__(self):
         super().__init__()
         self.translation_manager = get_translation_manager()
@@ -139,22 +172,51 @@ class URDFViewer(QMainWindow):
         self.chains = []  # List to store kinematic chains
         self.mdh_frames_actors = []  # List to store MDH frame actors
         self.mdh_text_actors = []  # List to store MDH frame text actors
+        self._mdh_label_points = None  # MDH 标签锚点（vtkLabeledDataMapper 的输入点）
+        self._mdh_chain_key = None  # (链名, 坐标系数量)，相同时原地更新 MDH actor 位姿
+        # 质心标记 / 惯量盒是否已为当前模型创建；隐藏后再显示只切换可见性
+        self._com_built = False
+        self._inertia_built = False
         self.joint_axis_actors = []  # List to store joint axis actors
         self.joint_axis_info = []  # List to store joint axis info
+        self._mdh_buf = np.empty((0, 4, 4), dtype=np.float64)  # MDH 坐标系工作缓冲区，按需扩容后复用
+        self._mdh_zero_frames = {}  # chain index -> (零位 MDH 坐标系 (N,4,4), 相邻相对变换 (N-1,4,4))，切换链时直接复用
+        self._chain_by_name = {}  # 链名 -> 当前 self.chains 中的链
+        self._mdh_param_cache = {}  # 链名 -> MDH 参数（只与结构有关，与关节角无关）
         self.selected_chain = None  # Currently selected chain
         self.selected_chain_index = 0  # Index of the currently selected chain
         self.current_urdf_file = None  # Path to the currently loaded URDF file
         self.current_parser = None     # Cached parser for efficient joint updates
+        self._parser_cache = {}        # 绝对路径 -> (mtime, parser)
+        self._robot_info = None        # 当前关节角下的 get_robot_info() 结果缓存
+        self._chain_info = None        # (chains, trees)，加载时解析一次
         self.collision_mesh_files = None
-
+        self._last_xml_hash = None  # 上次应用的编辑器 XML 内容哈希
+        self._mesh_cache = {}  # (mesh 绝对路径, mtime) -> vtkPolyData，跨重新加载保留
+
+        self._model_by_name = {}  # link_name -> visual model
+        self._render_requested = False  # 是否有待执行的 Render()
+        self._render_batch_depth = 0  # >0 时渲染请求延迟到批处理结束
+        # 各类元素上次应用的显隐状态（与复选框默认值一致），状态未变时跳过切换与重绘
+        self._vis_state = {
+            'visual': True, 'link_frames': True, 'mdh': False, 'collision': True,
+            'joint_axes': False, 'com': False, 'inertia': False,
+        }
+        self._highlighted = set()  # 当前处于高亮状态的 model
         self.joint_sliders = []  # List to store joint angle sliders
-        self.joint_values = []  # List to store joint angle values
-        self.revolute_joints = []  # List to store revolute joints
+        self._slider_index = {}  # slider -> 关节序号，供共用的 valueChanged 槽查找
+        self.joint_values = np.zeros(0, dtype=np.float64)  # 关节角度 (rad)，按 revolute 顺序
+        self._last_joint_values = None  # 上次 update_model_with_joint_angles 应用的关节值
+        # 性能说明：加载、拖动滑块做 FK、切换显示这几条热路径主要受内存访问 / IO /
+        # draw call 数量限制，而非计算限制 —— 优先使用 SoA 布局、批处理和缓存；
+        # 只有 FK 内核是计算密集的（见 urdf_parser._fk_kernel，可选 numba）。
+        # 旋转关节按 SoA 存储（按 slider 顺序），需要 dict 时用 _revolute_joint_info(k)
+        self._set_revolute_joints([], [], [], [], [], [])
         self.all_joints = []  # List to store all joints (name, type)
         self.joint_value_labels = []  # List to store joint value labels
         self.display_in_degrees = False  # False: rad, True: deg
+        self._set_angle_units(self.display_in_degrees)
         self.inertia_visualizer = None  # Will be created after renderer init
-        self.actor_to_link = {}  # actor -> link_name mapping for drag interaction
         self.settings = QSettings("URDFly", "URDFly")
         self.max_recent_files = 10
         self.collision_color = self._load_color_setting(
@@ -165,6 +227,15 @@ class URDFViewer(QMainWindow):
             "inertia_color",
             (*GeometryFactory.DEFAULT_INERTIA_COLOR, GeometryFactory.DEFAULT_INERTIA_OPACITY),
         )
+        # 滑块事件合并：连续的 valueChanged 在一个定时周期内只触发一次更新/渲染
+        self._transparency_timer = QTimer(self)
+        self._transparency_timer.setSingleShot(True)
+        self._transparency_timer.setInterval(16)
+        self._transparency_timer.timeout.connect(self.apply_transparency)
+        self._joint_update_timer = QTimer(self)
+        self._joint_update_timer.setSingleShot(True)
+        self._joint_update_timer.setInterval(16)
+        self._joint_update_timer.timeout.connect(self.update_model_with_joint_angles)
         self.init_ui()
         
 
@@ -228,7 +299,8 @@ class URDFViewer(QMainWindow):
         self.transparency_slider.setValue(100)
         self.transparency_slider.setTickPosition(QSlider.TicksBelow)
         self.transparency_slider.setTickInterval(10)
-        self.transparency_slider.valueChanged.connect(self.apply_transparency)
+        self.transparency_slider.valueChanged.connect(self._schedule_transparency)
+        self.transparency_slider.sliderReleased.connect(self.apply_transparency)
         self.section_transparency.add_widget(self.transparency_slider)
         left_layout.addWidget(self.section_transparency)
 
@@ -393,7 +465,23 @@ class URDFViewer(QMainWindow):
         self.renderer.SetGradientBackground(True)
         self.vtk_widget.GetRenderWindow().AddRenderer(self.renderer)
 
+        # 按类别把 3D 辅助 actor 挂到 vtkAssembly 上，显隐切换只需设置一次
+        self._link_frame_assembly = vtk.vtkAssembly()
+        self._mdh_assembly = vtk.vtkAssembly()
+        self._joint_axis_assembly = vtk.vtkAssembly()
+        for assembly in (self._link_frame_assembly, self._mdh_assembly, self._joint_axis_assembly):
+            assembly.PickableOff()
+            self.renderer.AddActor(assembly)
+        self._link_frame_assembly.SetVisibility(False)
+        self._mdh_assembly.SetVisibility(False)
+        self._joint_axis_assembly.SetVisibility(False)
+        # MDH 文字标签（2D actor）放进 vtkPropAssembly，重建时一次性增删
+        self._mdh_caption_assembly = vtk.vtkPropAssembly()
+        self._mdh_caption_assembly.PickableOff()
+        self.renderer.AddViewProp(self._mdh_caption_assembly)
+
         # Initialize inertia visualizer
+        from inertia_visualizer import InertiaVisualizer
         self.inertia_visualizer = InertiaVisualizer(self.renderer)
 
         # Set up interactor
@@ -683,7 +771,7 @@ class URDFViewer(QMainWindow):
         _bottom, _top = tm.get_vtk_background()
         self.renderer.SetBackground(*_bottom)
         self.renderer.SetBackground2(*_top)
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
         self._refresh_icons()
         if hasattr(self, '_view_overlay'):
             self._update_view_overlay_style()
@@ -747,7 +835,7 @@ class URDFViewer(QMainWindow):
         camera.SetFocalPoint(*focal)
         camera.SetViewUp(*v['view_up'])
         self.renderer.ResetCameraClippingRange()
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
 
     def _show_about(self):
         QMessageBox.about(self, tr("about"), tr("about_text"))
@@ -825,6 +913,12 @@ class URDFViewer(QMainWindow):
         # Add the axes to the renderer
         self.renderer.AddActor(axes)
 
+    @staticmethod
+    def _clear_assembly(assembly):
+        """移除 vtkAssembly / vtkPropAssembly 中的全部 part"""
+        assembly.GetParts().RemoveAllItems()
+        assembly.Modified()
+
     def _create_parser(self, filename):
         """根据文件扩展名创建对应的解析器
 
@@ -839,139 +933,136 @@ class URDFViewer(QMainWindow):
             ImportError: MJCF 依赖未安装
         """
         ext = os.path.splitext(filename)[1].lower()
-        if ext == '.urdf':
-            return URDFParser(filename)
-        elif ext == '.xml':
-            # 验证是否为有效的 MJCF 文件
-            try:
-                from xml.etree import ElementTree as ET
-                tree = ET.parse(filename)
-                root = tree.getroot()
-                if root.tag != 'mujoco':
-                    raise ValueError(tr("invalid_mjcf_file"))
-            except ET.ParseError as e:
-                raise ValueError(tr("invalid_mjcf_file"))
-
-            if not HAS_MJCF:
-                raise ImportError("MJCF 支持需要安装 mujoco: pip install mujoco")
-            return MJCFParser(filename)
-        else:
+        parser_factory = _PARSER_TABLE.get(ext)
+        if parser_factory is None:
             raise ValueError(tr("unsupported_format", ext))
+        return parser_factory(filename)
+
+    def _get_parser(self, filename=None):
+        """返回文件对应的 parser（默认当前文件），按 (路径, mtime) 缓存，文件未变化时不重新解析"""
+        if filename is None:
+            filename = self.current_urdf_file
+        path = os.path.abspath(filename)
+        mtime = os.path.getmtime(path)
+        cached = self._parser_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        parser = self._create_parser(filename)
+        self._parser_cache[path] = (mtime, parser)
+        return parser
 
     def load_urdf_file(self, filename):
         """Load a URDF/MJCF file and visualize the robot"""
-        if filename and os.path.exists(filename):
-            # Clear previous models
-            self.clear_models()
-
-            # Parse the file
-            try:
-                parser = self._create_parser(filename)
+        # 整个加载过程中的渲染请求合并为结束时的一次 Render()
+        with self._render_batch():
+            if filename and os.path.exists(filename):
+                # Clear previous models
+                self.clear_models()
+
+                # Parse the file
+                try:
+                    parser = self._get_parser(filename)
                 
-                # Get robot info for visualization
-                (link_names,
-                link_mesh_files,
-                link_mesh_transformations,
-                link_frames,
-                link_colors,
-                joint_names,
-                joint_frames,
-                joint_types,
-                joint_axes,
-                joint_parent_links,
-                joint_child_links,
-                collision_mesh_files,
-                collision_mesh_transformations,
-                joint_limits,
-                collision_link_names,
-                collision_geometries,
-                ) = parser.get_robot_info()
-
-                # Store revolute joints for slider controls
-                self.revolute_joints = []
-                for i, joint_type in enumerate(joint_types):
-                    if joint_type == 'revolute':
-                        limit = joint_limits[i]
-                        self.revolute_joints.append({
-                            'name': joint_names[i],
-                            'index': i,
-                            'parent': joint_parent_links[i],
-                            'child': joint_child_links[i],
-                            'axis': joint_axes[i],
-                            'lower': limit['lower'],
-                            'upper': limit['upper'],
-                        })
+                    # Get robot info for visualization
+                    (link_names,
+                    link_mesh_files,
+                    link_mesh_transformations,
+                    link_frames,
+                    link_colors,
+                    joint_names,
+                    joint_frames,
+                    joint_types,
+                    joint_axes,
+                    joint_parent_links,
+                    joint_child_links,
+                    collision_mesh_files,
+                    collision_mesh_transformations,
+                    joint_limits,
+                    collision_link_names,
+                    collision_geometries,
+                    ) = robot_info = parser.get_robot_info()
+
+                    # Store revolute joints for slider controls
+                    self._set_revolute_joints(
+                        joint_names, joint_types, joint_axes,
+                        joint_parent_links, joint_child_links, joint_limits,
+                    )
 
-                # Store all joints for joint info overview
-                self.all_joints = [
-                    {'name': joint_names[i], 'type': joint_types[i]}
-                    for i in range(len(joint_names))
-                ]
-                self.create_joint_overview()
+                    # Store all joints for joint info overview
+                    self.all_joints = [
+                        {'name': joint_names[i], 'type': joint_types[i]}
+                        for i in range(len(joint_names))
+                    ]
+                    self.create_joint_overview()
 
-                # Create joint sliders
-                self.create_joint_sliders()
+                    # Create joint sliders
+                    self.create_joint_sliders()
                 
-                # Get chain information
-                self.chains, trees = parser.get_chain_info()
+                    # Get chain information
+                    self.chains, trees = parser.get_chain_info()
+                    self._robot_info = robot_info
+                    self._chain_info = (self.chains, trees)
+                    # Cache the parser instance for efficient joint updates
+                    self.current_parser = parser
                 
-                # Create models for each link
-                for i in range(len(link_names)):
-                    self.add_urdf_model(
-                        link_names[i],
-                        link_mesh_files[i],
-                        link_mesh_transformations[i],
-                        link_frames[i],
-                        link_colors[i],
-                    )
-                
-                # Create models for each collision
-                for i in range(len(collision_geometries)):
-                    coll_link = collision_link_names[i] if i < len(collision_link_names) else None
-                    geom = collision_geometries[i]
-                    if geom['type'] == 'mesh':
+                    # 先并行读取所有网格到缓存，再在主线程创建 actor
+                    self._preload_meshes(link_mesh_files, collision_mesh_files, collision_geometries)
+
+                    # Create models for each link
+                    for i in range(len(link_names)):
                         self.add_urdf_model(
-                            f"collision_{i}",
-                            collision_mesh_files[i],
-                            collision_mesh_transformations[i],
-                            None,
-                            None,
-                            model_type='collision',
-                            link_name=coll_link,
-                        )
-                    else:
-                        self._add_collision_primitive_model(
-                            geom, collision_mesh_transformations[i], coll_link,
+                            link_names[i],
+                            link_mesh_files[i],
+                            link_mesh_transformations[i],
+                            link_frames[i],
+                            link_colors[i],
                         )
+                
+                    # Create models for each collision
+                    for i in range(len(collision_geometries)):
+                        coll_link = collision_link_names[i] if i < len(collision_link_names) else None
+                        geom = collision_geometries[i]
+                        if geom['type'] == 'mesh':
+                            self.add_urdf_model(
+                                f"collision_{i}",
+                                collision_mesh_files[i],
+                                collision_mesh_transformations[i],
+                                None,
+                                None,
+                                model_type='collision',
+                                link_name=coll_link,
+                            )
+                        else:
+                            self._add_collision_primitive_model(
+                                geom, collision_mesh_transformations[i], coll_link,
+                            )
                     
                 
-                # use link mesh files to be decomposed
-                self.collision_mesh_files = [f for f in link_mesh_files if f is not None]
+                    # use link mesh files to be decomposed
+                    self.collision_mesh_files = [f for f in link_mesh_files if f is not None]
 
                 
-                # Populate the chain tree
-                self.populate_chain_tree()
+                    # Populate the chain tree
+                    self.populate_chain_tree()
 
-                # Reset camera to show all actors
-                self.renderer.ResetCamera()
-                self.vtk_widget.GetRenderWindow().Render()
+                    # Reset camera to show all actors
+                    self.renderer.ResetCamera()
+                    self._request_render()
                 
-                # Store the current URDF file path only after successful loading
-                self.current_urdf_file = filename
-                self._add_recent_file(filename)
-                # Cache the parser instance for efficient joint updates
-                self.current_parser = parser
+                    # Store the current URDF file path only after successful loading
+                    self.current_urdf_file = filename
+                    self._add_recent_file(filename)
 
-                # Apply visibility settings from checkboxes to new models
-                self._apply_visibility_settings()
+                    # Apply visibility settings from checkboxes to new models
+                    self._apply_visibility_settings()
 
-                # Update the current file label
-                self.update_current_file_label()
+                    # Update the current file label
+                    self.update_current_file_label()
 
-            except Exception as e:
-                QMessageBox.critical(
-                    self, tr("error"), tr("load_urdf_failed", str(e))
-                )
+                except Exception as e:
+                    QMessageBox.critical(
+                        self, tr("error"), tr("load_urdf_failed", str(e))
+                    )
 
     def open_urdf_file(self):
         """Open a URDF file dialog and load the selected file"""
@@ -1028,6 +1119,16 @@ class URDFViewer(QMainWindow):
         else:
             QMessageBox.warning(self, tr("warning"), tr("failed_to_load_file", filepath))
 
+    def _preload_meshes(self, link_mesh_files, collision_mesh_files, collision_geometries):
+        """并行读取 visual / collision 网格到 self._mesh_cache"""
+        mesh_files = list(link_mesh_files)
+        mesh_files.extend(
+            collision_mesh_files[i]
+            for i, geom in enumerate(collision_geometries)
+            if geom['type'] == 'mesh'
+        )
+        preload_meshes(mesh_files, self._mesh_cache)
+
     def add_urdf_model(self, name, mesh_file, mesh_transform, frame, color, model_type='visual', link_name=None):
 
         """Add a URDF model to the scene"""
@@ -1039,26 +1140,32 @@ class URDFViewer(QMainWindow):
                 effective_color = (r, g, b, a)
 
             # Create a new URDF model with axis text (using link name as the text)
-            model = URDFModel(name, mesh_file, mesh_transform, frame, effective_color, axis_text=name)
+            model = URDFModel(name, mesh_file, mesh_transform, frame, effective_color, axis_text=name,
+                              mesh_cache=self._mesh_cache)
 
              # Add the model to our list
             if model_type == 'visual':
                 self.models.append(model)
+                self._model_by_name[name] = model
             elif model_type == 'collision':
                 self.models_collision.append(model)
 
             # Add the actor to the renderer
             self.renderer.AddActor(model.actor)
 
-            # Build actor → link_name mapping for drag interaction
+            # Tag actor with its link name for drag interaction
             if model_type == 'visual':
-                self.actor_to_link[id(model.actor)] = name
+                model.actor.link_name = name
             elif model_type == 'collision' and link_name:
-                self.actor_to_link[id(model.actor)] = link_name
+                model.actor.link_name = link_name
 
             # Add the axes actor to the renderer
             if model.axes_actor is not None:
-                self.renderer.AddActor(model.axes_actor)
+                if model_type == 'visual':
+                    # 可见性由 _link_frame_assembly 统一控制
+                    self._link_frame_assembly.AddPart(model.axes_actor)
+                else:
+                    self.renderer.AddActor(model.axes_actor)
             
             # Add the text actor to the renderer if it exists
             if model.text_actor is not None:
@@ -1066,7 +1173,7 @@ class URDFViewer(QMainWindow):
             
             # Set initial visibility based on checkbox
             if hasattr(self, "cb_link_frames"):
-                if model.axes_actor is not None:
+                if model.axes_actor is not None and model_type != 'visual':
                     model.axes_actor.SetVisibility(self.cb_link_frames.isChecked())
                 if model.text_actor is not None:
                     model.text_actor.SetVisibility(self.cb_link_frames.isChecked())
@@ -1104,29 +1211,31 @@ class URDFViewer(QMainWindow):
         self.renderer.AddActor(actor)
 
         if link_name:
-            self.actor_to_link[id(actor)] = link_name
+            actor.link_name = link_name
 
     def clear_models(self):
         """Clear all models from the scene"""
-        # Remove all actors from the renderer
-        for model in self.models:
-            self.renderer.RemoveActor(model.actor)
-            self.renderer.RemoveActor(model.axes_actor)
-            if hasattr(model, 'text_actor') and model.text_actor is not None:
-                self.renderer.RemoveActor(model.text_actor)
-                
-        for model in self.models_collision:
-            self.renderer.RemoveActor(model.actor)
-            self.renderer.RemoveActor(model.axes_actor)
-            if hasattr(model, 'text_actor') and model.text_actor is not None:
-                self.renderer.RemoveActor(model.text_actor)
+        # Remove all actors from the renderer in one call, then re-add the
+        # persistent (emptied) assemblies
+        self.renderer.RemoveAllViewProps()
+        for assembly in (self._link_frame_assembly, self._mdh_assembly, self._joint_axis_assembly):
+            self._clear_assembly(assembly)
+            self.renderer.AddActor(assembly)
+        self._clear_assembly(self._mdh_caption_assembly)
+        self.renderer.AddViewProp(self._mdh_caption_assembly)
 
         # Clear the models list
         self.models = []
         self.models_collision = []
-        self.actor_to_link = {}
+        self._model_by_name = {}
+        self._highlighted = set()
         self.current_parser = None
-
+        self._robot_info = None
+        self._chain_info = None
+        self._mdh_zero_frames = {}
+        self._mdh_param_cache = {}
+        self._chain_by_name = {}
+        self._last_xml_hash = None
 
         # Clear the combo box and link list
         self.chain_combo.clear()
@@ -1144,25 +1253,20 @@ class URDFViewer(QMainWindow):
             if widget:
                 widget.deleteLater()
 
-        # Clear MDH frames
-        for actor in self.mdh_frames_actors:
-            self.renderer.RemoveActor(actor)
+        # Clear MDH frames and text actors (already removed from the renderer)
         self.mdh_frames_actors = []
-        
-        # Clear MDH text actors
-        for text_actor in self.mdh_text_actors:
-            self.renderer.RemoveActor(text_actor)
         self.mdh_text_actors = []
+        self._mdh_chain_key = None
 
         # Clear joint axes
-        for actor in self.joint_axis_actors:
-            self.renderer.RemoveActor(actor)
         self.joint_axis_actors = []
         self.joint_axis_info = []
 
         # Clear inertia visualizations
         if self.inertia_visualizer:
-            self.inertia_visualizer.clear()
+            self.inertia_visualizer.clear(remove_from_renderer=False)
+        self._com_built = False
+        self._inertia_built = False
 
         # Reset selected chain and current URDF file
         self.selected_chain = None
@@ -1172,61 +1276,89 @@ class URDFViewer(QMainWindow):
         self.update_current_file_label()
 
         # Update the rendering
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
 
     def populate_chain_tree(self):
         """Populate the chain combo box and link list"""
+        # 填充期间屏蔽 currentIndexChanged，最后显式调用一次 on_chain_selected
+        self.chain_combo.blockSignals(True)
         self.chain_combo.clear()
         self.link_list.clear()
+        # 链列表已更新，零位 MDH 坐标系需重新计算
+        self._mdh_zero_frames = {}
+        self._mdh_param_cache = {}
+        self._chain_by_name = {chain['name']: chain for chain in self.chains}
 
         # Add each chain to the combo box
         for i, chain in enumerate(self.chains):
+            # 记录链在 self.chains 中的索引，供 MDH 缓存直接定位
+            chain['index'] = i
             self.chain_combo.addItem(tr("chain_pattern").format(i+1, chain['name']), i)
         
         # Select the first chain by default if available
         if self.chains:
-            self.selected_chain_index = 0
-            self.selected_chain = self.chains[0]
             self.chain_combo.setCurrentIndex(0)
-            self.update_link_list()
+        self.chain_combo.blockSignals(False)
+
+        if self.chains:
+            self.on_chain_selected(0)
 
     def on_chain_selected(self, index):
         """Handle chain selection from combo box"""
         if index >= 0 and index < len(self.chains):
-            # Unhighlight all models first
-            for model in self.models:
-                model.unhighlight()
+            # 链表刷新（触发选中变化）与 MDH 重建合并为一次渲染
+            with self._render_batch():
+                # Unhighlight all models first
+                self._unhighlight_all()
             
-            # Set the selected chain
-            self.selected_chain_index = index
-            self.selected_chain = self.chains[index]
+                # Set the selected chain
+                self.selected_chain_index = index
+                self.selected_chain = self.chains[index]
             
-            # Update the link list
-            self.update_link_list()
+                # Update the link list
+                self.update_link_list()
             
-            # Update MDH frames if they are currently visible
-            if self.cb_mdh_frames.isChecked() and self.current_urdf_file:
-                self.create_mdh_frames(self.selected_chain)
+                # Update MDH frames if they are currently visible
+                if self.cb_mdh_frames.isChecked() and self.current_urdf_file:
+                    self.create_mdh_frames(self.selected_chain)
             
-            # Update the rendering
-            self.vtk_widget.GetRenderWindow().Render()
+                # Update the rendering
+                self._request_render()
     
+    def _highlight_link(self, link_name):
+        """高亮指定 link 的 visual model，返回该 model（不存在时返回 None）"""
+        model = self._model_by_name.get(link_name)
+        if model is not None:
+            model.highlight()
+            self._highlighted.add(model)
+        return model
+
+    def _unhighlight_all(self):
+        """仅取消已记录为高亮的 model，避免遍历全部 model"""
+        for model in self._highlighted:
+            model.unhighlight()
+        self._highlighted.clear()
+
     def update_link_list(self):
         """Update the link list based on the selected chain"""
-        self.link_list.clear()
-        
-        if self.selected_chain:
-            # Add links to the list
-            for link_name in self.selected_chain['link_names']:
-                item = QListWidgetItem(link_name)
-                item.setData(Qt.UserRole, link_name)
-                self.link_list.addItem(item)
+        # 批量插入期间暂停重绘，N 次刷新合并为 1 次
+        self.link_list.setUpdatesEnabled(False)
+        try:
+            self.link_list.clear()
+
+            if self.selected_chain:
+                # Add links to the list
+                link_names = self.selected_chain['link_names']
+                self.link_list.addItems(link_names)
+                for i, link_name in enumerate(link_names):
+                    self.link_list.item(i).setData(Qt.UserRole, link_name)
+        finally:
+            self.link_list.setUpdatesEnabled(True)
     
     def on_link_selection_changed(self):
         """Handle link selection from list"""
         # Unhighlight all models first
-        for model in self.models:
-            model.unhighlight()
+        self._unhighlight_all()
         
         # Get selected link
         selected_items = self.link_list.selectedItems()
@@ -1234,24 +1366,56 @@ class URDFViewer(QMainWindow):
             link_name = selected_items[0].data(Qt.UserRole)
             
             # Highlight the selected link
-            for model in self.models:
-                if model.name == link_name:
-                    model.highlight()
-                    print(model.link_frame)
+            model = self._highlight_link(link_name)
+            if model is not None:
+                print(model.link_frame)
         # Update the rendering
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
         
+    def _request_render(self):
+        """标记需要重绘；不在批处理中时立即渲染"""
+        self._render_requested = True
+        self.render_if_dirty()
+
+    def render_if_dirty(self):
+        """有待处理的渲染请求且不在批处理中时执行一次 Render()"""
+        if self._render_requested and not self._render_batch_depth:
+            self._render_requested = False
+            self.vtk_widget.GetRenderWindow().Render()
+
+    @contextmanager
+    def _render_batch(self):
+        """在 with 块内合并所有渲染请求（含信号触发的回调），退出时最多渲染一次"""
+        self._render_batch_depth += 1
+        try:
+            yield
+        finally:
+            self._render_batch_depth -= 1
+            self.render_if_dirty()
+
+    def _update_vis_state(self, key, state):
+        """记录某类元素的显隐状态，与上次相同时返回 False"""
+        visible = state == Qt.Checked
+        if self._vis_state[key] == visible:
+            return False
+        self._vis_state[key] = visible
+        return True
+
     def toggle_visual(self, state):
         """Toggle visibility of visual models"""
+        if not self._update_vis_state('visual', state):
+            return
         visible = state == Qt.Checked
 
         for model in self.models:
             model.actor.SetVisibility(visible)
 
         # Update the rendering
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
 
     def toggle_collision(self, state):
+        if not self._update_vis_state('collision', state):
+            return
         visible = state == Qt.Checked
 
         for model in self.models_collision:
@@ -1262,7 +1426,7 @@ class URDFViewer(QMainWindow):
                 model.text_actor.SetVisibility(visible)
 
         # Update the rendering
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
 
     def _on_collision_color_changed(self, r, g, b, a):
         """Handle collision color picker change."""
@@ -1282,7 +1446,7 @@ class URDFViewer(QMainWindow):
         for model in self.models_collision:
             model.actor.GetProperty().SetColor(r, g, b)
             model.actor.GetProperty().SetOpacity(a)
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
 
     def _apply_inertia_color(self):
         """Apply current inertia_color to all inertia box actors."""
@@ -1291,22 +1455,26 @@ class URDFViewer(QMainWindow):
             for actor in self.inertia_visualizer.inertia_actors:
                 actor.GetProperty().SetColor(r, g, b)
                 actor.GetProperty().SetOpacity(a)
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
 
     def toggle_link_frames(self, state):
         """Toggle visibility of link frames and their text labels"""
+        if not self._update_vis_state('link_frames', state):
+            return
         visible = state == Qt.Checked
         
+        self._link_frame_assembly.SetVisibility(visible)
         for model in self.models:
-            model.axes_actor.SetVisibility(visible)
             if hasattr(model, 'text_actor') and model.text_actor is not None:
                 model.text_actor.SetVisibility(visible)
         
         # Update the rendering
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
 
     def toggle_mdh_frames(self, state):
         """Toggle visibility of MDH frames"""
+        if not self._update_vis_state('mdh', state):
+            return
         visible = state == Qt.Checked
 
         # If we want to show MDH frames
@@ -1320,7 +1488,9 @@ class URDFViewer(QMainWindow):
 
             if self.selected_chain:
                 # Always recreate MDH frames to ensure they're up to date
+                # (renders once, no separate render needed below)
                 self.create_mdh_frames(self.selected_chain)
+                return
             else:
                 QMessageBox.warning(
                     self, tr("warning"), tr("please_select_chain_first")
@@ -1329,16 +1499,17 @@ class URDFViewer(QMainWindow):
                 return
         else:
             # Hide MDH frames and text
-            for actor in self.mdh_frames_actors:
-                actor.SetVisibility(False)
+            self._mdh_assembly.SetVisibility(False)
             for text_actor in self.mdh_text_actors:
                 text_actor.SetVisibility(False)
 
         # Update the rendering
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
 
     def toggle_joint_axes(self, state):
         """Toggle visibility of joint axes"""
+        if not self._update_vis_state('joint_axes', state):
+            return
         visible = state == Qt.Checked
 
         # If we want to show joint axes
@@ -1350,38 +1521,77 @@ class URDFViewer(QMainWindow):
                 self.cb_joint_axes.setChecked(False)
                 return
 
-            # Create joint axes
+            # Create joint axes (renders once, no separate render needed below)
             self.create_joint_axes()
+            return
         else:
             # Hide joint axes
-            for actor in self.joint_axis_actors:
-                actor.SetVisibility(False)
+            self._joint_axis_assembly.SetVisibility(False)
 
         # Update the rendering
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
+
+    def _set_revolute_joints(self, joint_names, joint_types, joint_axes,
+                             joint_parent_links, joint_child_links, joint_limits):
+        """从 get_robot_info() 的关节数据中提取旋转关节，按 SoA 存储"""
+        idx = [i for i, joint_type in enumerate(joint_types) if joint_type == 'revolute']
+        self._rev_names = [joint_names[i] for i in idx]
+        self._rev_joint_idx = np.asarray(idx, dtype=np.int64)
+        self._rev_parents = [joint_parent_links[i] for i in idx]
+        self._rev_children = [joint_child_links[i] for i in idx]
+        self._rev_axes = np.asarray([joint_axes[i] for i in idx], dtype=np.float64).reshape(-1, 3)
+        self._rev_lower = np.asarray([joint_limits[i]['lower'] for i in idx], dtype=np.float64)
+        self._rev_upper = np.asarray([joint_limits[i]['upper'] for i in idx], dtype=np.float64)
+        # child link -> slider 序号（取第一个匹配，与原先线性查找一致）
+        self._rev_by_child = {}
+        for k, child in enumerate(self._rev_children):
+            self._rev_by_child.setdefault(child, k)
+
+    def _revolute_joint_info(self, k):
+        """第 k 个旋转关节的 dict 视图"""
+        return {
+            'name': self._rev_names[k],
+            'index': int(self._rev_joint_idx[k]),
+            'parent': self._rev_parents[k],
+            'child': self._rev_children[k],
+            'axis': self._rev_axes[k].tolist(),
+            'lower': float(self._rev_lower[k]),
+            'upper': float(self._rev_upper[k]),
+        }
+
+    def _get_robot_info(self):
+        """返回当前关节角下的 get_robot_info() 结果，缓存失效时用缓存的 parser 重算"""
+        if self._robot_info is None:
+            self._robot_info = self.current_parser.get_robot_info(qs=self.joint_values)
+        return self._robot_info
+
+    def _get_link_frames(self):
+        """只取当前关节角下的 (link_names, link_frames)；已有完整缓存时直接复用"""
+        if self._robot_info is not None:
+            return itemgetter(0, 3)(self._robot_info)
+        return self.current_parser.get_link_frames_only(qs=self.joint_values)
 
     def create_joint_axes(self):
         """Create joint axis actors for the current URDF"""
         # Clear existing joint axes
-        for actor in self.joint_axis_actors:
-            self.renderer.RemoveActor(actor)
+        self._clear_assembly(self._joint_axis_assembly)
         self.joint_axis_actors = []
         self.joint_axis_info = []
 
         # Get joint data with current joint angles
-        if self.current_parser and HAS_MJCF and isinstance(self.current_parser, MJCFParser):
+        if _is_mjcf_parser(self.current_parser):
             result = self.current_parser.update_transforms(self.joint_values)
-            joint_names = result['joint_names']
-            joint_frames = result['joint_frames']
-            joint_axes = result['joint_axes']
+            joint_names = result.joint_names
+            joint_frames = result.joint_frames
+            joint_axes = result.joint_axes
             joint_types = [j['type'] for j in self.current_parser.joints]
         else:
-            parser = self._create_parser(self.current_urdf_file)
-            (_, _, _, _, _,
-             joint_names, joint_frames, joint_types, joint_axes,
-             _, _, _, _, _, _, _) = parser.get_robot_info(qs=self.joint_values)
+            joint_names, joint_frames, joint_types, joint_axes = itemgetter(5, 6, 7, 8)(
+                self._get_robot_info())
 
-        # Create axis arrows for each revolute and continuous joint
+        # Create axis arrows for each revolute and continuous joint,
+        # merged into a single actor (one draw call for all arrows)
+        arrow_polydatas = []
         for joint_name, joint_frame, joint_type, axis in zip(
             joint_names, joint_frames, joint_types, joint_axes
         ):
@@ -1389,24 +1599,27 @@ class URDFViewer(QMainWindow):
             if joint_type not in ['revolute', 'continuous']:
                 continue
 
-            # Create joint axis arrow
-            actor = GeometryFactory.create_joint_axis_arrow(
-                joint_frame, axis
+            arrow_polydatas.append(
+                GeometryFactory.build_joint_axis_arrow_polydata(joint_frame, axis)
             )
-            actor.SetVisibility(self.cb_joint_axes.isChecked())
-
-            self.renderer.AddActor(actor)
-            self.joint_axis_actors.append(actor)
             self.joint_axis_info.append({
                 'joint_name': joint_name,
                 'axis': list(axis)
             })
 
+        actor = GeometryFactory.create_merged_actor(arrow_polydatas)
+        if actor is not None:
+            self._joint_axis_assembly.AddPart(actor)
+            self.joint_axis_actors.append(actor)
+        self._joint_axis_assembly.SetVisibility(self.cb_joint_axes.isChecked())
+
         # Update the rendering
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
 
     def toggle_com(self, state):
         """Toggle visibility of center of mass markers"""
+        if not self._update_vis_state('com', state):
+            return
         visible = state == Qt.Checked
 
         if visible:
@@ -1417,28 +1630,28 @@ class URDFViewer(QMainWindow):
                 self.cb_com.setChecked(False)
                 return
 
-            # Create CoM markers
-            parser = self._create_parser(self.current_urdf_file)
-            (link_names, _, _, link_frames, _, _, _, _, _, _, _, _, _, _, _, _) = parser.get_robot_info(qs=self.joint_values)
-            self.inertia_visualizer.create_com_markers(parser, link_names, link_frames)
+            # Create CoM markers (only once per loaded model)
+            self._ensure_com_markers()
 
-            # Register CoM actors for drag interaction
+            # Tag CoM actors for drag interaction
             for info in self.inertia_visualizer.com_actor_info:
-                self.actor_to_link[id(info['actor'])] = info['link_name']
+                info['actor'].link_name = info['link_name']
             for info in self.inertia_visualizer.com_axes_actor_info:
-                self.actor_to_link[id(info['actor'])] = info['link_name']
+                info['actor'].link_name = info['link_name']
         else:
-            # Unregister CoM actors
+            # Untag CoM actors
             for info in self.inertia_visualizer.com_actor_info:
-                self.actor_to_link.pop(id(info['actor']), None)
+                info['actor'].link_name = None
             for info in self.inertia_visualizer.com_axes_actor_info:
-                self.actor_to_link.pop(id(info['actor']), None)
+                info['actor'].link_name = None
 
         self.inertia_visualizer.set_com_visibility(visible)
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
 
     def toggle_inertia(self, state):
         """Toggle visibility of inertia boxes"""
+        if not self._update_vis_state('inertia', state):
+            return
         visible = state == Qt.Checked
 
         if visible:
@@ -1449,108 +1662,148 @@ class URDFViewer(QMainWindow):
                 self.cb_inertia.setChecked(False)
                 return
 
-            # Create inertia boxes
-            parser = self._create_parser(self.current_urdf_file)
-            (link_names, _, _, link_frames, _, _, _, _, _, _, _, _, _, _, _, _) = parser.get_robot_info(qs=self.joint_values)
-            r, g, b, a = self.inertia_color
-            self.inertia_visualizer.create_inertia_boxes(
-                parser, link_names, link_frames,
-                color=(r, g, b), opacity=a)
+            # Create inertia boxes (only once per loaded model)
+            self._ensure_inertia_boxes()
 
-            # Register inertia actors for drag interaction
+            # Tag inertia actors for drag interaction
             for info in self.inertia_visualizer.inertia_actor_info:
-                self.actor_to_link[id(info['actor'])] = info['link_name']
+                info['actor'].link_name = info['link_name']
         else:
-            # Unregister inertia actors
+            # Untag inertia actors
             for info in self.inertia_visualizer.inertia_actor_info:
-                self.actor_to_link.pop(id(info['actor']), None)
+                info['actor'].link_name = None
 
         self.inertia_visualizer.set_inertia_visibility(visible)
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
+
+    def _ensure_com_markers(self):
+        """首次显示时创建质心标记，之后只把已有标记更新到当前位姿"""
+        link_names, link_frames = self._get_link_frames()
+        if self._com_built:
+            self.inertia_visualizer.update_transforms(link_names, link_frames)
+            return
+        self.inertia_visualizer.create_com_markers(self.current_parser, link_names, link_frames)
+        self._com_built = True
+
+    def _ensure_inertia_boxes(self):
+        """首次显示时创建惯量盒，之后只把已有惯量盒更新到当前位姿"""
+        link_names, link_frames = self._get_link_frames()
+        if self._inertia_built:
+            self.inertia_visualizer.update_transforms(link_names, link_frames)
+            return
+        r, g, b, a = self.inertia_color
+        self.inertia_visualizer.create_inertia_boxes(
+            self.current_parser, link_names, link_frames,
+            color=(r, g, b), opacity=a)
+        self._inertia_built = True
 
     def create_mdh_frames(self, chain):
         """Create MDH frame actors for the selected chain"""
+        # 零位 MDH 坐标系只依赖链结构，按链索引缓存，切换链或关节变化时不再重新计算
+        parser = self.current_parser
+        # 传入的链可能来自重新加载之前，按名称映射到当前链列表
+        chain = self._chain_by_name.get(chain['name'], chain)
+        zero_frames, rest_relative = self._get_mdh_zero_frames(chain)
+        # update mdh_frames using joint position
+
+        n = len(zero_frames)
+        if self._mdh_buf.shape[0] < n:
+            self._mdh_buf = np.empty((n, 4, 4), dtype=np.float64)
+        mdh_frames = self._mdh_buf[:n]
+        parser.update_mdh_frames(zero_frames, self.joint_values, out=mdh_frames, rest_relative=rest_relative)
+
+        # actor 只在链或坐标系数量变化时重建，关节变化时仅更新位姿
+        key = (chain['name'], n)
+        if key != self._mdh_chain_key:
+            self._build_mdh_frame_actors(n)
+            self._mdh_chain_key = key
+        self._update_mdh_frame_transforms(mdh_frames)
+
+        # Set visibility based on checkbox
+        visible = self.cb_mdh_frames.isChecked()
+        self._mdh_assembly.SetVisibility(visible)
+        for text_actor in self.mdh_text_actors:
+            text_actor.SetVisibility(visible)
+        
+        # Update the rendering
+        self._request_render()
+
+    def _build_mdh_frame_actors(self, n):
+        """重建 n 个 MDH 坐标轴及其文字标签（位姿由 _update_mdh_frame_transforms 写入）"""
         # Clear existing MDH frames
-        for actor in self.mdh_frames_actors:
-            self.renderer.RemoveActor(actor)
+        self._clear_assembly(self._mdh_assembly)
         self.mdh_frames_actors = []
         
         # Clear existing MDH text actors
-        for text_actor in self.mdh_text_actors:
-            self.renderer.RemoveActor(text_actor)
+        self._clear_assembly(self._mdh_caption_assembly)
         self.mdh_text_actors = []
         
-        # Create a fresh parser instance to ensure we get the latest data
-        parser = self._create_parser(self.current_urdf_file)
-        
-        # Get chain information to ensure we have the latest chain data
-        chains, _ = parser.get_chain_info()
-        
-        # Find the matching chain in the updated chains list
-        current_chain = None
-        for c in chains:
-            if c['name'] == chain['name']:
-                current_chain = c
-                break
-        
-        # If we couldn't find a matching chain, use the provided chain
-        if current_chain is None:
-            current_chain = chain
-        
-        # Get MDH frames using the current chain
-        mdh_frames = parser.get_mdh_frames(current_chain)
-        # update mdh_frames using joint position
+        # 所有 MDH 标签共用一个 vtkLabeledDataMapper：每个坐标系对应一个点，
+        # 文字取自点数据中的 "labels" 数组，位姿更新时只需改写点坐标
+        self._mdh_label_points = vtk.vtkPoints()
+        self._mdh_label_points.SetNumberOfPoints(n)
+        labels = vtk.vtkStringArray()
+        labels.SetName("labels")
+        labels.SetNumberOfValues(n)
+        for i in range(n):
+            labels.SetValue(i, f"MDH{i}")
+        label_polydata = vtk.vtkPolyData()
+        label_polydata.SetPoints(self._mdh_label_points)
+        label_polydata.GetPointData().AddArray(labels)
+
+        label_mapper = vtk.vtkLabeledDataMapper()
+        label_mapper.SetInputData(label_polydata)
+        label_mapper.SetLabelModeToLabelFieldData()
+        label_mapper.SetFieldDataName("labels")
+        text_property = label_mapper.GetLabelTextProperty()
+        text_property.SetFontSize(14)
+        text_property.SetColor(0, 0, 1)  # Blue text for MDH frames
+        text_property.SetBold(False)
+        text_property.SetJustificationToLeft()
+        text_property.SetVerticalJustificationToBottom()
+
+        label_actor = vtk.vtkActor2D()
+        label_actor.SetMapper(label_mapper)
+        self._mdh_caption_assembly.AddPart(label_actor)
+        self.mdh_text_actors.append(label_actor)
 
-        mdh_frames = parser.update_mdh_frames(mdh_frames, self.joint_values)
-        
         # Create axes actors for each MDH frame
-        for i, frame in enumerate(mdh_frames):
+        for i in range(n):
             axes = vtk.vtkAxesActor()
             axes.SetTotalLength(0.05, 0.05, 0.05)  # Set the length of the axes
             axes.SetShaftType(0)
             axes.SetAxisLabels(0)
             axes.SetCylinderRadius(0.01)
             
-            # Create transform
-            vtk_transform = vtk.vtkTransform()
-            vtk_transform.SetMatrix(frame.flatten())
-            axes.SetUserTransform(vtk_transform)
+            # Persistent transform, updated in place
+            axes.SetUserTransform(vtk.vtkTransform())
             
-            # Add to renderer
-            self.renderer.AddActor(axes)
+            # Add to the MDH assembly (visibility is controlled on the assembly)
+            self._mdh_assembly.AddPart(axes)
             self.mdh_frames_actors.append(axes)
-            
-            # Set initial visibility based on checkbox
-            axes.SetVisibility(self.cb_mdh_frames.isChecked())
-            
-            # Create text label for MDH frame
-            text_actor = vtk.vtkCaptionActor2D()
-            text_actor.SetCaption(f"MDH{i}")
-            text_actor.GetTextActor().SetTextScaleModeToNone()
-            text_actor.GetCaptionTextProperty().SetFontSize(14)
-            text_actor.GetCaptionTextProperty().SetColor(0, 0, 1)  # Blue text for MDH frames
-            text_actor.GetCaptionTextProperty().SetBold(False)
-            
-            # Position the text at the end of the z-axis
-            z_endpoint = [0, 0, 0.05, 1]  # Same length as axes
-            transformed_point = vtk_transform.TransformPoint(z_endpoint[0], z_endpoint[1], z_endpoint[2])
-            text_actor.SetAttachmentPoint(transformed_point[0], transformed_point[1], transformed_point[2])
-            
-            # Configure the caption
-            text_actor.BorderOff()
-            text_actor.LeaderOff()
-            text_actor.ThreeDimensionalLeaderOff()
-            text_actor.SetPadding(2)
-            
-            # Add to renderer
-            self.renderer.AddActor(text_actor)
-            self.mdh_text_actors.append(text_actor)
-            
-            # Set initial visibility based on checkbox
-            text_actor.SetVisibility(self.cb_mdh_frames.isChecked())
-        
-        # Update the rendering
-        self.vtk_widget.GetRenderWindow().Render()
+
+    def _update_mdh_frame_transforms(self, mdh_frames):
+        """把 MDH 坐标系 (N,4,4) 写入已有的坐标轴 transform，并把标签移到 z 轴末端"""
+        for frame, axes in zip(mdh_frames, self.mdh_frames_actors):
+            axes.GetUserTransform().SetMatrix(frame.ravel())
+
+        # 标签位置：z 轴末端，只改写共享 polydata 的点坐标
+        anchors = z_axis_endpoints(mdh_frames, 0.05)  # Same length as axes
+        points = self._mdh_label_points
+        for i, anchor in enumerate(anchors):
+            points.SetPoint(i, anchor[0], anchor[1], anchor[2])
+        points.Modified()
+
+    def _get_mdh_zero_frames(self, chain):
+        """返回链的零位 MDH 坐标系 (N,4,4) 及相邻相对变换 (N-1,4,4)，首次访问时计算并缓存"""
+        index = chain.get('index')
+        cached = self._mdh_zero_frames.get(index)
+        if cached is None:
+            frames = np.asarray(self.current_parser.get_mdh_frames(chain), dtype=np.float64).reshape(-1, 4, 4)
+            cached = (frames, mdh_rest_relative(frames))
+            if index is not None:
+                self._mdh_zero_frames[index] = cached
+        return cached
 
     def show_mdh_parameters(self):
         """Show MDH parameters in a dialog"""
@@ -1573,33 +1826,24 @@ class URDFViewer(QMainWindow):
             )
             return
         
-        # Create a fresh parser instance to ensure we get the latest MDH parameters
-        parser = self._create_parser(self.current_urdf_file)
-        
-        # Get chain information to ensure we have the latest chain data
-        chains, _ = parser.get_chain_info()
-        
-        # Find the matching chain in the updated chains list
-        current_chain = None
-        for chain in chains:
-            if chain['name'] == self.selected_chain['name']:
-                current_chain = chain
-                break
+        # 复用加载时缓存的 parser，链按名称从当前链列表中取
+        parser = self.current_parser
+        current_chain = self._chain_by_name.get(self.selected_chain['name'], self.selected_chain)
         
-        # If we couldn't find a matching chain, use the selected chain
-        if current_chain is None:
-            current_chain = self.selected_chain
-        
-        # Get MDH parameters using the current chain
-        _, _, _, mdh_parameters = parser.get_mdh_parameters(current_chain)
+        # Get MDH parameters using the current chain (cached per chain until reload)
+        mdh_parameters = self._mdh_param_cache.get(current_chain['name'])
+        if mdh_parameters is None:
+            _, _, _, mdh_parameters = parser.get_mdh_parameters(current_chain)
+            self._mdh_param_cache[current_chain['name']] = mdh_parameters
         
         # Create and show the new MDH dialog
+        from mdh_dialog import MDHDialog
         dialog = MDHDialog(self, current_chain['name'], mdh_parameters)
         dialog.exec_()
 
     def open_set_joints_dialog(self):
         """Open a dialog to input joint angles and apply them to the robot and sliders."""
-        if not self.revolute_joints:
+        if not self._rev_names:
             QMessageBox.warning(self, tr("warning"), tr("no_revolute_joints"))
             return
 
@@ -1611,12 +1855,10 @@ class URDFViewer(QMainWindow):
         angles_edit = QLineEdit()
         # Pre-fill with current values in currently selected unit for convenience
         try:
-            current_vals = []
-            for val in (self.joint_values if self.joint_values else [0.0] * len(self.revolute_joints)):
-                if self.display_in_degrees:
-                    current_vals.append(f"{val * 180.0 / math.pi:.2f}")
-                else:
-                    current_vals.append(f"{val:.2f}")
+            current_vals = [
+                f"{val * self._angle_scale:.2f}"
+                for val in (self.joint_values if len(self.joint_values) else [0.0] * len(self._rev_names))
+            ]
             angles_edit.setText(", ".join(current_vals))
         except Exception:
             pass
@@ -1651,7 +1893,7 @@ class URDFViewer(QMainWindow):
             except ValueError:
                 QMessageBox.critical(dialog, tr("error"), tr("invalid_number"))
                 return
-            n = len(self.revolute_joints)
+            n = len(self._rev_names)
             if len(vals) != n:
                 QMessageBox.warning(dialog, tr("warning"), tr("expected_values", n, len(vals)))
                 return
@@ -1661,17 +1903,14 @@ class URDFViewer(QMainWindow):
             
             # Apply to internal values and sliders (clamped to slider range)
             # Avoid excessive re-render by blocking signals and updating once
-            for i, rad in enumerate(vals):
-                self.joint_values[i] = rad
-                target = int(round(rad * 100.0))
-                slider = self.joint_sliders[i]
-                clamped = max(slider.minimum(), min(slider.maximum(), target))
-                was_blocked = slider.blockSignals(True)
-                slider.setValue(clamped)
-                slider.blockSignals(was_blocked)
+            vals = np.asarray(vals, dtype=np.float64)
+            sliders = self.joint_sliders[:n]
+            mins = np.array([slider.minimum() for slider in sliders])
+            maxs = np.array([slider.maximum() for slider in sliders])
+            targets = np.clip(np.round(vals[:len(sliders)] * 100.0).astype(np.int64), mins, maxs)
+            self._set_slider_values(targets.tolist(), angles=vals)
             
-            # Refresh labels and model once
-            self.update_all_joint_value_labels()
+            # Refresh model once
             self.update_model_with_joint_angles()
             dialog.accept()
         
@@ -1680,8 +1919,8 @@ class URDFViewer(QMainWindow):
         dialog.exec_()
 
     def _get_link_name_by_actor(self, actor):
-        """根据 VTK actor 获取对应的 link 名称"""
-        return self.actor_to_link.get(id(actor))
+        """根据 VTK actor 获取对应的 link 名称（加载时直接挂在 actor 上）"""
+        return getattr(actor, 'link_name', None)
 
     def _get_joint_for_child_link(self, link_name):
         """根据 link 名称找到以该 link 为 child 的关节
@@ -1689,58 +1928,64 @@ class URDFViewer(QMainWindow):
         Returns:
             (joint_index, joint_info) 或 (None, None)
         """
-        for i, joint in enumerate(self.revolute_joints):
-            if joint['child'] == link_name:
-                return i, joint
-        return None, None
+        i = self._rev_by_child.get(link_name)
+        if i is None:
+            return None, None
+        return i, self._revolute_joint_info(i)
 
     def _on_joint_drag(self, joint_index, delta_angle):
         """拖拽产生的关节角度变化回调"""
-        if joint_index < 0 or joint_index >= len(self.joint_values):
-            return
+        self._on_joints_drag({joint_index: delta_angle})
 
-        # 获取关节限位
-        joint_info = self.revolute_joints[joint_index]
-        lower = joint_info['lower']
-        upper = joint_info['upper']
+    def _on_joints_drag(self, deltas):
+        """一次应用多个关节的拖拽增量
 
-        # 更新角度
-        new_angle = self.joint_values[joint_index] + delta_angle
+        Args:
+            deltas: dict，关节序号 -> 角度增量 (rad)
+        """
+        n = len(self.joint_values)
+        items = [(i, d) for i, d in deltas.items() if 0 <= i < n]
+        if not items:
+            return
+        idx = np.fromiter((i for i, _ in items), dtype=np.int64, count=len(items))
+        delta = np.fromiter((d for _, d in items), dtype=np.float64, count=len(items))
 
-        # 限制在关节限位范围内
-        new_angle = max(lower, min(upper, new_angle))
+        # 更新角度并限制在关节限位范围内
+        new_angles = np.clip(self.joint_values[idx] + delta, self._rev_lower[idx], self._rev_upper[idx])
+        self.joint_values[idx] = new_angles
 
-        # 更新值
-        self.joint_values[joint_index] = new_angle
+        for i, angle in zip(idx.tolist(), new_angles.tolist()):
+            # 同步 slider（阻止信号避免重复更新）
+            if i < len(self.joint_sliders):
+                slider = self.joint_sliders[i]
+                was_blocked = slider.blockSignals(True)
+                slider.setValue(int(round(angle * 100.0)))
+                slider.blockSignals(was_blocked)
 
-        # 同步 slider（阻止信号避免重复更新）
-        if joint_index < len(self.joint_sliders):
-            slider = self.joint_sliders[joint_index]
-            slider_val = int(round(new_angle * 100.0))
-            was_blocked = slider.blockSignals(True)
-            slider.setValue(slider_val)
-            slider.blockSignals(was_blocked)
+            # 更新标签
+            if i < len(self.joint_value_labels):
+                self.joint_value_labels[i].setText(self.format_angle(angle))
 
-        # 更新标签
-        if joint_index < len(self.joint_value_labels):
-            self.joint_value_labels[joint_index].setText(self.format_angle(new_angle))
-
-        # 更新模型
-        self.update_model_with_joint_angles()
+        # 更新模型（合并到 _joint_update_timer，拖拽结束时补齐）
+        self._schedule_joint_update()
 
     def _on_drag_start(self, link_name):
         """拖拽开始回调 - 高亮显示被拖拽的 link"""
-        for model in self.models:
-            if model.name == link_name:
-                model.highlight()
-                break
-        self.vtk_widget.GetRenderWindow().Render()
+        # 拖拽期间按交互帧率渲染，允许 VTK 降低渲染质量
+        self.vtk_widget.GetRenderWindow().SetDesiredUpdateRate(self.INTERACTIVE_UPDATE_RATE)
+        self._highlight_link(link_name)
+        self._request_render()
 
     def _on_drag_end(self, link_name):
         """拖拽结束回调 - 取消高亮显示"""
-        for model in self.models:
-            model.unhighlight()
-        self.vtk_widget.GetRenderWindow().Render()
+        # 恢复静止时的高质量渲染，下面的最终一帧按高质量绘制
+        self.vtk_widget.GetRenderWindow().SetDesiredUpdateRate(self.STILL_UPDATE_RATE)
+        with self._render_batch():
+            # 立即应用尚未触发的合并更新，保证松开鼠标时模型与关节值一致
+            if self._joint_update_timer.isActive():
+                self.update_model_with_joint_angles()
+            self._unhighlight_all()
+            self._request_render()
 
     def show_topology_graph(self):
         """Show the robot topology graph dialog"""
@@ -1750,12 +1995,22 @@ class URDFViewer(QMainWindow):
             )
             return
 
-        parser = self._create_parser(self.current_urdf_file)
+        parser = self._get_parser()
+        from topology_dialog import TopologyDialog
         dialog = TopologyDialog(self, parser, self.translation_manager)
         dialog.exec_()
 
+    def _schedule_transparency(self):
+        """合并透明度滑块事件：定时器空闲时才启动，拖动中仍按定时周期刷新
+
+        QTimer.start() 会重启正在运行的定时器，直接连接时连续拖动会一直推迟更新。
+        """
+        if not self._transparency_timer.isActive():
+            self._transparency_timer.start()
+
     def apply_transparency(self):
         """Apply transparency to virtual loaded models"""
+        self._transparency_timer.stop()
         # Get transparency value from slider (convert from 0-100 to 0.0-1.0)
         transparency = self.transparency_slider.value() / 100.0
 
@@ -1764,7 +2019,7 @@ class URDFViewer(QMainWindow):
             model.set_transparency(transparency)
         
         # Update the rendering
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
 
     def create_joint_overview(self):
         """Create joint info overview panel showing all joints and their types"""
@@ -1776,6 +2031,8 @@ class URDFViewer(QMainWindow):
             if widget:
                 widget.deleteLater()
 
+        from topology_dialog import JOINT_COLORS
+
         for joint in self.all_joints:
             row = QWidget()
             row_layout = QHBoxLayout(row)
@@ -1805,14 +2062,15 @@ class URDFViewer(QMainWindow):
         self.clear_joint_sliders()
 
         # Initialize joint values array with zeros
-        self.joint_values = [0.0] * len(self.revolute_joints)
+        # 预分配 float64 数组，拖动/滑块时原地修改，避免 parser 内部 list→array 转换
+        self.joint_values = np.zeros(len(self._rev_names), dtype=np.float64)
         self.joint_value_labels = []
 
         # Create a slider for each revolute joint
-        for i, joint in enumerate(self.revolute_joints):
+        for i, joint_name in enumerate(self._rev_names):
             # Get joint limits
-            lower = joint.get('lower', -math.pi)
-            upper = joint.get('upper', math.pi)
+            lower = float(self._rev_lower[i])
+            upper = float(self._rev_upper[i])
 
             # Container widget for this joint (compact layout)
             joint_widget = QWidget()
@@ -1823,7 +2081,7 @@ class URDFViewer(QMainWindow):
 
             # Row 1: joint name (bold) + current value (right-aligned)
             header_row = QHBoxLayout()
-            name_label = QLabel(joint['name'])
+            name_label = QLabel(joint_name)
             name_label.setStyleSheet("font-weight: bold;")
             header_row.addWidget(name_label)
             header_row.addStretch()
@@ -1849,7 +2107,8 @@ class URDFViewer(QMainWindow):
                 tick_interval = max(1, int(round(range_val / 4 * 100)))
             slider.setTickInterval(tick_interval)
 
-            slider.valueChanged.connect(lambda val, idx=i, label=value_label: self.update_joint_angle(val, idx, label))
+            slider.valueChanged.connect(self._on_slider_changed)
+            slider.sliderReleased.connect(self.update_model_with_joint_angles)
             joint_vbox.addWidget(slider)
 
             # Row 3: range info (small, secondary color)
@@ -1867,17 +2126,20 @@ class URDFViewer(QMainWindow):
             self.joint_layout.addWidget(sep)
 
             # Store references
+            self._slider_index[slider] = i
             self.joint_sliders.append(slider)
             self.joint_value_labels.append(value_label)
     
     def clear_joint_sliders(self):
         """Clear all joint sliders"""
         # Clear the joint values
-        self.joint_values = []
+        self.joint_values = np.zeros(0, dtype=np.float64)
+        self._last_joint_values = None
 
         # Clear the sliders list
         self.joint_sliders = []
         self.joint_value_labels = []
+        self._slider_index = {}
 
         # Remove all widgets from the joint layout (except joint_label)
         if hasattr(self, 'joint_layout'):
@@ -1887,6 +2149,12 @@ class URDFViewer(QMainWindow):
                 if widget:
                     widget.deleteLater()
     
+    def _on_slider_changed(self, value):
+        """所有关节滑块共用的 valueChanged 槽，通过 sender() 找到对应关节"""
+        index = self._slider_index.get(self.sender())
+        if index is not None:
+            self.update_joint_angle(value, index, self.joint_value_labels[index])
+
     def update_joint_angle(self, value, index, label):
         """Update joint angle when slider is moved"""
         # Convert slider value to radians (from hundredths)
@@ -1898,19 +2166,23 @@ class URDFViewer(QMainWindow):
         # Store the value
         self.joint_values[index] = angle
         
-        # Update the model
-        self.update_model_with_joint_angles()
+        # Update the model (coalesced; flushed on slider release)
+        self._schedule_joint_update()
 
     def on_units_changed(self, text):
         """Handle units toggle between radians and degrees for display."""
-        self.display_in_degrees = (text == "deg")
+        self._set_angle_units(text == "deg")
         self.update_all_joint_value_labels()
 
+    def _set_angle_units(self, degrees):
+        """切换显示单位，并预先算好 format_angle 使用的比例与后缀"""
+        self.display_in_degrees = degrees
+        self._angle_scale = 180.0 / math.pi if degrees else 1.0
+        self._angle_unit = "°" if degrees else " rad"
+
     def format_angle(self, angle_radians):
         """Format angle for display according to current unit setting."""
-        if self.display_in_degrees:
-            return f"{angle_radians * 180.0 / math.pi:.2f}°"
-        return f"{angle_radians:.2f} rad"
+        return f"{angle_radians * self._angle_scale:.2f}{self._angle_unit}"
 
     def update_all_joint_value_labels(self):
         """Refresh all joint labels to current unit."""
@@ -1920,44 +2192,75 @@ class URDFViewer(QMainWindow):
     
     def reset_joints(self):
         """Reset all joints to zero position"""
-        if not self.joint_sliders or not self.joint_values:
+        if not self.joint_sliders or not len(self.joint_values):
             return
             
         # Set all sliders to zero
-        for i, slider in enumerate(self.joint_sliders):
-            slider.setValue(0)
+        self._set_slider_values([0] * len(self.joint_sliders))
         
         # Update the model
         self.update_model_with_joint_angles()
     
     def randomize_joints(self):
         """Set all joints to random values"""
-        if not self.joint_sliders or not self.joint_values:
+        if not self.joint_sliders or not len(self.joint_values):
             return
             
         # Set all sliders to random values between min and max
-        for i, slider in enumerate(self.joint_sliders):
-            random_value = np.random.randint(slider.minimum(), slider.maximum())
-            slider.setValue(random_value)
+        mins = np.array([slider.minimum() for slider in self.joint_sliders])
+        maxs = np.array([slider.maximum() for slider in self.joint_sliders])
+        self._set_slider_values(np.random.randint(mins, maxs).tolist())
         
         # Update the model
         self.update_model_with_joint_angles()
+
+    def _set_slider_values(self, values, angles=None):
+        """批量设置滑块值（百分之一弧度），期间屏蔽 valueChanged，由调用方统一更新一次模型
+
+        angles 为 None 时关节值取自滑块；否则直接使用 angles（不受滑块范围截断）
+        """
+        for i, (slider, value) in enumerate(zip(self.joint_sliders, values)):
+            was_blocked = slider.blockSignals(True)
+            slider.setValue(value)
+            slider.blockSignals(was_blocked)
+            # 信号被屏蔽，需手动同步关节值
+            self.joint_values[i] = slider.value() / 100.0 if angles is None else angles[i]
+        self.update_all_joint_value_labels()
     
+    def _schedule_joint_update(self):
+        """合并关节更新：定时器空闲时才启动，连续拖动时每个定时周期至多更新一次
+
+        不能直接调用 start()：它会重启正在运行的定时器，使连续拖动期间模型一直不更新。
+        """
+        if not self._joint_update_timer.isActive():
+            self._joint_update_timer.start()
+
     def update_model_with_joint_angles(self):
         """Update the model visualization with current joint angles"""
+        # 直接调用时取消尚未触发的合并更新
+        self._joint_update_timer.stop()
         if not self.current_urdf_file:
             return
 
+        # 关节值与上次应用的完全一致时（如滑块已在限位处）跳过整个更新
+        if (self._last_joint_values is not None
+                and self._last_joint_values.shape == self.joint_values.shape
+                and np.allclose(self.joint_values, self._last_joint_values, rtol=0.0, atol=1e-9)):
+            return
+        self._last_joint_values = self.joint_values.copy()
+
         # Use cached parser's lightweight update_transforms() for MJCF
-        if self.current_parser and HAS_MJCF and isinstance(self.current_parser, MJCFParser):
+        if _is_mjcf_parser(self.current_parser):
             result = self.current_parser.update_transforms(self.joint_values)
-            link_names = result['link_names']
-            link_mesh_transformations = result['link_mesh_transformations']
-            link_frames = result['link_frames']
-            collision_mesh_transformations = result['collision_mesh_transformations']
+            link_names = result.link_names
+            link_mesh_transformations = result.link_mesh_transformations
+            link_frames = result.link_frames
+            collision_mesh_transformations = result.collision_mesh_transformations
+            # MJCF 走轻量路径，完整 robot info 按需重算
+            self._robot_info = None
         else:
-            # For URDF, recreate parser (lightweight) and get full info
-            parser = self._create_parser(self.current_urdf_file)
+            # For URDF, reuse the cached parser and refresh only the poses (incremental FK)
+            self._robot_info = self.current_parser.update_robot_info(self._robot_info, self.joint_values)
             (link_names,
             _link_mesh_files,
             link_mesh_transformations,
@@ -1974,27 +2277,19 @@ class URDFViewer(QMainWindow):
             _joint_limits,
             _collision_link_names,
             _collision_geometries,
-            ) = parser.get_robot_info(qs=self.joint_values)
+            ) = self._robot_info
         
+        # 所有 link 的文字锚点（z 轴末端）一次性计算
+        link_anchors = z_axis_endpoints(np.asarray(link_frames, dtype=np.float64).reshape(-1, 4, 4))
+
         # Update existing models with new transformations
         for i, model in enumerate(self.models):
             if i < len(link_names) and model.name == link_names[i]:
                 # Update mesh transformation
                 model.apply_transform(link_mesh_transformations[i])
                 
-                # Update axes and text actors
-                if model.axes_actor:
-                    vtk_transform = vtk.vtkTransform()
-                    vtk_transform.SetMatrix(link_frames[i].flatten())
-                    model.axes_actor.SetUserTransform(vtk_transform)
-                
-                if model.text_actor:
-                    # Update text position based on new frame
-                    z_endpoint = [0, 0, 0.05, 1]  # Same axis_length as in create_axes_actor
-                    vtk_transform = vtk.vtkTransform()
-                    vtk_transform.SetMatrix(link_frames[i].flatten())
-                    transformed_point = vtk_transform.TransformPoint(z_endpoint[0], z_endpoint[1], z_endpoint[2])
-                    model.text_actor.SetAttachmentPoint(transformed_point[0], transformed_point[1], transformed_point[2])
+                # Update axes and text actors (写入已有的 vtkTransform)
+                model.update_frame(link_frames[i], anchor=link_anchors[i])
                     
         # Update existing models with new transformations
         for i, model in enumerate(self.models_collision):
@@ -2002,33 +2297,24 @@ class URDFViewer(QMainWindow):
             model.apply_transform(collision_mesh_transformations[i])
             
             # Update axes and text actors
-            if model.axes_actor:
-                vtk_transform = vtk.vtkTransform()
-                vtk_transform.SetMatrix(collision_mesh_transformations[i].flatten())
-                model.axes_actor.SetUserTransform(vtk_transform)
-            
-            if model.text_actor:
-                # Update text position based on new frame
-                z_endpoint = [0, 0, 0.05, 1]  # Same axis_length as in create_axes_actor
-                vtk_transform = vtk.vtkTransform()
-                vtk_transform.SetMatrix(collision_mesh_transformations[i].flatten())
-                transformed_point = vtk_transform.TransformPoint(z_endpoint[0], z_endpoint[1], z_endpoint[2])
-                model.text_actor.SetAttachmentPoint(transformed_point[0], transformed_point[1], transformed_point[2])
+            model.update_frame(collision_mesh_transformations[i])
         
-        # Update MDH frames if they are visible
-        if hasattr(self, 'cb_mdh_frames') and self.cb_mdh_frames.isChecked() and self.selected_chain:
-            self.create_mdh_frames(self.selected_chain)
+        # MDH / 关节轴各自的渲染请求与本次更新合并为一次 Render()
+        with self._render_batch():
+            # Update MDH frames if they are visible
+            if hasattr(self, 'cb_mdh_frames') and self.cb_mdh_frames.isChecked() and self.selected_chain:
+                self.create_mdh_frames(self.selected_chain)
 
-        # Update joint axes if they are visible
-        if hasattr(self, 'cb_joint_axes') and self.cb_joint_axes.isChecked():
-            self.create_joint_axes()
+            # Update joint axes if they are visible
+            if hasattr(self, 'cb_joint_axes') and self.cb_joint_axes.isChecked():
+                self.create_joint_axes()
 
-        # Update inertia visualizations if visible
-        if self.inertia_visualizer and (self.cb_com.isChecked() or self.cb_inertia.isChecked()):
-            self.inertia_visualizer.update_transforms(link_names, link_frames)
+            # Update inertia visualizations if visible
+            if self.inertia_visualizer and (self.cb_com.isChecked() or self.cb_inertia.isChecked()):
+                self.inertia_visualizer.update_transforms(link_names, link_frames)
 
-        # Update the rendering
-        self.vtk_widget.GetRenderWindow().Render()
+            # Update the rendering
+            self._request_render()
     
     def edit_urdf_file(self, replace_collision=False):
         """Open the current URDF file in the XML editor"""
@@ -2039,6 +2325,7 @@ class URDFViewer(QMainWindow):
             return
         
         # Create and show the XML editor window with update callback
+        from xml_editor import XMLEditor
         self.editor = XMLEditor(self.current_urdf_file, self.update_model_from_xml)
         if replace_collision:
             self.editor.replace_collision()
@@ -2046,122 +2333,140 @@ class URDFViewer(QMainWindow):
     
     def update_model_from_xml(self, xml_content):
         """Update the model using XML content from the editor"""
-        try:
-            # Create a temporary file to store the XML content
+        # 整个加载过程中的渲染请求合并为结束时的一次 Render()
+        with self._render_batch():
+            # 内容未变化时跳过整个重建流程（网格加载、碰撞体重建等）
+            xml_hash = hashlib.blake2b(xml_content.encode('utf-8'), digest_size=16).digest()
+            if xml_hash == self._last_xml_hash:
+                return
+
+            try:
+                # Create a temporary file to store the XML content
             
-            if '_temp.urdf' not in self.current_urdf_file:
-                temp_path = self.current_urdf_file.lower().replace('.urdf', '_temp.urdf')
-            else:
-                temp_path = self.current_urdf_file.lower()
+                if '_temp.urdf' not in self.current_urdf_file:
+                    temp_path = self.current_urdf_file.lower().replace('.urdf', '_temp.urdf')
+                else:
+                    temp_path = self.current_urdf_file.lower()
             
-            with open(temp_path, 'w', encoding='utf-8')as temp_file:
-                temp_file.write(xml_content)
+                if self._file_hash(temp_path) != xml_hash:
+                    with open(temp_path, 'w', encoding='utf-8')as temp_file:
+                        temp_file.write(xml_content)
+                    # 临时文件内容已变化，丢弃旧的 parser
+                    self._parser_cache.pop(os.path.abspath(temp_path), None)
             
-            # Clear previous models
-            self.clear_models()
+                # Clear previous models
+                self.clear_models()
             
-            # Parse the URDF from the temporary file
-            parser = self._create_parser(temp_path)
+                # Parse the URDF from the temporary file
+                parser = self._get_parser(temp_path)
             
-            # Get robot info for visualization
-            (link_names,
-            link_mesh_files,
-            link_mesh_transformations,
-            link_frames,
-            link_colors,
-            joint_names,
-            joint_frames,
-            joint_types,
-            joint_axes,
-            joint_parent_links,
-            joint_child_links,
-            collision_mesh_files,
-            collision_mesh_transformations,
-            joint_limits,
-            collision_link_names,
-            collision_geometries,) = parser.get_robot_info()
-
-            # Store revolute joints for slider controls
-            self.revolute_joints = []
-            for i, joint_type in enumerate(joint_types):
-                if joint_type == 'revolute':
-                    limit = joint_limits[i]
-                    self.revolute_joints.append({
-                        'name': joint_names[i],
-                        'index': i,
-                        'parent': joint_parent_links[i],
-                        'child': joint_child_links[i],
-                        'axis': joint_axes[i],
-                        'lower': limit['lower'],
-                        'upper': limit['upper'],
-                    })
-
-            # Store all joints for joint info overview
-            self.all_joints = [
-                {'name': joint_names[i], 'type': joint_types[i]}
-                for i in range(len(joint_names))
-            ]
-            self.create_joint_overview()
+                # Get robot info for visualization
+                (link_names,
+                link_mesh_files,
+                link_mesh_transformations,
+                link_frames,
+                link_colors,
+                joint_names,
+                joint_frames,
+                joint_types,
+                joint_axes,
+                joint_parent_links,
+                joint_child_links,
+                collision_mesh_files,
+                collision_mesh_transformations,
+                joint_limits,
+                collision_link_names,
+                collision_geometries,) = robot_info = parser.get_robot_info()
+
+                # Store revolute joints for slider controls
+                self._set_revolute_joints(
+                    joint_names, joint_types, joint_axes,
+                    joint_parent_links, joint_child_links, joint_limits,
+                )
+
+                # Store all joints for joint info overview
+                self.all_joints = [
+                    {'name': joint_names[i], 'type': joint_types[i]}
+                    for i in range(len(joint_names))
+                ]
+                self.create_joint_overview()
 
-            # Create joint sliders
-            self.create_joint_sliders()
+                # Create joint sliders
+                self.create_joint_sliders()
             
-            # Get chain information
-            self.chains, trees = parser.get_chain_info()
+                # Get chain information
+                self.chains, trees = parser.get_chain_info()
+                self._robot_info = robot_info
+                self._chain_info = (self.chains, trees)
+                self.current_parser = parser
+
+                # 先并行读取所有网格到缓存，再在主线程创建 actor
+                self._preload_meshes(link_mesh_files, collision_mesh_files, collision_geometries)
             
-            # Create models for each link
-            for i in range(len(link_names)):
-                self.add_urdf_model(
-                    link_names[i],
-                    link_mesh_files[i],
-                    link_mesh_transformations[i],
-                    link_frames[i],
-                    link_colors[i],
-                )
-                
-            # Create models for each collision
-            for i in range(len(collision_geometries)):
-                coll_link = collision_link_names[i] if i < len(collision_link_names) else None
-                geom = collision_geometries[i]
-                if geom['type'] == 'mesh':
+                # Create models for each link
+                for i in range(len(link_names)):
                     self.add_urdf_model(
-                        f"",
-                        collision_mesh_files[i],
-                        collision_mesh_transformations[i],
-                        None,
-                        None,
-                        model_type='collision',
-                        link_name=coll_link,
-                    )
-                else:
-                    self._add_collision_primitive_model(
-                        geom, collision_mesh_transformations[i], coll_link,
+                        link_names[i],
+                        link_mesh_files[i],
+                        link_mesh_transformations[i],
+                        link_frames[i],
+                        link_colors[i],
                     )
                 
-            self.cb_collision.setChecked(True)
-            self.transparency_slider.setValue(100)
+                # Create models for each collision
+                for i in range(len(collision_geometries)):
+                    coll_link = collision_link_names[i] if i < len(collision_link_names) else None
+                    geom = collision_geometries[i]
+                    if geom['type'] == 'mesh':
+                        self.add_urdf_model(
+                            f"",
+                            collision_mesh_files[i],
+                            collision_mesh_transformations[i],
+                            None,
+                            None,
+                            model_type='collision',
+                            link_name=coll_link,
+                        )
+                    else:
+                        self._add_collision_primitive_model(
+                            geom, collision_mesh_transformations[i], coll_link,
+                        )
+                
+                self.cb_collision.setChecked(True)
+                self.transparency_slider.setValue(100)
 
-            # Populate the chain tree
-            self.populate_chain_tree()
+                # Populate the chain tree
+                self.populate_chain_tree()
 
-            # Reset camera to show all actors
-            # self.renderer.ResetCamera()
-            self.vtk_widget.GetRenderWindow().Render()
+                # Reset camera to show all actors
+                # self.renderer.ResetCamera()
+                self._request_render()
 
-            # Store the temporary file path as the current URDF file
-            # This allows further editing and updates
-            self.current_urdf_file = temp_path
+                # Store the temporary file path as the current URDF file
+                # This allows further editing and updates
+                self.current_urdf_file = temp_path
 
-            # Apply visibility settings from checkboxes to new models
-            self._apply_visibility_settings()
+                # Apply visibility settings from checkboxes to new models
+                self._apply_visibility_settings()
+
+                # Update current file label
+                self.update_current_file_label()
 
-            # Update current file label
-            self.update_current_file_label()
+                self._last_xml_hash = xml_hash
             
-        except Exception as e:
-            QMessageBox.critical(
-                self, tr("error"), tr("update_model_failed", str(e))
-            )
+            except Exception as e:
+                QMessageBox.critical(
+                    self, tr("error"), tr("update_model_failed", str(e))
+                )
+
+    @staticmethod
+    def _file_hash(path):
+        """返回文件内容的 blake2b 摘要，文件不存在时返回 None"""
+        try:
+            with open(path, 'rb') as f:
+                return hashlib.blake2b(f.read(), digest_size=16).digest()
+        except OSError:
+            return None
 
     def update_current_file_label(self):
         """Update the current file label with the current URDF file path"""
@@ -2169,7 +2474,7 @@ class URDFViewer(QMainWindow):
             filename = os.path.basename(self.current_urdf_file)
             self.current_file_label.setText(tr("current_file") + " " + filename)
             # Update status bar
-            n_joints = len(self.revolute_joints)
+            n_joints = len(self._rev_names)
             n_links = len(self.models)
             self.status_label.setText(
                 tr("status_file_info", None, filename, n_joints, n_links)
@@ -2201,9 +2506,8 @@ class URDFViewer(QMainWindow):
 
         # Link frames (axes + text on visual models)
         frames_visible = self.cb_link_frames.isChecked()
+        self._link_frame_assembly.SetVisibility(frames_visible)
         for model in self.models:
-            if model.axes_actor is not None:
-                model.axes_actor.SetVisibility(frames_visible)
             if hasattr(model, 'text_actor') and model.text_actor is not None:
                 model.text_actor.SetVisibility(frames_visible)
 
@@ -2213,23 +2517,16 @@ class URDFViewer(QMainWindow):
 
         # CoM markers - recreate if checked
         if self.cb_com.isChecked() and self.current_urdf_file:
-            parser = self._create_parser(self.current_urdf_file)
-            (link_names, _, _, link_frames, _, _, _, _, _, _, _, _, _, _, _, _) = parser.get_robot_info(qs=self.joint_values)
-            self.inertia_visualizer.create_com_markers(parser, link_names, link_frames)
+            self._ensure_com_markers()
 
         # Inertia boxes - recreate if checked
         if self.cb_inertia.isChecked() and self.current_urdf_file:
-            parser = self._create_parser(self.current_urdf_file)
-            (link_names, _, _, link_frames, _, _, _, _, _, _, _, _, _, _, _, _) = parser.get_robot_info(qs=self.joint_values)
-            r, g, b, a = self.inertia_color
-            self.inertia_visualizer.create_inertia_boxes(
-                parser, link_names, link_frames,
-                color=(r, g, b), opacity=a)
+            self._ensure_inertia_boxes()
 
         # Apply current transparency setting to newly loaded models
         self.apply_transparency()
 
-        self.vtk_widget.GetRenderWindow().Render()
+        self._request_render()
             
     def decompose_collision_meshes(self):
         """Handle decomposition of collision meshes"""
@@ -2240,6 +2537,7 @@ class URDFViewer(QMainWindow):
             return
         
         # Create and show the decomposition dialog
+        from decomp_dialog import DecompDialog
         dialog = DecompDialog(self, self.collision_mesh_files)
         
         decomposed_mesh_files = dialog.exec_()
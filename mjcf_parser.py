@@ -2,10 +2,93 @@ import numpy as np
 import math
 import os
 import xml.etree.ElementTree as ET
+from collections import namedtuple
 
 import mujoco
 from anytree import Node
 
+from urdf_parser import batch_mdh_axes, batch_mdh_chains, batch_mdh_parameters, mdh_rest_relative, _solve_2col
+
+# lxml 的 C 解析器解析大型 MJCF 更快；未安装时退回标准库
+try:
+    from lxml import etree as ET_fast
+except ImportError:
+    ET_fast = ET
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _fill_transforms_numpy(xpos, xmat, ids, rows, out):
+    """out[rows[k]] = 由 xpos[ids[k]] / xmat[ids[k]] 组成的 4x4 齐次变换"""
+    out[rows, :3, :3] = xmat[ids].reshape(-1, 3, 3)
+    out[rows, :3, 3] = xpos[ids]
+    out[rows, 3, :3] = 0.0
+    out[rows, 3, 3] = 1.0
+    return out
+
+
+def _fill_transforms_loops(xpos, xmat, ids, rows, out):
+    """与 _fill_transforms_numpy 相同，展开为标量循环供 numba 编译"""
+    for k in range(ids.shape[0]):
+        b = ids[k]
+        i = rows[k]
+        for r in range(3):
+            for c in range(3):
+                out[i, r, c] = xmat[b, 3 * r + c]
+            out[i, r, 3] = xpos[b, r]
+            out[i, 3, r] = 0.0
+        out[i, 3, 3] = 1.0
+    return out
+
+
+def _quats_to_rpy_numpy(q):
+    """(N,4) 四元数 (w, x, y, z) 转 (N,3) roll-pitch-yaw"""
+    w, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+
+    # Roll (x-axis rotation)
+    roll = np.arctan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y))
+    # Pitch (y-axis rotation)，|sinp| >= 1 时截断为 ±pi/2
+    pitch = np.arcsin(np.clip(2.0 * (w * y - z * x), -1.0, 1.0))
+    # Yaw (z-axis rotation)
+    yaw = np.arctan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+
+    return np.stack((roll, pitch, yaw), axis=1)
+
+
+def _quats_to_rpy_loops(q):
+    """与 _quats_to_rpy_numpy 相同，逐个四元数展开供 numba 编译"""
+    out = np.empty((q.shape[0], 3))
+    for k in range(q.shape[0]):
+        w, x, y, z = q[k, 0], q[k, 1], q[k, 2], q[k, 3]
+        out[k, 0] = math.atan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y))
+        out[k, 1] = math.asin(min(1.0, max(-1.0, 2.0 * (w * y - z * x))))
+        out[k, 2] = math.atan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+    return out
+
+
+if HAS_NUMBA:
+    _fill_transforms = njit(cache=True, boundscheck=False)(_fill_transforms_loops)
+    _rpy_from_quats = njit(cache=True)(_quats_to_rpy_loops)
+else:
+    _fill_transforms = _fill_transforms_numpy
+    _rpy_from_quats = _quats_to_rpy_numpy
+
+
+# update_transforms() 的返回值：按属性访问，字段顺序固定
+TransformUpdate = namedtuple("TransformUpdate", [
+    "link_names",
+    "link_mesh_transformations",
+    "link_frames",
+    "collision_mesh_transformations",
+    "joint_names",
+    "joint_frames",
+    "joint_axes",
+])
+
 
 class MJCFParser:
     """Class to parse MuJoCo MJCF (.xml) files and extract link and joint information.
@@ -26,43 +109,114 @@ class MJCFParser:
 
         # Run forward kinematics at default pose
         mujoco.mj_forward(self.model, self.data)
+        # data 中的 xpos / xmat 是否落后于 qpos；外部直接改写 data.qpos 后需调用 mark_dirty()
+        self._kin_dirty = False
+        self._qpos0 = np.array(self.model.qpos0)
+        # hinge 关节按定义顺序对应 qs 的下标，qpos 地址只算一次
+        self._hinge_qpos_addr = np.asarray(self.model.jnt_qposadr, dtype=np.int64)[
+            np.asarray(self.model.jnt_type) == mujoco.mjtJoint.mjJNT_HINGE]
+
+        # MJCF XML 只解析一次，meshdir 与 mesh 资源表共用同一棵树
+        self._xml_root = self._parse_xml_root()
 
         # Parse the meshdir from XML compiler options
         self._meshdir = self._parse_meshdir()
 
+        # 名称查找表：id → 名称只调用一次 mj_id2name，热路径中直接索引列表
+        self._body_names = []
+        for i in range(self.model.nbody):
+            name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_BODY, i)
+            self._body_names.append(name if name is not None else f"body_{i}")
+        self._joint_names = []
+        for i in range(self.model.njnt):
+            name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_JOINT, i)
+            self._joint_names.append(name if name is not None else f"joint_{i}")
+        self._mesh_names = [mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_MESH, i)
+                            for i in range(self.model.nmesh)]
+        self._mesh_file_cache = {}  # mesh_id → 文件路径（可能为 None）
+
+        # 几何体静态属性只从 MjModel 取一次，避免循环中反复跨越 pybind 边界
+        self._geom_type = np.asarray(self.model.geom_type)
+        self._geom_bodyid = np.asarray(self.model.geom_bodyid)
+        self._geom_contype = np.asarray(self.model.geom_contype)
+        self._geom_dataid = np.asarray(self.model.geom_dataid)
+        self._geom_pos = np.asarray(self.model.geom_pos)
+        self._geom_quat = np.asarray(self.model.geom_quat)
+        self._geom_size = np.asarray(self.model.geom_size)
+        self._geom_rgba = np.asarray(self.model.geom_rgba)
+
+        # 所有 body / geom / 惯性主轴的四元数一次性转换为 rpy，解析时按索引取
+        self._body_rpy = self._quats_to_rpy(self.model.body_quat)
+        self._body_irpy = self._quats_to_rpy(self.model.body_iquat)
+        self._geom_rpy = self._quats_to_rpy(self._geom_quat)
+
         # Parse model structure
         self._parse_bodies()
         self._parse_joints()
 
+        # 每个关节的子 body id 与 body 坐标系下的 jnt_pos，供整批计算关节坐标系
+        self._joint_child_ids = np.array([joint["child_body_id"] for joint in self.joints], dtype=np.int32)
+        self._joint_rows = np.arange(len(self.joints), dtype=np.int32)
+        self._joint_offsets = np.asarray(self.model.jnt_pos)[[joint["mj_jnt_id"] for joint in self.joints]]
+        # update_transforms 每次原样返回的静态列表与关节坐标系缓冲区
+        self._joint_name_list = [joint["name"] for joint in self.joints]
+        self._joint_axis_list = [joint["axis"] for joint in self.joints]
+        self._joint_frame_buf = np.zeros((len(self.joints), 4, 4))
+
         # 缓存几何体索引分类，用于 update_transforms() 快速更新
-        self._visual_geom_indices = []  # (geom_idx, body_id, is_mesh)
-        self._collision_geom_indices = []  # (geom_idx, body_id, geom_type)
         self._cache_geom_indices()
 
-    def _parse_meshdir(self):
-        """Parse the meshdir compiler option from the MJCF XML file."""
+    def _parse_xml_root(self):
+        """Parse the MJCF XML file once; returns the root element or None on failure."""
         try:
-            tree = ET.parse(self.mjcf_file)
-            root = tree.getroot()
-            compiler = root.find('compiler')
-            if compiler is not None:
-                meshdir = compiler.get('meshdir', '')
-                if meshdir:
-                    return os.path.join(self.mesh_dir, meshdir)
+            return ET_fast.parse(self.mjcf_file).getroot()
         except Exception:
-            pass
-        return self.mesh_dir
+            return None
+
+    def _parse_meshdir(self):
+        """Parse the meshdir compiler option and the mesh assets from the MJCF XML root.
+
+        同时记录 <mesh name=... file=...>，供 _get_mesh_file 查表。
+        """
+        meshdir = self.mesh_dir
+        mesh_file_attrs = {}
+        root = self._xml_root
+        if root is not None:
+            compiler = root.find('compiler')
+            if compiler is not None and compiler.get('meshdir', ''):
+                meshdir = os.path.join(self.mesh_dir, compiler.get('meshdir'))
+            for mesh_elem in root.iter('mesh'):
+                name = mesh_elem.get('name')
+                if name is not None and mesh_elem.get('file'):
+                    mesh_file_attrs.setdefault(name, mesh_elem.get('file'))
+
+        # name → 实际存在的文件路径
+        self._mesh_file_map = {}
+        for name, mesh_file in mesh_file_attrs.items():
+            full_path = os.path.join(meshdir, mesh_file)
+            if os.path.exists(full_path):
+                self._mesh_file_map[name] = full_path
+        return meshdir
 
     def _parse_bodies(self):
-        """Parse all bodies (links) from the MuJoCo model."""
+        """Parse all bodies (links) from the MuJoCo model.
+
+        xyz / rpy / 尺寸等数值保存为 ndarray（只读使用），需要 list 的调用方自行 tolist()。
+        """
+        # 单次遍历全部几何体：每个 body 取第一个可用的视觉 / 碰撞几何体
+        visual_infos = [None] * self.model.nbody
+        collision_infos = [None] * self.model.nbody
+        for g, body_id in enumerate(self._geom_bodyid.tolist()):
+            if visual_infos[body_id] is None:
+                visual_infos[body_id] = self._geom_visual_info(g)
+            if collision_infos[body_id] is None:
+                collision_infos[body_id] = self._geom_collision_info(g)
+
         for i in range(self.model.nbody):
-            name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_BODY, i)
-            if name is None:
-                name = f"body_{i}"
+            name = self._body_names[i]
 
-            # Get visual geom info for this body
-            visual_info = self._get_body_visual_geom(i)
-            collision_info = self._get_body_collision_geom(i)
+            visual_info = visual_infos[i]
+            collision_info = collision_infos[i]
             inertial_info = self._get_body_inertial(i)
 
             if visual_info is not None:
@@ -98,107 +252,99 @@ class MJCFParser:
             # Add inertial info
             self.links[name]['inertial'] = inertial_info
 
-    def _get_body_visual_geom(self, body_id):
-        """Get visual geometry information for a body."""
-        # Find geoms belonging to this body
-        for g in range(self.model.ngeom):
-            if self.model.geom_bodyid[g] != body_id:
-                continue
-
-            # Check contype/conaffinity - visual geoms typically have contype=0, conaffinity=0
-            # But in practice, we just take the first geom that has a visual representation
-            geom_group = self.model.geom_group[g]
-            # Group 0 is typically visual, group 3 is collision in many models
-            # But we should be flexible - try to find mesh geoms first
-            geom_type = self.model.geom_type[g]
-            rgba = self.model.geom_rgba[g].tolist()
-
-            if geom_type == mujoco.mjtGeom.mjGEOM_MESH:
-                mesh_id = self.model.geom_dataid[g]
-                if mesh_id >= 0:
-                    mesh_file = self._get_mesh_file(mesh_id)
-                    geom_pos = self.model.geom_pos[g].tolist()
-                    geom_quat = self.model.geom_quat[g].tolist()  # (w, x, y, z)
-                    rpy = self._quat_to_rpy(geom_quat)
-                    return {
-                        'mesh_file': mesh_file,
-                        'origin': {"xyz": geom_pos, "rpy": rpy},
-                        'color': rgba if any(c > 0 for c in rgba[:3]) else [0.5, 0.5, 0.5, 1.0],
-                        'geom_type': 'mesh',
-                    }
-            elif geom_type in (mujoco.mjtGeom.mjGEOM_BOX, mujoco.mjtGeom.mjGEOM_SPHERE,
-                               mujoco.mjtGeom.mjGEOM_CYLINDER, mujoco.mjtGeom.mjGEOM_CAPSULE,
-                               mujoco.mjtGeom.mjGEOM_ELLIPSOID):
-                # For primitive geoms, we don't have a mesh file
-                # but we record the info for potential rendering
-                geom_pos = self.model.geom_pos[g].tolist()
-                geom_quat = self.model.geom_quat[g].tolist()
-                rpy = self._quat_to_rpy(geom_quat)
-                size = self.model.geom_size[g].tolist()
-                type_name = self._geom_type_name(geom_type)
+    def _geom_visual_info(self, g):
+        """Get visual geometry information for a geom (None if it has no visual representation)."""
+        # Check contype/conaffinity - visual geoms typically have contype=0, conaffinity=0
+        # But in practice, each body takes the first geom that has a visual representation
+        # Group 0 is typically visual, group 3 is collision in many models
+        # But we should be flexible - try to find mesh geoms first
+        geom_type = int(self._geom_type[g])  # 与 mjtGeom 比较需用 Python int
+        color = self._geom_color(g)
+
+        if geom_type == mujoco.mjtGeom.mjGEOM_MESH:
+            mesh_id = self._geom_dataid[g]
+            if mesh_id >= 0:
+                mesh_file = self._get_mesh_file(mesh_id)
+                geom_pos = self._geom_pos[g]
+                rpy = self._geom_rpy[g]
                 return {
-                    'mesh_file': None,
+                    'mesh_file': mesh_file,
                     'origin': {"xyz": geom_pos, "rpy": rpy},
-                    'color': rgba if any(c > 0 for c in rgba[:3]) else [0.5, 0.5, 0.5, 1.0],
-                    'geom_type': type_name,
-                    'geom_size': size,
+                    'color': color,
+                    'geom_type': 'mesh',
                 }
+        elif geom_type in (mujoco.mjtGeom.mjGEOM_BOX, mujoco.mjtGeom.mjGEOM_SPHERE,
+                           mujoco.mjtGeom.mjGEOM_CYLINDER, mujoco.mjtGeom.mjGEOM_CAPSULE,
+                           mujoco.mjtGeom.mjGEOM_ELLIPSOID):
+            # For primitive geoms, we don't have a mesh file
+            # but we record the info for potential rendering
+            geom_pos = self._geom_pos[g]
+            rpy = self._geom_rpy[g]
+            size = self._geom_size[g]
+            type_name = self._geom_type_name(geom_type)
+            return {
+                'mesh_file': None,
+                'origin': {"xyz": geom_pos, "rpy": rpy},
+                'color': color,
+                'geom_type': type_name,
+                'geom_size': size,
+            }
         return None
 
-    def _get_body_collision_geom(self, body_id):
-        """Get collision geometry information for a body."""
-        for g in range(self.model.ngeom):
-            if self.model.geom_bodyid[g] != body_id:
-                continue
-
-            geom_type = self.model.geom_type[g]
-            geom_pos = self.model.geom_pos[g].tolist()
-            geom_quat = self.model.geom_quat[g].tolist()
-            rpy = self._quat_to_rpy(geom_quat)
-            size = self.model.geom_size[g].tolist()
-
-            collision_origin = {"xyz": geom_pos, "rpy": rpy}
-
-            if geom_type == mujoco.mjtGeom.mjGEOM_MESH:
-                mesh_id = self.model.geom_dataid[g]
-                if mesh_id >= 0:
-                    mesh_file = self._get_mesh_file(mesh_id)
-                    return {
-                        'collision_type': 'mesh',
-                        'collision_mesh': mesh_file,
-                        'collision_origin': collision_origin,
-                    }
-            elif geom_type == mujoco.mjtGeom.mjGEOM_BOX:
-                return {
-                    'collision_type': 'box',
-                    'collision_mesh': None,
-                    'collision_origin': collision_origin,
-                    'collision_box_size': [s * 2 for s in size[:3]],  # MuJoCo uses half-sizes
-                }
-            elif geom_type == mujoco.mjtGeom.mjGEOM_SPHERE:
-                return {
-                    'collision_type': 'sphere',
-                    'collision_mesh': None,
-                    'collision_origin': collision_origin,
-                    'collision_sphere_radius': size[0],
-                }
-            elif geom_type == mujoco.mjtGeom.mjGEOM_CYLINDER:
-                return {
-                    'collision_type': 'cylinder',
-                    'collision_mesh': None,
-                    'collision_origin': collision_origin,
-                    'collision_cylinder_radius': size[0],
-                    'collision_cylinder_length': size[1] * 2,  # MuJoCo uses half-length
-                }
-            elif geom_type == mujoco.mjtGeom.mjGEOM_CAPSULE:
-                # Approximate capsule as cylinder
+    def _geom_color(self, g):
+        """geom 的 rgba；未设置颜色（rgb 全为 0）时使用灰色"""
+        rgba = self._geom_rgba[g]
+        return rgba.tolist() if rgba[:3].any() else [0.5, 0.5, 0.5, 1.0]
+
+    def _geom_collision_info(self, g):
+        """Get collision geometry information for a geom (None if unsupported as collision)."""
+        geom_type = int(self._geom_type[g])
+        geom_pos = self._geom_pos[g]
+        rpy = self._geom_rpy[g]
+        size = self._geom_size[g]
+
+        collision_origin = {"xyz": geom_pos, "rpy": rpy}
+
+        if geom_type == mujoco.mjtGeom.mjGEOM_MESH:
+            mesh_id = self._geom_dataid[g]
+            if mesh_id >= 0:
+                mesh_file = self._get_mesh_file(mesh_id)
                 return {
-                    'collision_type': 'cylinder',
-                    'collision_mesh': None,
+                    'collision_type': 'mesh',
+                    'collision_mesh': mesh_file,
                     'collision_origin': collision_origin,
-                    'collision_cylinder_radius': size[0],
-                    'collision_cylinder_length': size[1] * 2,
                 }
+        elif geom_type == mujoco.mjtGeom.mjGEOM_BOX:
+            return {
+                'collision_type': 'box',
+                'collision_mesh': None,
+                'collision_origin': collision_origin,
+                'collision_box_size': size[:3] * 2,  # MuJoCo uses half-sizes
+            }
+        elif geom_type == mujoco.mjtGeom.mjGEOM_SPHERE:
+            return {
+                'collision_type': 'sphere',
+                'collision_mesh': None,
+                'collision_origin': collision_origin,
+                'collision_sphere_radius': size[0],
+            }
+        elif geom_type == mujoco.mjtGeom.mjGEOM_CYLINDER:
+            return {
+                'collision_type': 'cylinder',
+                'collision_mesh': None,
+                'collision_origin': collision_origin,
+                'collision_cylinder_radius': size[0],
+                'collision_cylinder_length': size[1] * 2,  # MuJoCo uses half-length
+            }
+        elif geom_type == mujoco.mjtGeom.mjGEOM_CAPSULE:
+            # Approximate capsule as cylinder
+            return {
+                'collision_type': 'cylinder',
+                'collision_mesh': None,
+                'collision_origin': collision_origin,
+                'collision_cylinder_radius': size[0],
+                'collision_cylinder_length': size[1] * 2,
+            }
         return None
 
     def _get_body_inertial(self, body_id):
@@ -208,9 +354,8 @@ class MJCFParser:
             return None
 
         # Center of mass position relative to body frame
-        ipos = self.model.body_ipos[body_id].tolist()
-        iquat = self.model.body_iquat[body_id].tolist()
-        rpy = self._quat_to_rpy(iquat)
+        ipos = self.model.body_ipos[body_id]
+        rpy = self._body_irpy[body_id]
 
         # Inertia (diagonal in principal frame)
         inertia_diag = self.model.body_inertia[body_id]
@@ -229,8 +374,13 @@ class MJCFParser:
         }
 
     def _get_mesh_file(self, mesh_id):
-        """Get the file path for a mesh asset."""
-        mesh_name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_MESH, mesh_id)
+        """Get the file path for a mesh asset (resolved once per mesh id)."""
+        if mesh_id not in self._mesh_file_cache:
+            self._mesh_file_cache[mesh_id] = self._resolve_mesh_file(self._mesh_names[mesh_id])
+        return self._mesh_file_cache[mesh_id]
+
+    def _resolve_mesh_file(self, mesh_name):
+        """Find the mesh file for a mesh asset name."""
         if mesh_name is None:
             return None
 
@@ -246,21 +396,8 @@ class MJCFParser:
         if os.path.exists(mesh_path):
             return mesh_path
 
-        # Try parsing the XML to find the actual file attribute
-        try:
-            tree = ET.parse(self.mjcf_file)
-            root = tree.getroot()
-            for mesh_elem in root.iter('mesh'):
-                if mesh_elem.get('name') == mesh_name:
-                    mesh_file = mesh_elem.get('file')
-                    if mesh_file:
-                        full_path = os.path.join(self._meshdir, mesh_file)
-                        if os.path.exists(full_path):
-                            return full_path
-        except Exception:
-            pass
-
-        return None
+        # Fall back to the file attribute recorded from the XML
+        return self._mesh_file_map.get(mesh_name)
 
     def _geom_type_name(self, geom_type):
         """Convert MuJoCo geom type enum to string name."""
@@ -291,23 +428,17 @@ class MJCFParser:
     def _parse_joints(self):
         """Parse all joints from the MuJoCo model."""
         for i in range(self.model.njnt):
-            name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_JOINT, i)
-            if name is None:
-                name = f"joint_{i}"
+            name = self._joint_names[i]
 
             joint_type = self._map_joint_type(self.model.jnt_type[i])
 
             # Get parent body (the body the joint belongs to)
             body_id = self.model.jnt_bodyid[i]
-            child_name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_BODY, body_id)
-            if child_name is None:
-                child_name = f"body_{body_id}"
+            child_name = self._body_names[body_id]
 
             # Parent body
             parent_body_id = self.model.body_parentid[body_id]
-            parent_name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_BODY, parent_body_id)
-            if parent_name is None:
-                parent_name = f"body_{parent_body_id}"
+            parent_name = self._body_names[parent_body_id]
 
             # Joint axis (in body frame)
             axis = self.model.jnt_axis[i].tolist()
@@ -326,8 +457,7 @@ class MJCFParser:
 
             # Joint origin: use body position relative to parent
             body_pos = self.model.body_pos[body_id].tolist()
-            body_quat = self.model.body_quat[body_id].tolist()  # (w, x, y, z)
-            rpy = self._quat_to_rpy(body_quat)
+            rpy = self._body_rpy[body_id].tolist()
 
             self.joints.append({
                 "name": name,
@@ -336,6 +466,8 @@ class MJCFParser:
                 "child": child_name,
                 "origin": {"xyz": body_pos, "rpy": rpy},
                 "axis": axis,
+                "child_body_id": int(body_id),
+                "mj_jnt_id": i,
                 "limit": {
                     "lower": lower,
                     "upper": upper,
@@ -345,28 +477,10 @@ class MJCFParser:
             })
 
     @staticmethod
-    def _quat_to_rpy(quat_wxyz):
-        """Convert quaternion (w, x, y, z) to roll-pitch-yaw (rpy)."""
-        w, x, y, z = quat_wxyz
-
-        # Roll (x-axis rotation)
-        sinr_cosp = 2.0 * (w * x + y * z)
-        cosr_cosp = 1.0 - 2.0 * (x * x + y * y)
-        roll = math.atan2(sinr_cosp, cosr_cosp)
-
-        # Pitch (y-axis rotation)
-        sinp = 2.0 * (w * y - z * x)
-        if abs(sinp) >= 1:
-            pitch = math.copysign(math.pi / 2, sinp)
-        else:
-            pitch = math.asin(sinp)
-
-        # Yaw (z-axis rotation)
-        siny_cosp = 2.0 * (w * z + x * y)
-        cosy_cosp = 1.0 - 2.0 * (y * y + z * z)
-        yaw = math.atan2(siny_cosp, cosy_cosp)
-
-        return [roll, pitch, yaw]
+    def _quats_to_rpy(quats_wxyz):
+        """Convert (N,4) quaternions (w, x, y, z) to (N,3) roll-pitch-yaw (rpy)."""
+        q = np.ascontiguousarray(quats_wxyz, dtype=np.float64).reshape(-1, 4)
+        return _rpy_from_quats(q)
 
     @staticmethod
     def _quat_to_rotmat(quat_wxyz):
@@ -380,269 +494,124 @@ class MJCFParser:
         return R
 
     def compute_transformation(self, rpy, xyz):
-        """Compute 4x4 transformation matrix from RPY and XYZ (same as URDFParser)."""
-        roll, pitch, yaw = rpy
+        """Compute 4x4 transformation matrix from RPY and XYZ (same as URDFParser).
 
-        Rx = np.array([
-            [1, 0, 0],
-            [0, math.cos(roll), -math.sin(roll)],
-            [0, math.sin(roll), math.cos(roll)],
-        ])
+        R = Rz(yaw) @ Ry(pitch) @ Rx(roll)，按展开式直接填写，不构造中间矩阵。
+        """
+        cr, cp, cy = math.cos(rpy[0]), math.cos(rpy[1]), math.cos(rpy[2])
+        sr, sp, sy = math.sin(rpy[0]), math.sin(rpy[1]), math.sin(rpy[2])
+
+        T = np.empty((4, 4))
+        T[0, 0] = cy * cp
+        T[0, 1] = cy * sp * sr - sy * cr
+        T[0, 2] = cy * sp * cr + sy * sr
+        T[1, 0] = sy * cp
+        T[1, 1] = sy * sp * sr + cy * cr
+        T[1, 2] = sy * sp * cr - cy * sr
+        T[2, 0] = -sp
+        T[2, 1] = cp * sr
+        T[2, 2] = cp * cr
+        T[:3, 3] = xyz
+        T[3] = (0.0, 0.0, 0.0, 1.0)
 
-        Ry = np.array([
-            [math.cos(pitch), 0, math.sin(pitch)],
-            [0, 1, 0],
-            [-math.sin(pitch), 0, math.cos(pitch)],
-        ])
+        return T
 
-        Rz = np.array([
-            [math.cos(yaw), -math.sin(yaw), 0],
-            [math.sin(yaw), math.cos(yaw), 0],
-            [0, 0, 1],
-        ])
+    @staticmethod
+    def _stack_transforms(xpos, xmat):
+        """由 (N,3) 位置和 (N,9) 旋转矩阵整批构建 (N,4,4) 齐次变换"""
+        n = xpos.shape[0]
+        T = np.zeros((n, 4, 4))
+        T[:, :3, :3] = xmat.reshape(n, 3, 3)
+        T[:, :3, 3] = xpos
+        T[:, 3, 3] = 1.0
+        return T
 
-        R = Rz @ Ry @ Rx
+    def _bulk_body_transforms(self, body_ids):
+        """按 body id 数组整批取出当前 data 中的 body 世界变换 (N,4,4)
 
-        T = np.eye(4)
-        T[:3, :3] = R
-        T[:3, 3] = xyz
+        body id 为负的行保持单位矩阵。
+        """
+        body_ids = np.asarray(body_ids, dtype=np.int32).reshape(-1)
+        out = np.tile(np.eye(4), (body_ids.shape[0], 1, 1))
+        rows = np.flatnonzero(body_ids >= 0).astype(np.int32)
+        return _fill_transforms(self.data.xpos, self.data.xmat, body_ids[rows], rows, out)
 
-        return T
+    def _kinematic_views(self):
+        """一次性取出 data 中的 xpos / xmat / geom_xpos / geom_xmat 视图
+
+        每次访问 self.data.xxx 都要经过 pybind11 属性描述符构造包装数组，
+        热路径中先绑定为局部变量，再传给各个填充函数。
+        """
+        data = self.data
+        return (np.asarray(data.xpos), np.asarray(data.xmat),
+                np.asarray(data.geom_xpos), np.asarray(data.geom_xmat))
+
+    def _joint_world_frames(self, out=None, views=None):
+        """整批计算关节世界坐标系：子 body 的姿态，原点平移 jnt_pos（body 坐标系下）
+
+        Args:
+            out: 可选的 (njoint,4,4) 预分配缓冲区
+            views: 可选的 _kinematic_views() 结果
+
+        Returns:
+            (len(self.joints),4,4) ndarray
+        """
+        if out is None:
+            out = np.empty((len(self.joints), 4, 4))
+        xpos, xmat = (views or self._kinematic_views())[:2]
+        _fill_transforms(xpos, xmat, self._joint_child_ids, self._joint_rows, out)
+        # Joint world position = Body world position + Body rotation * jnt_pos
+        out[:, :3, 3] += np.einsum('nij,nj->ni', out[:, :3, :3], self._joint_offsets)
+        return out
 
     def get_robot_info(self, qs=None):
         """Return robot information in the same format as URDFParser.get_robot_info().
 
-        Uses MuJoCo's forward kinematics to compute all body/geom positions.
+        Uses MuJoCo's kinematics (mj_kinematics) to compute all body/geom positions.
         Now properly handles multiple geoms per body.
         """
-        # Set joint positions if provided
-        if qs is not None:
-            # Map revolute joint values to qpos
-            rev_idx = 0
-            for i in range(self.model.njnt):
-                if self.model.jnt_type[i] == mujoco.mjtJoint.mjJNT_HINGE:
-                    if rev_idx < len(qs):
-                        qpos_addr = self.model.jnt_qposadr[i]
-                        self.data.qpos[qpos_addr] = qs[rev_idx]
-                        rev_idx += 1
-        else:
-            # Reset to default pose
-            mujoco.mj_resetData(self.model, self.data)
+        if qs is None:
+            # Reset to default pose：只恢复 qpos / qvel，不清零整个 MjData
+            np.copyto(self.data.qpos, self._qpos0)
+            self.data.qvel[:] = 0
+
+        # 只读取 xpos / xmat / geom_xpos / geom_xmat，运动学即可，与 update_transforms 一致
+        self._run_kinematics(qs)
+
+        # 几何体分类在 _cache_geom_indices 中已完成，这里只按索引数组取变换
+        vis = self._vis_plan
+        n_vis = len(self._vis_g)
+        link_names = list(self._vis_link_names)
+        link_mesh_files = list(self._vis_mesh_files)
+        link_colors = list(self._vis_colors)
+        views = self._kinematic_views()
+        link_frames = _fill_transforms(views[0], views[1], vis["all_body_ids"], vis["all_rows"],
+                                       np.empty((n_vis, 4, 4)))
+        link_mesh_transformations = self._fill_from_plan(vis, np.empty((n_vis, 4, 4)), views)
 
-        # Run forward kinematics
-        mujoco.mj_forward(self.model, self.data)
-
-        link_names = []
-        link_mesh_files = []
-        link_mesh_transformations = []
-        link_frames = []
-        link_colors = []
+        # Store visual geometry info for primitive shapes
+        self._visual_geometries = list(self._vis_geometries)
 
-        collision_mesh_files = []
-        collision_mesh_transformations = []
-        collision_link_names = []
-        collision_geometries = []
+        collision_mesh_files = list(self._col_mesh_files)
+        collision_mesh_transformations = self._fill_from_plan(self._col_plan, np.empty((len(self._col_g), 4, 4)), views)
+        collision_link_names = list(self._col_link_names)
+        collision_geometries = list(self._col_geometries)
 
+        # Process each joint
         joint_names = []
-        joint_frames = []
         joint_types = []
         joint_axes = []
         joint_parent_links = []
         joint_child_links = []
         joint_limits = []
 
-        # Store visual geometry info for primitive shapes
-        self._visual_geometries = []
-
-        # Process each geom (not body) for visual geometry
-        # This properly handles multiple geoms per body
-        for g in range(self.model.ngeom):
-            # 跳过碰撞几何体 - 只处理视觉几何体 (contype=0 表示不参与碰撞)
-            contype = self.model.geom_contype[g]
-            if contype != 0:
-                continue  # 这是碰撞几何体，跳过
-
-            body_id = self.model.geom_bodyid[g]
-            body_name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_BODY, body_id)
-            if body_name is None:
-                body_name = f"body_{body_id}"
-
-            # Get geom world transformation directly from MuJoCo data
-            geom_pos = self.data.geom_xpos[g]
-            geom_mat = self.data.geom_xmat[g].reshape(3, 3)
-
-            T_geom = np.eye(4)
-            T_geom[:3, :3] = geom_mat
-            T_geom[:3, 3] = geom_pos
-
-            # Get body world transformation for link_frames
-            body_pos = self.data.xpos[body_id]
-            body_mat = self.data.xmat[body_id].reshape(3, 3)
-
-            T_body = np.eye(4)
-            T_body[:3, :3] = body_mat
-            T_body[:3, 3] = body_pos
-
-            # Get geom type and properties
-            geom_type = self.model.geom_type[g]
-            rgba = self.model.geom_rgba[g].tolist()
-            color = rgba if any(c > 0 for c in rgba[:3]) else [0.5, 0.5, 0.5, 1.0]
-            size = self.model.geom_size[g].tolist()
-
-            if geom_type == mujoco.mjtGeom.mjGEOM_MESH:
-                # Mesh geometry - use BODY transform, not geom transform!
-                # MuJoCo's geom_xpos/xmat represents the mesh's geometric center,
-                # but the mesh file vertices are relative to the body origin.
-                mesh_id = self.model.geom_dataid[g]
-                if mesh_id >= 0:
-                    mesh_file = self._get_mesh_file(mesh_id)
-                else:
-                    mesh_file = None
-                self._visual_geometries.append(None)
-                # Use T_body for mesh transformation
-                link_mesh_transformations.append(T_body)
-            elif geom_type in (mujoco.mjtGeom.mjGEOM_BOX, mujoco.mjtGeom.mjGEOM_SPHERE,
-                               mujoco.mjtGeom.mjGEOM_CYLINDER, mujoco.mjtGeom.mjGEOM_CAPSULE,
-                               mujoco.mjtGeom.mjGEOM_ELLIPSOID):
-                # Primitive geometry - use geom transform (center is at geom_xpos)
-                mesh_file = None
-                type_name = self._geom_type_name(geom_type)
-                self._visual_geometries.append({
-                    'type': type_name,
-                    'size': size,
-                })
-                # Use T_geom for primitive geometry transformation
-                link_mesh_transformations.append(T_geom)
-            elif geom_type == mujoco.mjtGeom.mjGEOM_PLANE:
-                # Skip ground plane for visual
-                continue
-            elif geom_type == mujoco.mjtGeom.mjGEOM_HFIELD:
-                # Skip heightfield for visual
-                continue
-            else:
-                # Unknown or unsupported geometry type
-                mesh_file = None
-                color = None
-                self._visual_geometries.append(None)
-                link_mesh_transformations.append(T_body)
-
-            link_names.append(body_name)
-            link_mesh_files.append(mesh_file)
-            link_frames.append(T_body)
-            link_colors.append(color)
-
-        # Process collision geometries (same approach - iterate over geoms)
-        for g in range(self.model.ngeom):
-            # 只处理碰撞几何体 - 跳过视觉几何体 (contype=0 表示不参与碰撞)
-            contype = self.model.geom_contype[g]
-            if contype == 0:
-                continue  # 这是视觉几何体，跳过
-
-            body_id = self.model.geom_bodyid[g]
-            body_name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_BODY, body_id)
-            if body_name is None:
-                body_name = f"body_{body_id}"
-
-            geom_type = self.model.geom_type[g]
-
-            # Skip ground plane for collision
-            if geom_type == mujoco.mjtGeom.mjGEOM_PLANE:
-                continue
-
-            # Get geom world transformation
-            geom_pos = self.data.geom_xpos[g]
-            geom_mat = self.data.geom_xmat[g].reshape(3, 3)
-
-            T_geom = np.eye(4)
-            T_geom[:3, :3] = geom_mat
-            T_geom[:3, 3] = geom_pos
-
-            # Get body world transformation
-            body_pos = self.data.xpos[body_id]
-            body_mat = self.data.xmat[body_id].reshape(3, 3)
-
-            T_body = np.eye(4)
-            T_body[:3, :3] = body_mat
-            T_body[:3, 3] = body_pos
-
-            size = self.model.geom_size[g].tolist()
-
-            if geom_type == mujoco.mjtGeom.mjGEOM_MESH:
-                # Mesh collision - use body transform
-                mesh_id = self.model.geom_dataid[g]
-                if mesh_id >= 0:
-                    mesh_file = self._get_mesh_file(mesh_id)
-                    collision_mesh_files.append(mesh_file)
-                    collision_mesh_transformations.append(T_body)  # Use T_body for mesh
-                    collision_link_names.append(body_name)
-                    collision_geometries.append({'type': 'mesh', 'file': mesh_file})
-            elif geom_type == mujoco.mjtGeom.mjGEOM_BOX:
-                # Primitive - use geom transform
-                collision_mesh_files.append(None)
-                collision_mesh_transformations.append(T_geom)
-                collision_link_names.append(body_name)
-                collision_geometries.append({'type': 'box', 'size': [s * 2 for s in size[:3]]})
-            elif geom_type in (mujoco.mjtGeom.mjGEOM_SPHERE, mujoco.mjtGeom.mjGEOM_ELLIPSOID):
-                # Ellipsoid approximated as sphere using max radius
-                collision_mesh_files.append(None)
-                collision_mesh_transformations.append(T_geom)
-                collision_link_names.append(body_name)
-                collision_geometries.append({'type': 'sphere', 'radius': max(size[:3])})
-            elif geom_type in (mujoco.mjtGeom.mjGEOM_CYLINDER, mujoco.mjtGeom.mjGEOM_CAPSULE):
-                collision_mesh_files.append(None)
-                collision_mesh_transformations.append(T_geom)
-                collision_link_names.append(body_name)
-                collision_geometries.append({'type': 'cylinder', 'radius': size[0], 'length': size[1] * 2})
-            elif geom_type == mujoco.mjtGeom.mjGEOM_HFIELD:
-                # Skip heightfield for now - not supported as collision
-                continue
-            else:
-                # Unknown type - skip
-                continue
-
-        # Process each joint
-        for i, joint in enumerate(self.joints):
-            parent_name = joint["parent"]
-            child_name = joint["child"]
-
-            # Get child body id and its world frame
-            child_body_id = None
-            for b in range(self.model.nbody):
-                bname = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_BODY, b)
-                if bname is None:
-                    bname = f"body_{b}"
-                if bname == child_name:
-                    child_body_id = b
-                    break
-
-            if child_body_id is not None:
-                # Get body world position and orientation
-                body_pos = self.data.xpos[child_body_id]
-                body_mat = self.data.xmat[child_body_id].reshape(3, 3)
-
-                # Get joint position offset in body frame (jnt_pos)
-                # Find the MuJoCo joint index by name
-                mj_jnt_id = mujoco.mj_name2id(self.model, mujoco.mjtObj.mjOBJ_JOINT, joint["name"])
-                if mj_jnt_id >= 0:
-                    jnt_pos = self.model.jnt_pos[mj_jnt_id]
-                else:
-                    jnt_pos = np.zeros(3)
-
-                # Joint world position = Body world position + Body rotation * jnt_pos
-                joint_world_pos = body_pos + body_mat @ jnt_pos
-
-                joint_frame = np.eye(4)
-                joint_frame[:3, :3] = body_mat
-                joint_frame[:3, 3] = joint_world_pos
-            else:
-                joint_frame = np.eye(4)
-
+        joint_frames = self._joint_world_frames(views=views)
+        for joint in self.joints:
             joint_names.append(joint["name"])
-            joint_frames.append(joint_frame)
             joint_types.append(joint["type"])
             joint_axes.append(joint["axis"])
-            joint_parent_links.append(parent_name)
-            joint_child_links.append(child_name)
+            joint_parent_links.append(joint["parent"])
+            joint_child_links.append(joint["child"])
             joint_limits.append(joint["limit"])
 
         return (
@@ -677,176 +646,179 @@ class MJCFParser:
         return getattr(self, '_visual_geometries', [])
 
     def _cache_geom_indices(self):
-        """缓存几何体索引分类，用于 update_transforms() 快速更新"""
-        self._visual_geom_indices = []
-        self._collision_geom_indices = []
+        """缓存几何体索引分类，用于 get_robot_info() / update_transforms() 快速更新
+
+        几何体的分类只取决于模型，在此一次性完成；每帧只需按索引数组取变换。
+        以平行的 int32 数组（SoA）保存：
+            _vis_g / _vis_body / _vis_use_body: 视觉几何体索引、所属 body、是否取 body 变换
+            _col_g / _col_body / _col_type: 碰撞几何体索引、所属 body、几何体类型
+        以及按类别划分的索引数组 _vis_mesh_g / _vis_prim_g / _col_mesh_g / _col_box_g /
+        _col_sphere_g / _col_cyl_g，和与 _vis_g / _col_g 逐行对应的静态属性列表。
+        """
+        gtype = self._geom_type
+        # contype=0 表示不参与碰撞（视觉几何体）
+        is_visual = self._geom_contype == 0
+        is_mesh = gtype == mujoco.mjtGeom.mjGEOM_MESH
+        is_prim = np.isin(gtype, (mujoco.mjtGeom.mjGEOM_BOX, mujoco.mjtGeom.mjGEOM_SPHERE,
+                                  mujoco.mjtGeom.mjGEOM_CYLINDER, mujoco.mjtGeom.mjGEOM_CAPSULE,
+                                  mujoco.mjtGeom.mjGEOM_ELLIPSOID))
+        is_ground = np.isin(gtype, (mujoco.mjtGeom.mjGEOM_PLANE, mujoco.mjtGeom.mjGEOM_HFIELD))
+
+        # 视觉几何体（跳过地面和高度场）
+        # Mesh 与未知类型使用 body 变换，基本几何体使用 geom 变换（中心位于 geom_xpos）
+        self._vis_g = np.flatnonzero(is_visual & ~is_ground).astype(np.int32)
+        self._vis_mesh_g = np.flatnonzero(is_visual & is_mesh).astype(np.int32)
+        self._vis_prim_g = np.flatnonzero(is_visual & is_prim).astype(np.int32)
+        self._vis_body = self._geom_bodyid[self._vis_g].astype(np.int32)
+        self._vis_use_body = ~is_prim[self._vis_g]
+
+        # 碰撞几何体：只保留可显示的类型（有数据的 Mesh、盒、球/椭球、圆柱/胶囊）
+        is_col = ~is_visual
+        self._col_mesh_g = np.flatnonzero(is_col & is_mesh & (self._geom_dataid >= 0)).astype(np.int32)
+        self._col_box_g = np.flatnonzero(is_col & (gtype == mujoco.mjtGeom.mjGEOM_BOX)).astype(np.int32)
+        self._col_sphere_g = np.flatnonzero(is_col & np.isin(
+            gtype, (mujoco.mjtGeom.mjGEOM_SPHERE, mujoco.mjtGeom.mjGEOM_ELLIPSOID))).astype(np.int32)
+        self._col_cyl_g = np.flatnonzero(is_col & np.isin(
+            gtype, (mujoco.mjtGeom.mjGEOM_CYLINDER, mujoco.mjtGeom.mjGEOM_CAPSULE))).astype(np.int32)
+        self._col_g = np.sort(np.concatenate(
+            (self._col_mesh_g, self._col_box_g, self._col_sphere_g, self._col_cyl_g))).astype(np.int32)
+        self._col_body = self._geom_bodyid[self._col_g].astype(np.int32)
+        self._col_type = gtype[self._col_g].astype(np.int32)
+
+        # 视觉几何体的静态属性（与 _vis_g 逐行对应）
+        n_vis = len(self._vis_g)
+        self._vis_link_names = [self._body_names[b] for b in self._vis_body.tolist()]
+        self._vis_mesh_files = [None] * n_vis
+        self._vis_colors = [None] * n_vis  # 未知类型没有颜色
+        self._vis_geometries = [None] * n_vis
+        for row, g in zip(np.searchsorted(self._vis_g, self._vis_mesh_g).tolist(), self._vis_mesh_g.tolist()):
+            mesh_id = self._geom_dataid[g]
+            self._vis_mesh_files[row] = self._get_mesh_file(mesh_id) if mesh_id >= 0 else None
+            self._vis_colors[row] = self._geom_color(g)
+        for row, g in zip(np.searchsorted(self._vis_g, self._vis_prim_g).tolist(), self._vis_prim_g.tolist()):
+            self._vis_colors[row] = self._geom_color(g)
+            self._vis_geometries[row] = {
+                'type': self._geom_type_name(int(gtype[g])),
+                'size': self._geom_size[g].tolist(),
+            }
 
-        # 缓存视觉几何体索引
-        for g in range(self.model.ngeom):
-            contype = self.model.geom_contype[g]
-            if contype != 0:
-                continue  # 碰撞几何体，跳过
+        # 碰撞几何体的静态属性（与 _col_g 逐行对应）
+        n_col = len(self._col_g)
+        self._col_link_names = [self._body_names[b] for b in self._col_body.tolist()]
+        self._col_mesh_files = [None] * n_col
+        self._col_geometries = [None] * n_col
+        for row, g in zip(np.searchsorted(self._col_g, self._col_mesh_g).tolist(), self._col_mesh_g.tolist()):
+            mesh_file = self._get_mesh_file(self._geom_dataid[g])
+            self._col_mesh_files[row] = mesh_file
+            self._col_geometries[row] = {'type': 'mesh', 'file': mesh_file}
+        for row, g in zip(np.searchsorted(self._col_g, self._col_box_g).tolist(), self._col_box_g.tolist()):
+            # MuJoCo uses half-sizes
+            self._col_geometries[row] = {'type': 'box', 'size': (self._geom_size[g, :3] * 2).tolist()}
+        for row, g in zip(np.searchsorted(self._col_g, self._col_sphere_g).tolist(), self._col_sphere_g.tolist()):
+            # Ellipsoid approximated as sphere using max radius
+            self._col_geometries[row] = {'type': 'sphere', 'radius': float(self._geom_size[g, :3].max())}
+        for row, g in zip(np.searchsorted(self._col_g, self._col_cyl_g).tolist(), self._col_cyl_g.tolist()):
+            self._col_geometries[row] = {'type': 'cylinder', 'radius': float(self._geom_size[g, 0]),
+                                         'length': float(self._geom_size[g, 1] * 2)}
+
+        # 取数计划：按 _vis_use_body / Mesh 区分取 body 变换还是 geom 变换
+        self._vis_plan = self._transform_plan(self._vis_g, self._vis_body, self._vis_use_body)
+        self._col_plan = self._transform_plan(self._col_g, self._col_body, is_mesh[self._col_g])
+        # 预分配 update_transforms 的输出缓冲区，滑块拖动时不再分配内存
+        self._vis_frame_buf = np.zeros((n_vis, 4, 4))
+        self._vis_mesh_buf = np.zeros((n_vis, 4, 4))
+        self._col_mesh_buf = np.zeros((n_col, 4, 4))
 
-            geom_type = self.model.geom_type[g]
-            if geom_type in (mujoco.mjtGeom.mjGEOM_PLANE, mujoco.mjtGeom.mjGEOM_HFIELD):
-                continue  # 跳过地面和高度场
+    @staticmethod
+    def _transform_plan(geoms, body_ids, use_body):
+        """把几何体列表拆成 (body 来源 ids, 行号), (geom 来源 ids, 行号) 两组 int32 数组"""
+        rows = np.arange(len(geoms), dtype=np.int32)
+        return {
+            "all_body_ids": body_ids,
+            "all_rows": rows,
+            "body_ids": body_ids[use_body],
+            "body_rows": rows[use_body],
+            "geom_ids": geoms[~use_body],
+            "geom_rows": rows[~use_body],
+        }
 
-            body_id = self.model.geom_bodyid[g]
-            is_mesh = (geom_type == mujoco.mjtGeom.mjGEOM_MESH)
-            self._visual_geom_indices.append((g, body_id, is_mesh))
+    def _fill_from_plan(self, plan, out, views=None):
+        """按取数计划把当前 data 中的 body / geom 变换写入 out"""
+        xpos, xmat, geom_xpos, geom_xmat = views or self._kinematic_views()
+        _fill_transforms(xpos, xmat, plan["body_ids"], plan["body_rows"], out)
+        _fill_transforms(geom_xpos, geom_xmat, plan["geom_ids"], plan["geom_rows"], out)
+        return out
 
-        # 缓存碰撞几何体索引
-        for g in range(self.model.ngeom):
-            contype = self.model.geom_contype[g]
-            if contype == 0:
-                continue  # 视觉几何体，跳过
+    def _run_kinematics(self, qs):
+        """写入 hinge 关节位置并只执行运动学计算 (不含动力学)"""
+        if qs is not None:
+            n = min(len(qs), self._hinge_qpos_addr.size)
+            self.data.qpos[self._hinge_qpos_addr[:n]] = np.asarray(qs[:n], dtype=self.data.qpos.dtype)
 
-            geom_type = self.model.geom_type[g]
-            if geom_type == mujoco.mjtGeom.mjGEOM_PLANE:
-                continue  # 跳过地面
+        # 只执行运动学计算 (不含动力学) - 核心优化点
+        mujoco.mj_kinematics(self.model, self.data)
+        self._kin_dirty = False
 
-            body_id = self.model.geom_bodyid[g]
-            self._collision_geom_indices.append((g, body_id, geom_type))
+    def mark_dirty(self):
+        """外部修改 self.data.qpos 后调用，下次 get_chain_info() 会重新计算运动学"""
+        self._kin_dirty = True
 
     def update_transforms(self, qs):
         """轻量级变换更新 - 仅用于关节滑块交互
 
         使用 mj_kinematics() 替代 mj_forward()，跳过动力学计算，
         直接返回几何体变换矩阵，大幅提升性能。
+        变换数组是内部预分配的缓冲区，下次调用时会被覆盖；名称与关节轴列表
+        为共享的静态列表，调用方不应修改。
 
         Args:
             qs: 关节角度值列表
 
         Returns:
-            dict: 包含以下键的字典
+            TransformUpdate: 包含以下字段的 namedtuple
                 - link_names: 连杆名称列表
-                - link_mesh_transformations: 视觉几何体变换矩阵列表
-                - link_frames: 连杆坐标系变换矩阵列表
-                - collision_mesh_transformations: 碰撞体变换矩阵列表
+                - link_mesh_transformations: 视觉几何体变换矩阵 (N,4,4)
+                - link_frames: 连杆坐标系变换矩阵 (N,4,4)
+                - collision_mesh_transformations: 碰撞体变换矩阵 (M,4,4)
                 - joint_names: 关节名称列表
-                - joint_frames: 关节坐标系变换矩阵列表
+                - joint_frames: 关节坐标系变换矩阵 (J,4,4)
                 - joint_axes: 关节轴列表
         """
-        # 设置关节位置
-        if qs is not None:
-            rev_idx = 0
-            for i in range(self.model.njnt):
-                if self.model.jnt_type[i] == mujoco.mjtJoint.mjJNT_HINGE:
-                    if rev_idx < len(qs):
-                        qpos_addr = self.model.jnt_qposadr[i]
-                        self.data.qpos[qpos_addr] = qs[rev_idx]
-                        rev_idx += 1
-
-        # 只执行运动学计算 (不含动力学) - 核心优化点
-        mujoco.mj_kinematics(self.model, self.data)
-
-        # 快速提取视觉几何体变换
-        link_names = []
-        link_mesh_transformations = []
-        link_frames = []
-
-        for g, body_id, is_mesh in self._visual_geom_indices:
-            body_name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_BODY, body_id)
-            if body_name is None:
-                body_name = f"body_{body_id}"
-
-            # 获取 body 世界变换
-            body_pos = self.data.xpos[body_id]
-            body_mat = self.data.xmat[body_id].reshape(3, 3)
-
-            T_body = np.eye(4)
-            T_body[:3, :3] = body_mat
-            T_body[:3, 3] = body_pos
-
-            if is_mesh:
-                # Mesh 几何体使用 body 变换
-                link_mesh_transformations.append(T_body)
-            else:
-                # 基本几何体使用 geom 变换
-                geom_pos = self.data.geom_xpos[g]
-                geom_mat = self.data.geom_xmat[g].reshape(3, 3)
-
-                T_geom = np.eye(4)
-                T_geom[:3, :3] = geom_mat
-                T_geom[:3, 3] = geom_pos
-                link_mesh_transformations.append(T_geom)
-
-            link_names.append(body_name)
-            link_frames.append(T_body)
-
-        # 快速提取碰撞几何体变换
-        collision_mesh_transformations = []
-
-        for g, body_id, geom_type in self._collision_geom_indices:
-            if geom_type == mujoco.mjtGeom.mjGEOM_MESH:
-                # Mesh 碰撞体使用 body 变换
-                body_pos = self.data.xpos[body_id]
-                body_mat = self.data.xmat[body_id].reshape(3, 3)
-
-                T_body = np.eye(4)
-                T_body[:3, :3] = body_mat
-                T_body[:3, 3] = body_pos
-                collision_mesh_transformations.append(T_body)
-            else:
-                # 基本几何体使用 geom 变换
-                geom_pos = self.data.geom_xpos[g]
-                geom_mat = self.data.geom_xmat[g].reshape(3, 3)
-
-                T_geom = np.eye(4)
-                T_geom[:3, :3] = geom_mat
-                T_geom[:3, 3] = geom_pos
-                collision_mesh_transformations.append(T_geom)
+        self._run_kinematics(qs)
+
+        # 快速提取视觉 / 碰撞几何体变换，直接写入预分配缓冲区
+        vis = self._vis_plan
+        views = self._kinematic_views()
+        link_frames = _fill_transforms(views[0], views[1],
+                                       vis["all_body_ids"], vis["all_rows"], self._vis_frame_buf)
+        link_mesh_transformations = self._fill_from_plan(vis, self._vis_mesh_buf, views)
+        collision_mesh_transformations = self._fill_from_plan(self._col_plan, self._col_mesh_buf, views)
+        joint_frames = self._joint_world_frames(self._joint_frame_buf, views)
+
+        # 名称 / 关节轴为静态列表，原样返回
+        return TransformUpdate(
+            self._vis_link_names,
+            link_mesh_transformations,
+            link_frames,
+            collision_mesh_transformations,
+            self._joint_name_list,
+            joint_frames,
+            self._joint_axis_list,
+        )
 
-        # 快速提取关节变换
-        joint_names = []
-        joint_frames = []
-        joint_axes = []
+    def get_link_frames_only(self, qs=None):
+        """只计算 link 名称与 link 坐标系，跳过几何体、碰撞体与关节变换
 
-        for joint in self.joints:
-            child_name = joint["child"]
-
-            # 找到子 body ID
-            child_body_id = None
-            for b in range(self.model.nbody):
-                bname = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_BODY, b)
-                if bname is None:
-                    bname = f"body_{b}"
-                if bname == child_name:
-                    child_body_id = b
-                    break
-
-            if child_body_id is not None:
-                body_pos = self.data.xpos[child_body_id]
-                body_mat = self.data.xmat[child_body_id].reshape(3, 3)
-
-                # 获取关节偏移
-                mj_jnt_id = mujoco.mj_name2id(self.model, mujoco.mjtObj.mjOBJ_JOINT, joint["name"])
-                if mj_jnt_id >= 0:
-                    jnt_pos = self.model.jnt_pos[mj_jnt_id]
-                else:
-                    jnt_pos = np.zeros(3)
-
-                joint_world_pos = body_pos + body_mat @ jnt_pos
-
-                joint_frame = np.eye(4)
-                joint_frame[:3, :3] = body_mat
-                joint_frame[:3, 3] = joint_world_pos
-            else:
-                joint_frame = np.eye(4)
+        Args:
+            qs: 关节角度值列表
 
-            joint_names.append(joint["name"])
-            joint_frames.append(joint_frame)
-            joint_axes.append(joint["axis"])
+        Returns:
+            tuple: (link_names, link_frames)，link_frames 为 (N,4,4) ndarray
+        """
+        self._run_kinematics(qs)
 
-        return {
-            'link_names': link_names,
-            'link_mesh_transformations': link_mesh_transformations,
-            'link_frames': link_frames,
-            'collision_mesh_transformations': collision_mesh_transformations,
-            'joint_names': joint_names,
-            'joint_frames': joint_frames,
-            'joint_axes': joint_axes,
-        }
+        link_frames = self._stack_transforms(self.data.xpos[self._vis_body], self.data.xmat[self._vis_body])
+        return list(self._vis_link_names), link_frames
 
     def build_multiple_trees(self):
         """Build multiple kinematic trees from the MuJoCo body hierarchy.
@@ -854,13 +826,16 @@ class MJCFParser:
         Uses MuJoCo's body_parentid to construct anytree Node objects,
         matching the URDFParser interface.
         """
+        # 树结构在解析后不再变化，self.nodes 只构建一次，直到 invalidate_cache()
+        cached = getattr(self, "_roots_cache", None)
+        if cached is not None:
+            return list(cached)
+
         self.nodes = {}
 
         # Create all body (link) nodes
         for i in range(self.model.nbody):
-            name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_BODY, i)
-            if name is None:
-                name = f"body_{i}"
+            name = self._body_names[i]
             self.nodes[name] = Node(name, node_type="link", body_id=i)
 
         # Create joint nodes and establish parent-child relationships
@@ -890,7 +865,8 @@ class MJCFParser:
             if node.is_root and node.node_type == "link":
                 roots.append(node)
 
-        return roots
+        self._roots_cache = roots
+        return list(roots)
 
     def identify_chains(self):
         """Identify all kinematic chains in the MJCF model.
@@ -898,6 +874,11 @@ class MJCFParser:
         A chain is defined as a path from a root node to a leaf node.
         Returns chains in the same format as URDFParser.
         """
+        # 拓扑在解析后不再变化，结果缓存到 invalidate_cache() 为止
+        cached = getattr(self, "_chains_cache", None)
+        if cached is not None:
+            return cached
+
         trees = self.build_multiple_trees()
         chains = []
 
@@ -931,59 +912,70 @@ class MJCFParser:
 
                 chains.append(chain_info)
 
-        return chains, trees
+        self._chains_cache = (chains, trees)
+        return self._chains_cache
 
-    def get_chain_info(self):
-        """Get detailed information about all kinematic chains.
-
-        Returns a list of dictionaries matching URDFParser format.
-        """
-        chains, trees = self.identify_chains()
-        chain_info_list = []
+    def invalidate_cache(self):
+        """清除由拓扑派生的缓存（链及其静态信息），修改 joints 后调用"""
+        self._roots_cache = None
+        self._chains_cache = None
+        self._chain_topology_cache = None
 
-        # Get transformations for all bodies
-        mujoco.mj_forward(self.model, self.data)
+    def _chain_topology(self):
+        """每条链的静态信息（名称、关节类型 / 轴、body id），与 identify_chains 一同缓存"""
+        cached = getattr(self, "_chain_topology_cache", None)
+        if cached is not None:
+            return cached
 
+        chains, trees = self.identify_chains()
+        topology = []
         for chain in chains:
             # Extract link and joint names in order
             link_names = [node.name for node in chain["nodes"] if node.node_type == "link"]
             joint_names = [node.name for node in chain["nodes"] if node.node_type == "joint"]
-
-            # Get joint types and axes
-            joint_types = []
-            joint_axes = []
-
-            for joint_name in joint_names:
-                joint_node = self.nodes[joint_name]
-                joint_types.append(getattr(joint_node, "joint_type", "unknown"))
-                joint_axes.append(getattr(joint_node, "joint_axis", [0, 0, 1]))
-
-            # Get link transformations from MuJoCo
-            link_transforms = []
-            for link_name in link_names:
-                link_node = self.nodes.get(link_name)
-                if link_node and hasattr(link_node, 'body_id'):
-                    body_id = link_node.body_id
-                    body_pos = self.data.xpos[body_id]
-                    body_mat = self.data.xmat[body_id].reshape(3, 3)
-
-                    T = np.eye(4)
-                    T[:3, :3] = body_mat
-                    T[:3, 3] = body_pos
-                    link_transforms.append(T)
-                else:
-                    link_transforms.append(np.eye(4))
-
-            # Create detailed chain info
-            detailed_info = {
+            joint_nodes = [self.nodes[joint_name] for joint_name in joint_names]
+            topology.append({
                 "name": chain["name"],
                 "root": chain["root"].name,
                 "leaf": chain["leaf"].name,
                 "link_names": link_names,
                 "joint_names": joint_names,
-                "joint_types": joint_types,
-                "joint_axes": joint_axes,
-                "link_transforms": link_transforms,
+                "joint_types": [getattr(node, "joint_type", "unknown") for node in joint_nodes],
+                "joint_axes": [getattr(node, "joint_axis", [0, 0, 1]) for node in joint_nodes],
+                "body_ids": [getattr(self.nodes.get(link_name), 'body_id', -1) for link_name in link_names],
+            })
+
+        self._chain_topology_cache = (topology, trees)
+        return self._chain_topology_cache
+
+    def get_chain_info(self):
+        """Get detailed information about all kinematic chains.
+
+        Returns a list of dictionaries matching URDFParser format.
+        """
+        topology, trees = self._chain_topology()
+        chain_info_list = []
+
+        # Get transformations for all bodies：解析器自己的 qpos 写入都已同步运动学，
+        # 只有外部改动过 data 时才需要重新计算
+        if self._kin_dirty:
+            mujoco.mj_kinematics(self.model, self.data)
+            self._kin_dirty = False
+
+        for static in topology:
+            link_names = static["link_names"]
+            joint_names = static["joint_names"]
+
+            # 静态部分来自缓存，每次只重新提取 link 变换
+            detailed_info = {
+                "name": static["name"],
+                "root": static["root"],
+                "leaf": static["leaf"],
+                "link_names": list(link_names),
+                "joint_names": list(joint_names),
+                "joint_types": list(static["joint_types"]),
+                "joint_axes": list(static["joint_axes"]),
+                "link_transforms": list(self._bulk_body_transforms(static["body_ids"])),
                 "num_links": len(link_names),
                 "num_joints": len(joint_names)
             }
@@ -1002,33 +994,20 @@ class MJCFParser:
         joint_types = ['base'] + chain["joint_types"]
         link_names = chain["link_names"]
 
-        joint_positions = []
-        joint_vectors = []
-        joint_xs = []
-
-        for name, T, axis, joint_type in zip(link_names, link_frames, joint_axes, joint_types):
-            # Extract position and orientation
-            pos = T[:3, 3]
-            rot = T[:3, :3] @ np.array(axis)
-
-            if np.allclose(np.abs(np.array(axis)), np.array([0, 0, 1])):  # z axis rotation
-                joint_x = T[:3, :3] @ np.array([1, 0, 0])
-            elif np.allclose(np.abs(np.array(axis)), np.array([0, 1, 0])):  # y axis rotation
-                joint_x = T[:3, :3] @ np.array([1, 0, 0])
-            elif np.allclose(np.abs(np.array(axis)), np.array([1, 0, 0])):  # x axis rotation
-                joint_x = T[:3, :3] @ np.array([0, 1, 0])
-            else:
-                # For arbitrary axis, compute perpendicular
-                joint_x = T[:3, :3] @ np.array([1, 0, 0])
+        # 位置 / 轴向 / x 轴都写入连续的 (N,3) 数组，供 get_mdh_parameters 整批使用
+        n = min(len(link_names), len(link_frames), len(joint_axes), len(joint_types))
+        frames = np.asarray(link_frames[:n], dtype=np.float64).reshape(n, 4, 4)
+        axes = np.asarray(joint_axes[:n], dtype=np.float64).reshape(n, 3)
+        joint_positions = frames[:, :3, 3].copy()
+        joint_vectors = np.einsum('nij,nj->ni', frames[:, :3, :3], axes)
 
-            joint_pos = pos
-            joint_vector = rot
+        # x 轴种子：绕 x 轴旋转取 [0,1,0]，其余（含任意方向的轴）取 [1,0,0]
+        # 判据与 np.allclose(np.abs(axis), [1, 0, 0]) 的默认容差一致
+        is_x = np.all(np.abs(np.abs(axes) - [1.0, 0.0, 0.0]) <= 1e-8 + 1e-5 * np.array([1.0, 0.0, 0.0]), axis=1)
+        seeds = np.where(is_x[:, None], [0.0, 1.0, 0.0], [1.0, 0.0, 0.0])
+        joint_xs = np.einsum('nij,nj->ni', frames[:, :3, :3], seeds)
 
-            joint_positions.append(joint_pos)
-            joint_vectors.append(joint_vector)
-            joint_xs.append(joint_x)
-
-        return joint_positions, joint_vectors, joint_xs, joint_types
+        return joint_positions, joint_vectors, joint_xs, joint_types[:n]
 
     def calculate_mdh_origin_position(self, joint_pos, joint_vector, joint_pos_next, joint_vector_next):
         """Calculate the MDH coordinate origin position between two adjacent joints.
@@ -1043,44 +1022,47 @@ class MJCFParser:
 
         common_perpendicular = None
 
+        # 叉积与位置差只算一次；逐分量 |c| <= 1e-8 与 allclose(c, 0) 等价，无需构造零向量
+        cross_z = np.cross(zi, zi_next)
+        diff_pos = pi_next - pi
+        axes_parallel = bool(np.all(np.abs(cross_z) <= 1e-8))
+
         # Case 1: zi and zi+1 coincident (same or opposite direction)
-        if np.allclose(np.cross(zi, zi_next), np.zeros(3)):
-            diff_pos = pi_next - pi
-            if np.allclose(np.cross(diff_pos, zi), np.zeros(3)):
+        if axes_parallel:
+            if np.all(np.abs(np.cross(diff_pos, zi)) <= 1e-8):
                 # On the same line
                 return pi, 'coincident', None
             # Parallel but not coincident - fall through to case 3
         else:
             # Check if intersecting
-            cross_z = np.cross(zi, zi_next)
-            diff_pos = pi_next - pi
-            distance = np.abs(np.dot(diff_pos, cross_z)) / np.linalg.norm(cross_z)
+            distance = abs(diff_pos @ cross_z) / math.sqrt(cross_z @ cross_z)
 
-            if np.isclose(distance, 0):
+            if distance <= 1e-8:
                 # Case 2: Intersecting
                 A = np.column_stack((zi, -zi_next))
-                b = pi_next - pi
-                t, s = np.linalg.lstsq(A, b, rcond=None)[0]
+                b = diff_pos
+                t, s = _solve_2col(A, b)
                 oi = pi + t * zi
                 common_perpendicular = (oi, oi)
                 return oi, 'intersect', common_perpendicular
 
         # Case 3: Parallel or Case 4: Skew (not intersecting, not parallel)
-        n = np.cross(zi, zi_next)
+        n = cross_z
 
-        if np.allclose(n, np.zeros(3)):
+        if axes_parallel:
             # Case 3: Parallel
             oi = pi
             point1 = pi
-            point2 = pi_next - np.dot(pi_next - pi, zi) * zi
+            point2 = pi_next - np.dot(diff_pos, zi) * zi
             common_perpendicular = (point1, point2)
             return oi, 'parallel', common_perpendicular
         else:
             # Case 4: Skew lines
             n = n / np.linalg.norm(n)
             A = np.column_stack((zi, -zi_next, n))
-            b = pi_next - pi
-            t, s, _ = np.linalg.lstsq(A, b, rcond=None)[0]
+            b = diff_pos
+            # n 与 zi、zi+1 都正交，A 满秩，直接求解方阵
+            t, s, _ = np.linalg.solve(A, b)
             oi = pi + t * zi
             point1 = pi + t * zi
             point2 = pi_next + s * zi_next
@@ -1092,96 +1074,30 @@ class MJCFParser:
 
         Same algorithm as URDFParser.
         """
-        joint_positions, joint_vectors, joint_xs, joint_types = self.get_joint_axes(chain)
-
-        # Skip fixed joints
-        joint_positions = [joint_positions[i] for i, t in enumerate(joint_types) if t == 'revolute' or t == 'base']
-        joint_vectors = [joint_vectors[i] for i, t in enumerate(joint_types) if t == 'revolute' or t == 'base']
-        joint_xs = [joint_xs[i] for i, t in enumerate(joint_types) if t == 'revolute' or t == 'base']
-
-        num_joints = len(joint_positions) - 1
-
-        mdh_origins = []
-        mdh_zs = []
-        mdh_xs = []
-        mdh_cases = []
-
-        for i in range(num_joints):
-            joint_pos = joint_positions[i]
-            joint_vector = joint_vectors[i]
-            joint_x = joint_xs[i]
-
-            joint_pos_next = joint_positions[i + 1]
-            joint_vector_next = joint_vectors[i + 1]
-
-            oi, case, common_perpendicular = self.calculate_mdh_origin_position(
-                joint_pos, joint_vector, joint_pos_next, joint_vector_next
-            )
-            mdh_cases.append(case)
-
-            mdh_origins.append(oi)
-            mdh_zs.append(joint_vector)
-
-            if case == 'coincident':
-                xi = joint_x
-            elif case == 'skew' or case == 'intersect':
-                xi = np.cross(joint_vector, joint_vector_next)
-                xi = xi / np.linalg.norm(xi)
-            elif case == 'parallel':
-                xi = common_perpendicular[1] - common_perpendicular[0]
-                xi = xi / np.linalg.norm(xi)
-            else:
-                xi = joint_x
-
-            mdh_xs.append(xi)
-
-        # Last joint
-        mdh_origins.append(joint_positions[-1])
-        mdh_zs.append(joint_vectors[-1])
-        mdh_xs.append(joint_xs[-1])
-
-        mdh_parameters = []
-
-        for i in range(num_joints):
-            o_prev = mdh_origins[i]
-            z_prev = mdh_zs[i]
-            x_prev = mdh_xs[i]
-
-            oi = mdh_origins[i + 1]
-            zi = mdh_zs[i + 1]
-            xi = mdh_xs[i + 1]
-
-            # theta: rotation around zi from xi-1 to xi
-            p_prev = x_prev - np.dot(x_prev, zi) * zi
-            pi = xi - np.dot(xi, zi) * zi
-
-            pi_norm = pi / np.linalg.norm(pi)
-            p_prev_norm = p_prev / np.linalg.norm(p_prev)
+        joint_positions, joint_vectors, joint_xs = self._mdh_joint_axes(chain)
 
-            cos_theta = np.dot(p_prev_norm, pi_norm)
-            sin_theta = np.dot(np.cross(p_prev_norm, pi_norm), zi)
-            theta = np.arctan2(sin_theta, cos_theta)
+        # 所有相邻关节对一次性分类并求原点 / x 轴，再整批计算 MDH 参数
+        origins, zs, xs, _ = batch_mdh_axes(joint_positions, joint_vectors, joint_xs)
+        mdh_parameters = batch_mdh_parameters(origins, zs, xs).tolist()
 
-            # d: distance along zi from xi-1 to xi
-            d = (oi - o_prev).dot(zi)
+        return list(origins), list(zs), list(xs), mdh_parameters
 
-            # a: distance along xi-1 from zi-1 to zi
-            a = (oi - o_prev).dot(x_prev)
+    def get_mdh_parameters_batch(self, chains):
+        """Batched get_mdh_parameters over several chains (one kernel call for all).
 
-            # alpha: rotation around xi-1 from zi-1 to zi
-            p_prev = z_prev - np.dot(z_prev, x_prev) * x_prev
-            pi = zi - np.dot(zi, x_prev) * x_prev
-
-            pi_norm = pi / np.linalg.norm(pi)
-            p_prev_norm = p_prev / np.linalg.norm(p_prev)
-
-            cos_alpha = np.dot(p_prev_norm, pi_norm)
-            sin_alpha = np.dot(np.cross(p_prev_norm, pi_norm), x_prev)
-            alpha = np.arctan2(sin_alpha, cos_alpha)
+        Same result as URDFParser.get_mdh_parameters_batch.
+        """
+        results = batch_mdh_chains([self._mdh_joint_axes(chain) for chain in chains])
+        return [(list(origins), list(zs), list(xs), params.tolist())
+                for origins, zs, xs, params in results]
 
-            mdh_parameters.append([theta, d, a, alpha])
+    def _mdh_joint_axes(self, chain):
+        """Joint axes of the chain with fixed joints removed (base + revolute only)."""
+        joint_positions, joint_vectors, joint_xs, joint_types = self.get_joint_axes(chain)
 
-        return mdh_origins, mdh_zs, mdh_xs, mdh_parameters
+        # Skip fixed joints
+        keep = np.array([t == 'revolute' or t == 'base' for t in joint_types], dtype=bool)
+        return joint_positions[keep], joint_vectors[keep], joint_xs[keep]
 
     def get_mdh_frames(self, chain):
         """Generate MDH coordinate frames from MDH parameters."""
@@ -1202,31 +1118,49 @@ class MJCFParser:
 
         return mdh_frames
 
-    def update_mdh_frames(self, mdh_frames, joint_values):
-        """Update MDH frames based on joint values."""
-        T_i_iplus1 = []
-        for i, frame in enumerate(mdh_frames):
-            if i > 0:
-                joint = joint_values[i - 1]
-                rot_z = np.eye(4)
-                rot_z[0, 0] = math.cos(joint)
-                rot_z[1, 0] = math.sin(joint)
-                rot_z[1, 1] = math.cos(joint)
-                rot_z[0, 1] = -1 * math.sin(joint)
-                transform = np.linalg.inv(mdh_frames[i - 1]) @ frame @ rot_z
-                T_i_iplus1.append(transform)
-
-        for i, frame in enumerate(mdh_frames):
-            if i > 0:
-                mdh_frames[i] = mdh_frames[i - 1] @ T_i_iplus1[i - 1]
+    def update_mdh_frames(self, mdh_frames, joint_values, out=None, rest_relative=None):
+        """Update MDH frames based on joint values.
 
-        return mdh_frames
+        Args:
+            mdh_frames: 零位时的 MDH 坐标系列表 (4x4)
+            joint_values: 关节角度值
+            out: 可选的 (N,4,4) float64 预分配缓冲区，结果直接写入其中
+            rest_relative: 可选的 mdh_rest_relative(mdh_frames) 预计算结果，
+                传入后每次只需乘上 Rz(q)
+
+        Returns:
+            list: 更新后的 4x4 坐标系（out 中各帧的视图）
+        """
+        n = len(mdh_frames)
+        if n == 0:
+            return []
+        if out is None:
+            out = np.empty((n, 4, 4), dtype=np.float64)
+        frames = np.asarray(mdh_frames, dtype=np.float64).reshape(n, 4, 4)
+        q = np.asarray(joint_values, dtype=np.float64)[np.arange(n - 1)]
+
+        # T_i_iplus1 = inv(F[i-1]) @ F[i] @ Rz(q[i-1])，前两项只依赖零位坐标系
+        if rest_relative is None:
+            T_rel = mdh_rest_relative(frames)
+        else:
+            T_rel = np.array(rest_relative, dtype=np.float64)
+        c = np.cos(q)[:, None]
+        s = np.sin(q)[:, None]
+        col0 = T_rel[:, :, 0].copy()
+        col1 = T_rel[:, :, 1]
+        T_rel[:, :, 0] = c * col0 + s * col1
+        T_rel[:, :, 1] = c * col1 - s * col0
+
+        out[0] = frames[0]
+        for i in range(1, n):
+            np.matmul(out[i - 1], T_rel[i - 1], out=out[i])
+        return list(out[:n])
 
     @staticmethod
     def is_valid_mjcf(filepath):
         """Check if a file is a valid MuJoCo MJCF file (contains <mujoco> root element)."""
         try:
-            tree = ET.parse(filepath)
+            tree = ET_fast.parse(filepath)
             root = tree.getroot()
             return root.tag == 'mujoco'
         except Exception:
@@ -6,6 +6,7 @@ ThemeManager - 深色/浅色主题管理
 """
 
 import os
+from string import Template
 
 
 DARK_PALETTE = {
@@ -59,429 +60,433 @@ LIGHT_PALETTE = {
 }
 
 
-def _generate_qss(p):
-    """从色板字典 *p* 生成完整 QSS 字符串。"""
-    return f"""
+# QSS 模板在模块加载时只解析一次，生成时按色板字典替换 ${TOKEN}
+_QSS_TEMPLATE = Template("""
 /* ===== 全局 ===== */
-QWidget {{
-    background-color: {p['BG_BASE']};
-    color: {p['TEXT_PRIMARY']};
+QWidget {
+    background-color: ${BG_BASE};
+    color: ${TEXT_PRIMARY};
     font-size: 13px;
-}}
+}
 
-QMainWindow {{
-    background-color: {p['BG_BASE']};
-}}
+QMainWindow {
+    background-color: ${BG_BASE};
+}
 
 /* ===== QMenuBar ===== */
-QMenuBar {{
-    background-color: {p['BG_SURFACE']};
-    color: {p['TEXT_PRIMARY']};
-    border-bottom: 1px solid {p['BORDER_SUBTLE']};
+QMenuBar {
+    background-color: ${BG_SURFACE};
+    color: ${TEXT_PRIMARY};
+    border-bottom: 1px solid ${BORDER_SUBTLE};
     padding: 2px 0;
-}}
-QMenuBar::item {{
+}
+QMenuBar::item {
     padding: 4px 10px;
     border-radius: 4px;
-}}
-QMenuBar::item:selected {{
-    background-color: {p['BG_HOVER']};
-}}
-QMenuBar::item:pressed {{
-    background-color: {p['BG_PRESSED']};
-}}
+}
+QMenuBar::item:selected {
+    background-color: ${BG_HOVER};
+}
+QMenuBar::item:pressed {
+    background-color: ${BG_PRESSED};
+}
 
 /* ===== QMenu ===== */
-QMenu {{
-    background-color: {p['BG_SURFACE']};
-    color: {p['TEXT_PRIMARY']};
-    border: 1px solid {p['BORDER_SUBTLE']};
+QMenu {
+    background-color: ${BG_SURFACE};
+    color: ${TEXT_PRIMARY};
+    border: 1px solid ${BORDER_SUBTLE};
     border-radius: 6px;
     padding: 4px 0;
-}}
-QMenu::item {{
+}
+QMenu::item {
     padding: 6px 28px 6px 20px;
-}}
-QMenu::item:selected {{
-    background-color: {p['ACCENT_MUTED']};
-    color: {p['TEXT_PRIMARY']};
-}}
-QMenu::item:disabled {{
-    color: {p['TEXT_DISABLED']};
-}}
-QMenu::separator {{
+}
+QMenu::item:selected {
+    background-color: ${ACCENT_MUTED};
+    color: ${TEXT_PRIMARY};
+}
+QMenu::item:disabled {
+    color: ${TEXT_DISABLED};
+}
+QMenu::separator {
     height: 1px;
-    background-color: {p['BORDER_SUBTLE']};
+    background-color: ${BORDER_SUBTLE};
     margin: 4px 8px;
-}}
+}
 
 /* ===== QToolBar ===== */
-QToolBar {{
-    background-color: {p['BG_SURFACE']};
-    border-bottom: 1px solid {p['BORDER_SUBTLE']};
+QToolBar {
+    background-color: ${BG_SURFACE};
+    border-bottom: 1px solid ${BORDER_SUBTLE};
     spacing: 4px;
     padding: 3px 6px;
-}}
-QToolBar::separator {{
+}
+QToolBar::separator {
     width: 1px;
-    background-color: {p['BORDER_SUBTLE']};
+    background-color: ${BORDER_SUBTLE};
     margin: 4px 6px;
-}}
-QToolBar QToolButton {{
+}
+QToolBar QToolButton {
     background-color: transparent;
-    color: {p['TEXT_PRIMARY']};
+    color: ${TEXT_PRIMARY};
     border: none;
     border-radius: 4px;
     padding: 4px 10px;
     font-size: 13px;
-}}
-QToolBar QToolButton:hover {{
-    background-color: {p['BG_HOVER']};
-}}
-QToolBar QToolButton:pressed {{
-    background-color: {p['BG_PRESSED']};
-}}
+}
+QToolBar QToolButton:hover {
+    background-color: ${BG_HOVER};
+}
+QToolBar QToolButton:pressed {
+    background-color: ${BG_PRESSED};
+}
 
 /* ===== QStatusBar ===== */
-QStatusBar {{
-    background-color: {p['BG_SURFACE']};
-    color: {p['TEXT_SECONDARY']};
-    border-top: 1px solid {p['BORDER_SUBTLE']};
+QStatusBar {
+    background-color: ${BG_SURFACE};
+    color: ${TEXT_SECONDARY};
+    border-top: 1px solid ${BORDER_SUBTLE};
     font-size: 12px;
     padding: 2px 8px;
-}}
-QStatusBar QLabel {{
-    color: {p['TEXT_SECONDARY']};
+}
+QStatusBar QLabel {
+    color: ${TEXT_SECONDARY};
     padding: 0 6px;
     background-color: transparent;
-}}
+}
 
 /* ===== QPushButton ===== */
-QPushButton {{
-    background-color: {p['BG_ELEVATED']};
-    color: {p['TEXT_PRIMARY']};
-    border: 1px solid {p['BORDER_SUBTLE']};
+QPushButton {
+    background-color: ${BG_ELEVATED};
+    color: ${TEXT_PRIMARY};
+    border: 1px solid ${BORDER_SUBTLE};
     border-radius: 5px;
     padding: 5px 14px;
     min-height: 22px;
-}}
-QPushButton:hover {{
-    background-color: {p['BG_HOVER']};
-    border-color: {p['BORDER_STRONG']};
-}}
-QPushButton:pressed {{
-    background-color: {p['BG_PRESSED']};
-}}
-QPushButton:disabled {{
-    color: {p['TEXT_DISABLED']};
-    background-color: {p['BG_BASE']};
-    border-color: {p['BORDER_SUBTLE']};
-}}
+}
+QPushButton:hover {
+    background-color: ${BG_HOVER};
+    border-color: ${BORDER_STRONG};
+}
+QPushButton:pressed {
+    background-color: ${BG_PRESSED};
+}
+QPushButton:disabled {
+    color: ${TEXT_DISABLED};
+    background-color: ${BG_BASE};
+    border-color: ${BORDER_SUBTLE};
+}
 
 /* ===== QComboBox ===== */
-QComboBox {{
-    background-color: {p['BG_ELEVATED']};
-    color: {p['TEXT_PRIMARY']};
-    border: 1px solid {p['BORDER_SUBTLE']};
+QComboBox {
+    background-color: ${BG_ELEVATED};
+    color: ${TEXT_PRIMARY};
+    border: 1px solid ${BORDER_SUBTLE};
     border-radius: 5px;
     padding: 4px 8px;
     min-height: 22px;
-}}
-QComboBox:hover {{
-    border-color: {p['BORDER_STRONG']};
-}}
-QComboBox::drop-down {{
+}
+QComboBox:hover {
+    border-color: ${BORDER_STRONG};
+}
+QComboBox::drop-down {
     border: none;
     width: 20px;
-}}
-QComboBox::down-arrow {{
+}
+QComboBox::down-arrow {
     image: none;
     border-left: 4px solid transparent;
     border-right: 4px solid transparent;
-    border-top: 5px solid {p['TEXT_SECONDARY']};
+    border-top: 5px solid ${TEXT_SECONDARY};
     margin-right: 6px;
-}}
-QComboBox QAbstractItemView {{
-    background-color: {p['BG_SURFACE']};
-    color: {p['TEXT_PRIMARY']};
-    border: 1px solid {p['BORDER_SUBTLE']};
-    selection-background-color: {p['ACCENT_MUTED']};
-    selection-color: {p['TEXT_PRIMARY']};
+}
+QComboBox QAbstractItemView {
+    background-color: ${BG_SURFACE};
+    color: ${TEXT_PRIMARY};
+    border: 1px solid ${BORDER_SUBTLE};
+    selection-background-color: ${ACCENT_MUTED};
+    selection-color: ${TEXT_PRIMARY};
     outline: none;
-}}
+}
 
 /* ===== QListWidget ===== */
-QListWidget {{
-    background-color: {p['BG_SURFACE']};
-    color: {p['TEXT_PRIMARY']};
-    border: 1px solid {p['BORDER_SUBTLE']};
+QListWidget {
+    background-color: ${BG_SURFACE};
+    color: ${TEXT_PRIMARY};
+    border: 1px solid ${BORDER_SUBTLE};
     border-radius: 5px;
     outline: none;
-}}
-QListWidget::item {{
+}
+QListWidget::item {
     padding: 4px 8px;
     border-radius: 3px;
-}}
-QListWidget::item:hover {{
-    background-color: {p['BG_HOVER']};
-}}
-QListWidget::item:selected {{
-    background-color: {p['ACCENT_MUTED']};
-    color: {p['TEXT_PRIMARY']};
-}}
+}
+QListWidget::item:hover {
+    background-color: ${BG_HOVER};
+}
+QListWidget::item:selected {
+    background-color: ${ACCENT_MUTED};
+    color: ${TEXT_PRIMARY};
+}
 
 /* ===== QCheckBox ===== */
-QCheckBox {{
-    color: {p['TEXT_PRIMARY']};
+QCheckBox {
+    color: ${TEXT_PRIMARY};
     spacing: 6px;
     padding: 2px 0;
     background-color: transparent;
-}}
-QCheckBox::indicator {{
+}
+QCheckBox::indicator {
     width: 16px;
     height: 16px;
-    border: 1px solid {p['BORDER_STRONG']};
+    border: 1px solid ${BORDER_STRONG};
     border-radius: 3px;
-    background-color: {p['BG_ELEVATED']};
-}}
-QCheckBox::indicator:hover {{
-    border-color: {p['ACCENT']};
-}}
-QCheckBox::indicator:checked {{
-    background-color: {p['ACCENT']};
-    border-color: {p['ACCENT']};
-}}
+    background-color: ${BG_ELEVATED};
+}
+QCheckBox::indicator:hover {
+    border-color: ${ACCENT};
+}
+QCheckBox::indicator:checked {
+    background-color: ${ACCENT};
+    border-color: ${ACCENT};
+}
 
 /* ===== QSlider ===== */
-QSlider::groove:horizontal {{
+QSlider::groove:horizontal {
     border: none;
     height: 4px;
-    background-color: {p['BORDER_STRONG']};
+    background-color: ${BORDER_STRONG};
     border-radius: 2px;
-}}
-QSlider::handle:horizontal {{
-    background-color: {p['ACCENT']};
+}
+QSlider::handle:horizontal {
+    background-color: ${ACCENT};
     border: none;
     width: 14px;
     height: 14px;
     margin: -5px 0;
     border-radius: 7px;
-}}
-QSlider::handle:horizontal:hover {{
-    background-color: {p['ACCENT_HOVER']};
-}}
-QSlider::handle:horizontal:pressed {{
-    background-color: {p['ACCENT_PRESSED']};
-}}
-QSlider::sub-page:horizontal {{
-    background-color: {p['ACCENT']};
+}
+QSlider::handle:horizontal:hover {
+    background-color: ${ACCENT_HOVER};
+}
+QSlider::handle:horizontal:pressed {
+    background-color: ${ACCENT_PRESSED};
+}
+QSlider::sub-page:horizontal {
+    background-color: ${ACCENT};
     border-radius: 2px;
-}}
+}
 
 /* ===== QGroupBox ===== */
-QGroupBox {{
-    background-color: {p['BG_SURFACE']};
-    border: 1px solid {p['BORDER_SUBTLE']};
+QGroupBox {
+    background-color: ${BG_SURFACE};
+    border: 1px solid ${BORDER_SUBTLE};
     border-radius: 6px;
     margin-top: 8px;
     padding: 12px 8px 8px 8px;
     font-weight: bold;
-}}
-QGroupBox::title {{
+}
+QGroupBox::title {
     subcontrol-origin: margin;
     subcontrol-position: top left;
     padding: 2px 8px;
-    color: {p['TEXT_SECONDARY']};
-}}
+    color: ${TEXT_SECONDARY};
+}
 
 /* ===== QScrollArea ===== */
-QScrollArea {{
+QScrollArea {
     border: none;
     background-color: transparent;
-}}
-QScrollArea > QWidget > QWidget {{
+}
+QScrollArea > QWidget > QWidget {
     background-color: transparent;
-}}
+}
 
 /* ===== QScrollBar 垂直 ===== */
-QScrollBar:vertical {{
+QScrollBar:vertical {
     background-color: transparent;
     width: 10px;
     margin: 0;
-}}
-QScrollBar::handle:vertical {{
-    background-color: {p['BORDER_STRONG']};
+}
+QScrollBar::handle:vertical {
+    background-color: ${BORDER_STRONG};
     min-height: 30px;
     border-radius: 5px;
     margin: 2px;
-}}
-QScrollBar::handle:vertical:hover {{
-    background-color: {p['TEXT_DISABLED']};
-}}
-QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+}
+QScrollBar::handle:vertical:hover {
+    background-color: ${TEXT_DISABLED};
+}
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
     height: 0;
-}}
-QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{
+}
+QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
     background: none;
-}}
+}
 
 /* ===== QScrollBar 水平 ===== */
-QScrollBar:horizontal {{
+QScrollBar:horizontal {
     background-color: transparent;
     height: 10px;
     margin: 0;
-}}
-QScrollBar::handle:horizontal {{
-    background-color: {p['BORDER_STRONG']};
+}
+QScrollBar::handle:horizontal {
+    background-color: ${BORDER_STRONG};
     min-width: 30px;
     border-radius: 5px;
     margin: 2px;
-}}
-QScrollBar::handle:horizontal:hover {{
-    background-color: {p['TEXT_DISABLED']};
-}}
-QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {{
+}
+QScrollBar::handle:horizontal:hover {
+    background-color: ${TEXT_DISABLED};
+}
+QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
     width: 0;
-}}
-QScrollBar::add-page:horizontal, QScrollBar::sub-page:horizontal {{
+}
+QScrollBar::add-page:horizontal, QScrollBar::sub-page:horizontal {
     background: none;
-}}
+}
 
 /* ===== QTableWidget ===== */
-QTableWidget {{
-    background-color: {p['BG_SURFACE']};
-    color: {p['TEXT_PRIMARY']};
-    border: 1px solid {p['BORDER_SUBTLE']};
+QTableWidget {
+    background-color: ${BG_SURFACE};
+    color: ${TEXT_PRIMARY};
+    border: 1px solid ${BORDER_SUBTLE};
     border-radius: 5px;
-    gridline-color: {p['BORDER_SUBTLE']};
+    gridline-color: ${BORDER_SUBTLE};
     outline: none;
-}}
-QTableWidget::item {{
+}
+QTableWidget::item {
     padding: 4px 6px;
-}}
-QTableWidget::item:selected {{
-    background-color: {p['ACCENT_MUTED']};
-    color: {p['TEXT_PRIMARY']};
-}}
-QHeaderView::section {{
-    background-color: {p['BG_ELEVATED']};
-    color: {p['TEXT_SECONDARY']};
+}
+QTableWidget::item:selected {
+    background-color: ${ACCENT_MUTED};
+    color: ${TEXT_PRIMARY};
+}
+QHeaderView::section {
+    background-color: ${BG_ELEVATED};
+    color: ${TEXT_SECONDARY};
     border: none;
-    border-bottom: 1px solid {p['BORDER_SUBTLE']};
-    border-right: 1px solid {p['BORDER_SUBTLE']};
+    border-bottom: 1px solid ${BORDER_SUBTLE};
+    border-right: 1px solid ${BORDER_SUBTLE};
     padding: 5px 8px;
     font-weight: bold;
-}}
+}
 
 /* ===== QTextEdit / QLineEdit ===== */
-QTextEdit {{
-    background-color: {p['BG_SURFACE']};
-    color: {p['TEXT_PRIMARY']};
-    border: 1px solid {p['BORDER_SUBTLE']};
+QTextEdit {
+    background-color: ${BG_SURFACE};
+    color: ${TEXT_PRIMARY};
+    border: 1px solid ${BORDER_SUBTLE};
     border-radius: 5px;
-    selection-background-color: {p['ACCENT_MUTED']};
-    selection-color: {p['TEXT_PRIMARY']};
-}}
-QLineEdit {{
-    background-color: {p['BG_ELEVATED']};
-    color: {p['TEXT_PRIMARY']};
-    border: 1px solid {p['BORDER_SUBTLE']};
+    selection-background-color: ${ACCENT_MUTED};
+    selection-color: ${TEXT_PRIMARY};
+}
+QLineEdit {
+    background-color: ${BG_ELEVATED};
+    color: ${TEXT_PRIMARY};
+    border: 1px solid ${BORDER_SUBTLE};
     border-radius: 5px;
     padding: 4px 8px;
     min-height: 22px;
-    selection-background-color: {p['ACCENT_MUTED']};
-    selection-color: {p['TEXT_PRIMARY']};
-}}
-QLineEdit:focus {{
-    border-color: {p['ACCENT']};
-}}
+    selection-background-color: ${ACCENT_MUTED};
+    selection-color: ${TEXT_PRIMARY};
+}
+QLineEdit:focus {
+    border-color: ${ACCENT};
+}
 
 /* ===== QSpinBox ===== */
-QSpinBox {{
-    background-color: {p['BG_ELEVATED']};
-    color: {p['TEXT_PRIMARY']};
-    border: 1px solid {p['BORDER_SUBTLE']};
+QSpinBox {
+    background-color: ${BG_ELEVATED};
+    color: ${TEXT_PRIMARY};
+    border: 1px solid ${BORDER_SUBTLE};
     border-radius: 5px;
     padding: 3px 6px;
     min-height: 22px;
-}}
-QSpinBox::up-button, QSpinBox::down-button {{
-    background-color: {p['BG_HOVER']};
+}
+QSpinBox::up-button, QSpinBox::down-button {
+    background-color: ${BG_HOVER};
     border: none;
     width: 16px;
-}}
-QSpinBox::up-button:hover, QSpinBox::down-button:hover {{
-    background-color: {p['BG_PRESSED']};
-}}
+}
+QSpinBox::up-button:hover, QSpinBox::down-button:hover {
+    background-color: ${BG_PRESSED};
+}
 
 /* ===== QToolTip ===== */
-QToolTip {{
-    background-color: {p['BG_ELEVATED']};
-    color: {p['TEXT_PRIMARY']};
-    border: 1px solid {p['BORDER_STRONG']};
+QToolTip {
+    background-color: ${BG_ELEVATED};
+    color: ${TEXT_PRIMARY};
+    border: 1px solid ${BORDER_STRONG};
     border-radius: 4px;
     padding: 4px 8px;
-}}
+}
 
 /* ===== QSplitter ===== */
-QSplitter::handle {{
-    background-color: {p['BORDER_SUBTLE']};
-}}
-QSplitter::handle:horizontal {{
+QSplitter::handle {
+    background-color: ${BORDER_SUBTLE};
+}
+QSplitter::handle:horizontal {
     width: 3px;
-}}
-QSplitter::handle:vertical {{
+}
+QSplitter::handle:vertical {
     height: 3px;
-}}
-QSplitter::handle:hover {{
-    background-color: {p['ACCENT']};
-}}
+}
+QSplitter::handle:hover {
+    background-color: ${ACCENT};
+}
 
 /* ===== QDialog ===== */
-QDialog {{
-    background-color: {p['BG_BASE']};
-    color: {p['TEXT_PRIMARY']};
-}}
+QDialog {
+    background-color: ${BG_BASE};
+    color: ${TEXT_PRIMARY};
+}
 
 /* ===== QLabel ===== */
-QLabel {{
+QLabel {
     background-color: transparent;
-    color: {p['TEXT_PRIMARY']};
-}}
+    color: ${TEXT_PRIMARY};
+}
 
 /* ===== QMessageBox ===== */
-QMessageBox {{
-    background-color: {p['BG_BASE']};
-}}
-QMessageBox QLabel {{
-    color: {p['TEXT_PRIMARY']};
-}}
+QMessageBox {
+    background-color: ${BG_BASE};
+}
+QMessageBox QLabel {
+    color: ${TEXT_PRIMARY};
+}
 
 /* ===== QFrame HLine / VLine ===== */
-QFrame[frameShape="4"] {{
-    color: {p['BORDER_SUBTLE']};
+QFrame[frameShape="4"] {
+    color: ${BORDER_SUBTLE};
     max-height: 1px;
-}}
-QFrame[frameShape="5"] {{
-    color: {p['BORDER_SUBTLE']};
+}
+QFrame[frameShape="5"] {
+    color: ${BORDER_SUBTLE};
     max-width: 1px;
-}}
+}
 
 /* ===== CollapsibleSection ===== */
-CollapsibleSection > QPushButton#collapseToggle {{
-    background-color: {p['BG_ELEVATED']};
-    color: {p['TEXT_PRIMARY']};
-    border: 1px solid {p['BORDER_SUBTLE']};
+CollapsibleSection > QPushButton#collapseToggle {
+    background-color: ${BG_ELEVATED};
+    color: ${TEXT_PRIMARY};
+    border: 1px solid ${BORDER_SUBTLE};
     border-radius: 4px;
     padding: 6px 10px;
     text-align: left;
     font-weight: bold;
     font-size: 12px;
-}}
-CollapsibleSection > QPushButton#collapseToggle:hover {{
-    background-color: {p['BG_HOVER']};
-}}
-"""
+}
+CollapsibleSection > QPushButton#collapseToggle:hover {
+    background-color: ${BG_HOVER};
+}
+""")
+
+
+def _generate_qss(p):
+    """从色板字典 *p* 生成完整 QSS 字符串。"""
+    return _QSS_TEMPLATE.substitute(p)
 
 
 class ThemeManager:
@@ -497,6 +502,7 @@ class ThemeManager:
                 "dark": DARK_PALETTE,
                 "light": LIGHT_PALETTE,
             }
+            cls._instance._qss_cache = {}  # 主题名 -> 已生成的 QSS，色板不变时直接复用
         return cls._instance
 
     # --- 公开接口 ---
@@ -515,7 +521,14 @@ class ThemeManager:
         return p["VTK_BG_BOTTOM"], p["VTK_BG_TOP"]
 
     def generate_qss(self):
-        return _generate_qss(self.palette)
+        qss = self._qss_cache.get(self._current)
+        if qss is None:
+            qss = self._qss_cache[self._current] = _generate_qss(self.palette)
+        return qss
+
+    def _clear_cache(self):
+        """色板被修改后调用，丢弃已缓存的 QSS。"""
+        self._qss_cache.clear()
 
     def apply(self, app):
         """将当前主题应用到 QApplication。"""
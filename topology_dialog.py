@@ -7,15 +7,17 @@
 支持缩放、平移、点击交互和 PNG/SVG 导出。
 """
 
+from functools import lru_cache
+
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QGraphicsView, QGraphicsScene,
-    QGraphicsRectItem, QGraphicsEllipseItem, QGraphicsLineItem,
-    QGraphicsTextItem, QGraphicsItem, QPushButton, QToolBar,
+    QGraphicsRectItem, QGraphicsEllipseItem, QGraphicsPathItem,
+    QGraphicsItem, QPushButton, QToolBar,
     QFileDialog, QMessageBox
 )
 from PyQt5.QtCore import Qt, QRectF, QPointF
 from PyQt5.QtGui import (
-    QPen, QBrush, QColor, QFont, QPainter, QFontMetrics
+    QPen, QBrush, QColor, QFont, QPainter, QFontMetrics, QPainterPath
 )
 from PyQt5.QtSvg import QSvgGenerator
 from theme import ThemeManager
@@ -31,6 +33,8 @@ def _topo_color(token):
 LINK_FILL_COLOR = QColor("#2A4A6E")       # ACCENT_MUTED
 LINK_BORDER_COLOR = QColor("#4A9EFF")     # ACCENT
 LINK_SELECTED_COLOR = QColor("#FFD700")   # 金色高亮
+LINK_TEXT_COLOR = QColor("#E0E0E6")
+LINK_TEXT_SELECTED_COLOR = QColor("#1A1A1A")
 
 # 关节类型颜色映射
 JOINT_COLORS = {
@@ -54,17 +58,40 @@ LEVEL_SPACING = 120  # 层级间距（Y方向）
 NODE_SPACING = 150   # 同层节点间距（X方向）
 LINK_HEIGHT = 28
 LINK_PADDING = 16    # 文字左右内边距
+LINK_CORNER_RADIUS = 4  # 圆角半径
 JOINT_RADIUS = 10    # 关节圆半径（小圆点）
 
+# 节点数低于该值的小场景不建 BSP 索引，并使用默认的最小视口更新
+SMALL_SCENE_NODES = 200
+
+# 节点字体字号（按节点类型共享同一 QFont / QFontMetrics）
+_NODE_FONT_SIZES = {"link": 9, "joint": 8}
+
+
+@lru_cache(maxsize=None)
+def _node_font(kind):
+    """节点共享字体；首次使用时创建，保证在 QApplication 之后构造"""
+    return QFont("Arial", _NODE_FONT_SIZES[kind])
+
+
+@lru_cache(maxsize=None)
+def _node_metrics(kind):
+    """节点共享字体度量"""
+    return QFontMetrics(_node_font(kind))
+
+
+@lru_cache(maxsize=4096)
+def _text_advance(kind, text):
+    """文本水平宽度，同名文本只测量一次"""
+    return _node_metrics(kind).horizontalAdvance(text)
+
 
 class LinkNode(QGraphicsRectItem):
     """连杆节点 - 圆角矩形，宽度自适应文本"""
 
     def __init__(self, name, x, y):
         # 计算文本宽度来确定节点宽度
-        font = QFont("Arial", 9)
-        fm = QFontMetrics(font)
-        text_width = fm.horizontalAdvance(name)
+        text_width = _text_advance("link", name)
         width = text_width + LINK_PADDING * 2
         height = LINK_HEIGHT
 
@@ -77,29 +104,40 @@ class LinkNode(QGraphicsRectItem):
         # 设置位置（中心对齐）
         self.setPos(x - width / 2, y - height / 2)
 
-        # 设置样式
-        self.setPen(QPen(LINK_BORDER_COLOR, 2))
-        self.setBrush(QBrush(LINK_FILL_COLOR))
-
-        # 添加文本标签
-        self.text_item = QGraphicsTextItem(name, self)
-        self.text_item.setFont(font)
-        self.text_item.setDefaultTextColor(QColor("#E0E0E6"))
-
-        # 计算文本居中位置
-        text_rect = self.text_item.boundingRect()
-        text_x = (width - text_rect.width()) / 2
-        text_y = (height - text_rect.height()) / 2
-        self.text_item.setPos(text_x, text_y)
+        # 设置样式（画笔 / 画刷缓存在实例上，paint() 中直接复用）
+        self._pen = QPen(LINK_BORDER_COLOR, 2)
+        self._original_brush = QBrush(LINK_FILL_COLOR)
+        self._selected_brush = QBrush(LINK_SELECTED_COLOR)
+        self._hover_brush = QBrush(LINK_SELECTED_COLOR.lighter(150))
+        self._brush = self._original_brush
+        self._text_color = LINK_TEXT_COLOR
+        self.setPen(self._pen)
 
         # 允许选择
         self.setFlag(QGraphicsRectItem.ItemIsSelectable, True)
         self.setAcceptHoverEvents(True)
 
-        # 保存原始颜色
-        self._original_brush = QBrush(LINK_FILL_COLOR)
         self._selected = False
 
+    def paint(self, painter, option, widget):
+        """绘制圆角矩形和居中文字"""
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.rect()
+
+        painter.setPen(self._pen)
+        painter.setBrush(self._brush)
+        painter.drawRoundedRect(rect, LINK_CORNER_RADIUS, LINK_CORNER_RADIUS)
+
+        painter.setFont(_node_font("link"))
+        painter.setPen(self._text_color)
+        painter.drawText(rect, Qt.AlignCenter, self.name)
+
+    def _set_style(self, brush, text_color):
+        """切换填充和文字颜色并重绘"""
+        self._brush = brush
+        self._text_color = text_color
+        self.update()
+
     def get_center(self):
         """获取节点中心坐标"""
         pos = self.pos()
@@ -119,11 +157,9 @@ class LinkNode(QGraphicsRectItem):
         """设置选中状态"""
         self._selected = selected
         if selected:
-            self.setBrush(QBrush(LINK_SELECTED_COLOR))
-            self.text_item.setDefaultTextColor(QColor("#1A1A1A"))
+            self._set_style(self._selected_brush, LINK_TEXT_SELECTED_COLOR)
         else:
-            self.setBrush(self._original_brush)
-            self.text_item.setDefaultTextColor(QColor("#E0E0E6"))
+            self._set_style(self._original_brush, LINK_TEXT_COLOR)
 
     def itemChange(self, change, value):
         """响应 Qt 内置选中状态变化"""
@@ -134,15 +170,13 @@ class LinkNode(QGraphicsRectItem):
     def hoverEnterEvent(self, event):
         """鼠标进入高亮"""
         if not self._selected:
-            self.setBrush(QBrush(LINK_SELECTED_COLOR.lighter(150)))
-            self.text_item.setDefaultTextColor(QColor("#1A1A1A"))
+            self._set_style(self._hover_brush, LINK_TEXT_SELECTED_COLOR)
         super().hoverEnterEvent(event)
 
     def hoverLeaveEvent(self, event):
         """鼠标离开恢复"""
         if not self._selected:
-            self.setBrush(self._original_brush)
-            self.text_item.setDefaultTextColor(QColor("#E0E0E6"))
+            self._set_style(self._original_brush, LINK_TEXT_COLOR)
         super().hoverLeaveEvent(event)
 
 
@@ -160,10 +194,9 @@ class JointNode(QGraphicsItem):
         self.color = JOINT_COLORS.get(joint_type.lower(), QColor("#808080"))
 
         # 文字标签
-        self.font = QFont("Arial", 8)
-        fm = QFontMetrics(self.font)
-        self.text_width = fm.horizontalAdvance(name)
-        self.text_height = fm.height()
+        self.font = _node_font("joint")
+        self.text_width = _text_advance("joint", name)
+        self.text_height = _node_metrics("joint").height()
 
         # 计算包围盒：圆在上，文字在下
         self.gap = 4  # 圆底部和文字之间的间隙
@@ -252,7 +285,7 @@ class JointNode(QGraphicsItem):
 class TopologyGraphView(QGraphicsView):
     """支持缩放和平移的交互视图"""
 
-    def __init__(self, scene, parent=None):
+    def __init__(self, scene, parent=None, full_viewport_update=False):
         super().__init__(scene, parent)
 
         # 设置渲染质量
@@ -265,8 +298,9 @@ class TopologyGraphView(QGraphicsView):
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
 
-        # 设置视口更新模式
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # 设置视口更新模式：节点多时整屏重绘比逐区域计算更快，否则保持默认
+        if full_viewport_update:
+            self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
 
         # 缩放因子
         self._zoom_factor = 1.15
@@ -343,9 +377,18 @@ class TopologyDialog(QDialog):
 
         layout.addWidget(toolbar)
 
-        # 图形场景和视图
+        # 图形场景和视图（按节点数选择索引方式与视口更新模式）
+        joints = getattr(self.parser, 'joints', None) or []
+        num_nodes = len(joints) * 2 + 1
+        large_scene = num_nodes >= SMALL_SCENE_NODES
+
         self.scene = QGraphicsScene()
-        self.view = TopologyGraphView(self.scene, self)
+        if large_scene:
+            self.scene.setBspTreeDepth(0)  # 0 表示由 Qt 自动选择 BSP 深度
+        else:
+            self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self.view = TopologyGraphView(
+            self.scene, self, full_viewport_update=large_scene)
         layout.addWidget(self.view)
 
         # 设置背景色 (深色主题)
@@ -385,47 +428,56 @@ class TopologyDialog(QDialog):
         if not root_links:
             return
 
-        # 递归计算每个子树所需宽度
+        # 计算每个子树所需宽度（显式栈后序遍历，深链不受递归深度限制）
         subtree_widths = {}
 
-        def compute_subtree_width(link):
-            if link not in children_map or not children_map[link]:
-                subtree_widths[link] = NODE_SPACING
-                return NODE_SPACING
-            total = 0
-            for child, _, _ in children_map[link]:
-                total += compute_subtree_width(child)
-            subtree_widths[link] = max(total, NODE_SPACING)
-            return subtree_widths[link]
+        def compute_subtree_width(root):
+            stack = [(root, False)]
+            while stack:
+                link, expanded = stack.pop()
+                children = children_map.get(link, ())
+                if expanded or not children:
+                    total = 0
+                    for child, _, _ in children:
+                        total += subtree_widths[child]
+                    subtree_widths[link] = max(total, NODE_SPACING)
+                    continue
+                stack.append((link, True))
+                for child, _, _ in reversed(children):
+                    stack.append((child, False))
+            return subtree_widths[root]
 
         total_root_width = 0
         for root in root_links:
             total_root_width += compute_subtree_width(root)
 
-        # 自顶向下分配 x, y 坐标
+        # 自顶向下分配 x, y 坐标（显式栈先序遍历）
         link_positions = {}  # link_name -> (x, y)
 
-        def assign_positions(link, x_center, level):
-            link_positions[link] = (x_center, level * LEVEL_SPACING)
+        def assign_positions(root, x_center):
+            stack = [(root, x_center, 0)]
+            while stack:
+                link, x_center, level = stack.pop()
+                link_positions[link] = (x_center, level * LEVEL_SPACING)
 
-            if link not in children_map:
-                return
-
-            children = children_map[link]
-            total_width = subtree_widths[link]
-            x_start = x_center - total_width / 2
+                children = children_map.get(link, ())
+                if not children:
+                    continue
 
-            for child, _, _ in children:
-                child_width = subtree_widths[child]
-                child_x = x_start + child_width / 2
-                assign_positions(child, child_x, level + 1)
-                x_start += child_width
+                x_start = x_center - subtree_widths[link] / 2
+                frames = []
+                for child, _, _ in children:
+                    child_width = subtree_widths[child]
+                    frames.append((child, x_start + child_width / 2, level + 1))
+                    x_start += child_width
+                # 逆序入栈，出栈顺序与原递归一致
+                stack.extend(reversed(frames))
 
         # 为所有根节点分配位置
         x_offset = -total_root_width / 2
         for root in root_links:
             w = subtree_widths[root]
-            assign_positions(root, x_offset + w / 2, 0)
+            assign_positions(root, x_offset + w / 2)
             x_offset += w
 
         # 创建 Link 节点
@@ -434,7 +486,7 @@ class TopologyDialog(QDialog):
             self.scene.addItem(link_item)
             self.node_items[name] = link_item
 
-        # 创建 Joint 节点和 L 形连接线
+        # 创建 Joint 节点和 L 形连接线（同一 parent 的所有连线合并为一条路径）
         pen = QPen(LINE_COLOR, 1.5)
 
         for parent_link, children in children_map.items():
@@ -443,6 +495,7 @@ class TopologyDialog(QDialog):
 
             parent_item = self.node_items[parent_link]
             parent_bottom = parent_item.get_bottom_center()
+            path = QPainterPath()
 
             for child_link, joint_name, joint_type in children:
                 if child_link not in self.node_items:
@@ -464,35 +517,25 @@ class TopologyDialog(QDialog):
 
                 # L 形连线：parent → 垂直下 → 水平拐弯 → joint → 垂直下 → child
                 # 第 1 段：parent 底部垂直向下到 joint 的 y 水平线
-                line_v1 = QGraphicsLineItem(
-                    parent_bottom.x(), parent_bottom.y(),
-                    parent_bottom.x(), joint_top.y()
-                )
-                line_v1.setPen(pen)
-                line_v1.setZValue(-1)
-                self.scene.addItem(line_v1)
-                self.line_items.append(line_v1)
+                path.moveTo(parent_bottom)
+                path.lineTo(parent_bottom.x(), joint_top.y())
 
                 # 第 2 段：水平连到 joint（仅当 parent_x != child_x 时）
                 if abs(parent_bottom.x() - joint_top.x()) > 1:
-                    line_h = QGraphicsLineItem(
-                        parent_bottom.x(), joint_top.y(),
-                        joint_top.x(), joint_top.y()
-                    )
-                    line_h.setPen(pen)
-                    line_h.setZValue(-1)
-                    self.scene.addItem(line_h)
-                    self.line_items.append(line_h)
+                    path.lineTo(joint_top)
 
                 # 第 3 段：joint 底部到 child 顶部
-                line_v2 = QGraphicsLineItem(
-                    joint_bottom.x(), joint_bottom.y(),
-                    child_top.x(), child_top.y()
-                )
-                line_v2.setPen(pen)
-                line_v2.setZValue(-1)
-                self.scene.addItem(line_v2)
-                self.line_items.append(line_v2)
+                path.moveTo(joint_bottom)
+                path.lineTo(child_top)
+
+            if path.isEmpty():
+                continue
+
+            line_item = QGraphicsPathItem(path)
+            line_item.setPen(pen)
+            line_item.setZValue(-1)
+            self.scene.addItem(line_item)
+            self.line_items.append(line_item)
 
         # 适应视图
         self.view.fit_in_view()
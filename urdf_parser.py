@@ -3,7 +3,6 @@ import math
 import os
 import re
 from anytree import Node, RenderTree
-import transformations as tf
 
 
 def resolve_mesh_uri(uri, base_dir):
@@ -85,6 +84,357 @@ def resolve_mesh_uri(uri, base_dir):
     return os.path.normpath(os.path.join(base_dir, uri))
 
 
+_IDENTITY4 = np.eye(4)
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _fk_kernel_numpy(q, parent_idx, local_tf, axes, q_idx, out, start=0):
+    """按拓扑顺序计算世界变换：out[i] = out[parent] @ local[i] @ Rot(axis[i], q[q_idx[i]])
+
+    只重算 start 及之后的条目，之前的条目沿用 out 中已有的结果。
+    """
+    nq = q.shape[0]
+    for i in range(start, parent_idx.shape[0]):
+        p = parent_idx[i]
+        T = local_tf[i] if p < 0 else out[p] @ local_tf[i]
+        k = q_idx[i]
+        if 0 <= k < nq:
+            c = math.cos(q[k])
+            s = math.sin(q[k])
+            a = axes[i]
+            R = c * np.eye(3) + (1.0 - c) * np.outer(a, a)
+            R += s * np.array([[0.0, -a[2], a[1]], [a[2], 0.0, -a[0]], [-a[1], a[0], 0.0]])
+            T = T.copy()
+            T[:3, :3] = T[:3, :3] @ R
+        out[i] = T
+    return out
+
+
+def _fk_kernel_loops(q, parent_idx, local_tf, axes, q_idx, out, start=0):
+    """与 _fk_kernel_numpy 相同，展开为标量循环供 numba 编译"""
+    nq = q.shape[0]
+    R = np.empty((3, 3))
+    for i in range(start, parent_idx.shape[0]):
+        p = parent_idx[i]
+        if p < 0:
+            for r in range(4):
+                for c in range(4):
+                    out[i, r, c] = local_tf[i, r, c]
+        else:
+            for r in range(4):
+                for c in range(4):
+                    acc = 0.0
+                    for m in range(4):
+                        acc += out[p, r, m] * local_tf[i, m, c]
+                    out[i, r, c] = acc
+        k = q_idx[i]
+        if k >= 0 and k < nq:
+            cq = math.cos(q[k])
+            sq = math.sin(q[k])
+            x = axes[i, 0]
+            y = axes[i, 1]
+            z = axes[i, 2]
+            t = 1.0 - cq
+            R[0, 0] = cq + t * x * x
+            R[0, 1] = t * x * y - sq * z
+            R[0, 2] = t * x * z + sq * y
+            R[1, 0] = t * x * y + sq * z
+            R[1, 1] = cq + t * y * y
+            R[1, 2] = t * y * z - sq * x
+            R[2, 0] = t * x * z - sq * y
+            R[2, 1] = t * y * z + sq * x
+            R[2, 2] = cq + t * z * z
+            for r in range(3):
+                r0 = out[i, r, 0]
+                r1 = out[i, r, 1]
+                r2 = out[i, r, 2]
+                for c in range(3):
+                    out[i, r, c] = r0 * R[0, c] + r1 * R[1, c] + r2 * R[2, c]
+    return out
+
+
+if HAS_NUMBA:
+    _fk_kernel = njit(cache=True)(_fk_kernel_loops)
+else:
+    _fk_kernel = _fk_kernel_numpy
+
+
+def _batch_compose(parents, locals_):
+    """批量计算 parents[i] @ locals_[i]，返回连续的 (N,4,4) 数组"""
+    return np.matmul(np.asarray(parents, dtype=np.float64).reshape(-1, 4, 4),
+                     np.asarray(locals_, dtype=np.float64).reshape(-1, 4, 4))
+
+
+def rigid_inverse(T):
+    """齐次变换的逆，支持 (4,4) 或 (N,4,4)
+
+    旋转部分正交时直接用 [R^T, -R^T t; 0 1]，省去通用 LU 求逆；
+    否则（例如关节轴未归一化得到的非正交坐标系）退回 np.linalg.inv。
+    """
+    T = np.asarray(T, dtype=np.float64)
+    R = T[..., :3, :3]
+    Rt = np.swapaxes(R, -1, -2)
+    if not np.allclose(Rt @ R, np.eye(3), atol=1e-9):
+        return np.linalg.inv(T)
+    inv = np.zeros_like(T)
+    inv[..., :3, :3] = Rt
+    inv[..., :3, 3] = -np.einsum('...ij,...j->...i', Rt, T[..., :3, 3])
+    inv[..., 3, 3] = 1.0
+    return inv
+
+
+def batch_mdh_chains(segments):
+    """多条链的 MDH 坐标轴与参数一次性计算
+
+    各链的 (P, Z, X) 首尾相接拼成一个 (sum(N_r+1),3) 数组，只调用一次
+    batch_mdh_axes / batch_mdh_parameters 内核；跨链的那一对结果直接丢弃，
+    并把每条链末行的原点 / x 轴恢复为输入值。
+
+    Args:
+        segments: [(joint_positions, joint_vectors, joint_xs), ...]，每项为 (N_r+1,3)
+
+    Returns:
+        list: 每条链一个 (origins, zs, xs, params)，params 为 (N_r,4) ndarray
+    """
+    if not segments:
+        return []
+    P = np.concatenate([np.asarray(seg[0], dtype=np.float64).reshape(-1, 3) for seg in segments])
+    Z = np.concatenate([np.asarray(seg[1], dtype=np.float64).reshape(-1, 3) for seg in segments])
+    X = np.concatenate([np.asarray(seg[2], dtype=np.float64).reshape(-1, 3) for seg in segments])
+    ends = np.cumsum([np.asarray(seg[0]).reshape(-1, 3).shape[0] for seg in segments])
+    starts = ends - np.diff(ends, prepend=0)
+
+    # 跨链的行对可能退化（除零），结果会被丢弃
+    with np.errstate(divide='ignore', invalid='ignore'):
+        origins, zs, xs, _ = batch_mdh_axes(P, Z, X)
+        last = ends - 1
+        origins[last] = P[last]
+        xs[last] = X[last]
+        params = batch_mdh_parameters(origins, zs, xs)
+
+    return [(origins[a:b], zs[a:b], xs[a:b], params[a:b - 1]) for a, b in zip(starts, ends)]
+
+
+def _solve_2col(A, b):
+    """3x2 最小二乘 A @ [t, s] ≈ b：正规方程的 2x2 显式逆，奇异时退回 lstsq"""
+    a0, a1 = A[:, 0], A[:, 1]
+    m00, m01, m11 = a0 @ a0, a0 @ a1, a1 @ a1
+    r0, r1 = a0 @ b, a1 @ b
+    det = m00 * m11 - m01 * m01
+    if abs(det) <= 1e-12 * max(m00 * m11, 1e-300):
+        return np.linalg.lstsq(A, b, rcond=None)[0]
+    return (m11 * r0 - m01 * r1) / det, (m00 * r1 - m01 * r0) / det
+
+
+def mdh_rest_relative(mdh_frames):
+    """零位 MDH 相邻坐标系的相对变换 inv(F[i-1]) @ F[i]，形状 (N-1,4,4)
+
+    只依赖链结构，可按链缓存后传给 update_mdh_frames(rest_relative=...)。
+    """
+    frames = np.asarray(mdh_frames, dtype=np.float64).reshape(-1, 4, 4)
+    return rigid_inverse(frames[:-1]) @ frames[1:]
+
+
+# calculate_mdh_origin_position 的情况分类，批量内核以整数编码
+_MDH_CASES = ('coincident', 'intersect', 'parallel', 'skew')
+
+
+def _rowdot(a, b):
+    """逐行点积 (N,3)·(N,3) → (N,)"""
+    return np.einsum('ij,ij->i', a, b)
+
+
+def _unit_rows(v):
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def _mdh_axes_numpy(P, Z, X, origins, xs, cases):
+    """相邻关节对分类并写入 MDH 原点 / x 轴；origins、xs 需预先拷贝自 P、X"""
+    zi, zi_next = Z[:-1], Z[1:]
+    diff = P[1:] - P[:-1]
+    cross_z = np.cross(zi, zi_next)
+
+    # 情况1 / 3: zi 与 zi+1 平行；在同一直线上即为重合
+    parallel_axes = np.all(np.abs(cross_z) <= 1e-8, axis=1)
+    coincident = parallel_axes & np.all(np.abs(np.cross(diff, zi)) <= 1e-8, axis=1)
+    parallel = parallel_axes & ~coincident
+
+    # 情况2 / 4: 两轴最短距离为 0 则相交，否则异面
+    cross_sq = _rowdot(cross_z, cross_z)
+    safe_sq = np.where(parallel_axes, 1.0, cross_sq)
+    distance = np.abs(_rowdot(diff, cross_z)) / np.sqrt(safe_sq)
+    intersect = ~parallel_axes & (distance <= 1e-8)
+
+    # 公垂线与 zi 的交点参数 t（相交时即交点）
+    t = _rowdot(np.cross(diff, zi_next), cross_z) / safe_sq
+    skew_or_intersect = ~parallel_axes
+    origins[:-1][skew_or_intersect] += t[skew_or_intersect, None] * zi[skew_or_intersect]
+
+    if skew_or_intersect.any():
+        xs[:-1][skew_or_intersect] = _unit_rows(cross_z[skew_or_intersect])
+    if parallel.any():
+        # 公垂线方向：pi+1 - pi 去掉沿 zi 的分量
+        perp = diff[parallel] - _rowdot(diff[parallel], zi[parallel])[:, None] * zi[parallel]
+        xs[:-1][parallel] = _unit_rows(perp)
+
+    cases[:] = np.where(coincident, 0, np.where(intersect, 1, np.where(parallel, 2, 3)))
+
+
+def _mdh_axes_loops(P, Z, X, origins, xs, cases):
+    """与 _mdh_axes_numpy 相同，叉积 / 点积展开为标量表达式供 numba 编译"""
+    for i in range(P.shape[0] - 1):
+        zx, zy, zz = Z[i, 0], Z[i, 1], Z[i, 2]
+        nx, ny, nz = Z[i + 1, 0], Z[i + 1, 1], Z[i + 1, 2]
+        dx = P[i + 1, 0] - P[i, 0]
+        dy = P[i + 1, 1] - P[i, 1]
+        dz = P[i + 1, 2] - P[i, 2]
+        cx = zy * nz - zz * ny
+        cy = zz * nx - zx * nz
+        cz = zx * ny - zy * nx
+
+        if abs(cx) <= 1e-8 and abs(cy) <= 1e-8 and abs(cz) <= 1e-8:
+            ex = dy * zz - dz * zy
+            ey = dz * zx - dx * zz
+            ez = dx * zy - dy * zx
+            if abs(ex) <= 1e-8 and abs(ey) <= 1e-8 and abs(ez) <= 1e-8:
+                cases[i] = 0
+                continue
+            k = dx * zx + dy * zy + dz * zz
+            px = dx - k * zx
+            py = dy - k * zy
+            pz = dz - k * zz
+            norm = math.sqrt(px * px + py * py + pz * pz)
+            xs[i, 0] = px / norm
+            xs[i, 1] = py / norm
+            xs[i, 2] = pz / norm
+            cases[i] = 2
+        else:
+            sq = cx * cx + cy * cy + cz * cz
+            norm = math.sqrt(sq)
+            distance = abs(dx * cx + dy * cy + dz * cz) / norm
+            fx = dy * nz - dz * ny
+            fy = dz * nx - dx * nz
+            fz = dx * ny - dy * nx
+            t = (fx * cx + fy * cy + fz * cz) / sq
+            origins[i, 0] += t * zx
+            origins[i, 1] += t * zy
+            origins[i, 2] += t * zz
+            xs[i, 0] = cx / norm
+            xs[i, 1] = cy / norm
+            xs[i, 2] = cz / norm
+            cases[i] = 1 if distance <= 1e-8 else 3
+
+
+def _signed_angles(u_prev, u, axis):
+    """u_prev、u 投影到垂直于 axis 的平面后，绕 axis 从 u_prev 转到 u 的有向角"""
+    p_prev = _unit_rows(u_prev - _rowdot(u_prev, axis)[:, None] * axis)
+    p = _unit_rows(u - _rowdot(u, axis)[:, None] * axis)
+    return np.arctan2(_rowdot(np.cross(p_prev, p), axis), _rowdot(p_prev, p))
+
+
+def _mdh_params_numpy(origins, zs, xs, params):
+    o_prev, z_prev, x_prev = origins[:-1], zs[:-1], xs[:-1]
+    oi, zi, xi = origins[1:], zs[1:], xs[1:]
+    delta = oi - o_prev
+
+    # theta: 绕 zi 从 xi-1 转到 xi；d: 沿 zi 从 xi-1 到 xi
+    params[:, 0] = _signed_angles(x_prev, xi, zi)
+    params[:, 1] = _rowdot(delta, zi)
+    # a: 沿 xi-1 从 zi-1 到 zi；alpha: 绕 xi-1 从 zi-1 转到 zi
+    params[:, 2] = _rowdot(delta, x_prev)
+    params[:, 3] = _signed_angles(z_prev, zi, x_prev)
+
+
+def _signed_angle_loops(ux, uy, uz, vx, vy, vz, ax, ay, az):
+    """_signed_angles 的单行标量版本"""
+    k = ux * ax + uy * ay + uz * az
+    ux, uy, uz = ux - k * ax, uy - k * ay, uz - k * az
+    norm = math.sqrt(ux * ux + uy * uy + uz * uz)
+    ux, uy, uz = ux / norm, uy / norm, uz / norm
+    k = vx * ax + vy * ay + vz * az
+    vx, vy, vz = vx - k * ax, vy - k * ay, vz - k * az
+    norm = math.sqrt(vx * vx + vy * vy + vz * vz)
+    vx, vy, vz = vx / norm, vy / norm, vz / norm
+    sin_a = (uy * vz - uz * vy) * ax + (uz * vx - ux * vz) * ay + (ux * vy - uy * vx) * az
+    cos_a = ux * vx + uy * vy + uz * vz
+    return math.atan2(sin_a, cos_a)
+
+
+def _mdh_params_loops(origins, zs, xs, params):
+    """与 _mdh_params_numpy 相同，逐帧展开供 numba 编译"""
+    for i in range(params.shape[0]):
+        j = i + 1
+        dx = origins[j, 0] - origins[i, 0]
+        dy = origins[j, 1] - origins[i, 1]
+        dz = origins[j, 2] - origins[i, 2]
+        params[i, 0] = _signed_angle(xs[i, 0], xs[i, 1], xs[i, 2], xs[j, 0], xs[j, 1], xs[j, 2],
+                                     zs[j, 0], zs[j, 1], zs[j, 2])
+        params[i, 1] = dx * zs[j, 0] + dy * zs[j, 1] + dz * zs[j, 2]
+        params[i, 2] = dx * xs[i, 0] + dy * xs[i, 1] + dz * xs[i, 2]
+        params[i, 3] = _signed_angle(zs[i, 0], zs[i, 1], zs[i, 2], zs[j, 0], zs[j, 1], zs[j, 2],
+                                     xs[i, 0], xs[i, 1], xs[i, 2])
+
+
+if HAS_NUMBA:
+    # error_model='numpy'：退化链中除以零得到 nan，与 NumPy 版本一致而不是抛异常
+    _signed_angle = njit(cache=True, error_model='numpy')(_signed_angle_loops)
+    _mdh_axes_kernel = njit(cache=True, error_model='numpy')(_mdh_axes_loops)
+    _mdh_params_kernel = njit(cache=True, error_model='numpy')(_mdh_params_loops)
+else:
+    _signed_angle = _signed_angle_loops
+    _mdh_axes_kernel = _mdh_axes_numpy
+    _mdh_params_kernel = _mdh_params_numpy
+
+
+def batch_mdh_axes(joint_positions, joint_vectors, joint_xs):
+    """整批计算 MDH 坐标系的原点、z 轴与 x 轴
+
+    与逐对调用 calculate_mdh_origin_position 的分类和判据完全一致
+    (allclose / isclose 的默认容差 1e-8)，相交与异面两种情况都用公垂线
+    最近点的闭式解代替 lstsq。
+
+    Args:
+        joint_positions: (N+1,3) 关节位置（含 base）
+        joint_vectors: (N+1,3) 关节 z 轴
+        joint_xs: (N+1,3) 关节默认 x 轴
+
+    Returns:
+        tuple: (origins, zs, xs, cases)，前三者为 (N+1,3) ndarray，
+               cases 为长度 N 的情况分类列表
+    """
+    P = np.ascontiguousarray(joint_positions, dtype=np.float64).reshape(-1, 3)
+    Z = np.ascontiguousarray(joint_vectors, dtype=np.float64).reshape(-1, 3)
+    X = np.ascontiguousarray(joint_xs, dtype=np.float64).reshape(-1, 3)
+
+    origins = P.copy()
+    xs = X.copy()
+    cases = np.empty(max(P.shape[0] - 1, 0), dtype=np.int64)
+    _mdh_axes_kernel(P, Z, X, origins, xs, cases)
+    return origins, Z.copy(), xs, [_MDH_CASES[c] for c in cases]
+
+
+def batch_mdh_parameters(origins, zs, xs):
+    """由 MDH 坐标系的原点与坐标轴整批计算 [theta, d, a, alpha]
+
+    Args:
+        origins, zs, xs: (N+1,3) ndarray，batch_mdh_axes 的输出
+
+    Returns:
+        (N,4) ndarray
+    """
+    origins = np.ascontiguousarray(origins, dtype=np.float64)
+    zs = np.ascontiguousarray(zs, dtype=np.float64)
+    xs = np.ascontiguousarray(xs, dtype=np.float64)
+    params = np.empty((max(origins.shape[0] - 1, 0), 4))
+    _mdh_params_kernel(origins, zs, xs, params)
+    return params
+
+
 class URDFParser:
     """Class to parse URDF files and extract link and joint information"""
 
@@ -318,96 +668,123 @@ class URDFParser:
 
         return T
 
-    def forward_kinematics(self, qs=None):
-        """Compute the transformations for all links based on the tree structure"""
-        
-        # Identify all chains in the URDF
+    def _build_fk_plan(self):
+        """将树结构展开为按拓扑顺序排列的 SoA 数组，供 _fk_kernel 使用
+
+        条目顺序与原先逐链遍历时 transformations 字典的插入顺序一致。
+        """
         chains, trees = self.identify_chains()
-        
-        if len(trees) > 1:
-            print('Warning: Multiple trees are found, all will be processed')
-        
-        # Initialize transformations dictionary
-        transformations = {}
-        
-        # Process each tree
+        rev_joints = [j for j in self.joints if j['type'] == 'revolute']
+        joint_by_name = {j["name"]: j for j in self.joints}
+
+        index = {}      # name -> 条目序号
+        parent_idx = []
+        local_tf = []
+        axes = []
+        q_idx = []
+
+        def add(name, parent, T_local, axis=(0.0, 0.0, 1.0), k=-1):
+            index[name] = len(parent_idx)
+            parent_idx.append(parent)
+            local_tf.append(T_local)
+            axes.append(axis)
+            q_idx.append(k)
+
         for tree in trees:
             # Root link has identity transformation
-            transformations[tree.name] = np.eye(4)
-            
-            # Find all chains in this tree
+            add(tree.name, -1, _IDENTITY4)
             tree_chains = [chain for chain in chains if chain["root"] == tree]
-            
-            # Process each chain
             for chain in tree_chains:
-                # Get the nodes in the chain (alternating links and joints)
                 nodes = chain["nodes"]
-                
-                # Traverse the chain from root to leaf
                 for i in range(1, len(nodes)):
                     current_node = nodes[i]
-                    parent_node = nodes[i-1]
-                    
+                    parent_node = nodes[i - 1]
+                    if current_node.name in index:
+                        continue
                     if current_node.node_type == "joint":
-                        # Current node is a joint, parent is a link
-                        joint_name = current_node.name
-                        parent_link = parent_node.name
-                        
-                        # Find the joint data
-                        joint_data = next((j for j in self.joints if j["name"] == joint_name), None)
-                        
-                        if joint_data:
-                            # Get parent transformation
-                            if parent_link in transformations:
-                                T_parent = transformations[parent_link]
-                            else:
-                                print(f"Warning: Parent link '{parent_link}' not found in transformations")
-                                T_parent = np.eye(4)
-                            
-                            # Compute joint transformation
-                            T_joint = self.compute_transformation(
-                                joint_data["origin"]["rpy"], joint_data["origin"]["xyz"]
-                            )
-                            
-                            # If joint angles are provided and this is a revolute joint
-                            if qs is not None and joint_data["type"] == "revolute":
-                                # Find the index of this joint in the revolute joints list
-                                rev_joints = [j for j in self.joints if j['type'] == 'revolute']
-                                try:
-                                    joint_index = rev_joints.index(joint_data)
-                                    if joint_index < len(qs):
-                                        q = qs[joint_index]
-                                        # Apply rotation based on joint angle and axis
-                                        joint_axis = joint_data['axis']
-                                        T_update = tf.rotation_matrix(q, joint_axis)
-                                        # Store joint transformation (parent * joint * rotation)
-                                        transformations[joint_name] = T_parent @ T_joint @ T_update
-                                    else:
-                                        # Not enough joint angles provided
-                                        transformations[joint_name] = T_parent @ T_joint
-                                except ValueError:
-                                    # Joint not found in revolute joints list
-                                    transformations[joint_name] = T_parent @ T_joint
-                            else:
-                                # Non-revolute joint or no joint angles provided
-                                transformations[joint_name] = T_parent @ T_joint
-                    
+                        joint_data = joint_by_name.get(current_node.name)
+                        if joint_data is None:
+                            continue
+                        T_joint = self.compute_transformation(
+                            joint_data["origin"]["rpy"], joint_data["origin"]["xyz"]
+                        )
+                        axis = (0.0, 0.0, 1.0)
+                        k = -1
+                        if joint_data["type"] == "revolute":
+                            k = rev_joints.index(joint_data)
+                            axis = np.asarray(joint_data['axis'], dtype=np.float64)
+                            axis = axis / np.linalg.norm(axis)
+                        add(current_node.name, index[parent_node.name], T_joint, axis, k)
                     elif current_node.node_type == "link":
-                        # Current node is a link, parent is a joint
-                        link_name = current_node.name
-                        parent_joint = parent_node.name
-                        
-                        # Get parent transformation
-                        if parent_joint in transformations:
-                            T_parent = transformations[parent_joint]
+                        if parent_node.name in index:
+                            parent = index[parent_node.name]
                         else:
-                            print(f"Warning: Parent joint '{parent_joint}' not found in transformations")
-                            T_parent = np.eye(4)
-                        
+                            print(f"Warning: Parent joint '{parent_node.name}' not found in transformations")
+                            parent = -1
                         # Link transformation is the same as its parent joint
-                        transformations[link_name] = T_parent
-        
-        return transformations
+                        add(current_node.name, parent, _IDENTITY4)
+
+        n = len(parent_idx)
+        # 每个 revolute 关节对应的条目序号（不在树中的关节记为 n，不影响任何条目）
+        q_row = np.full(len(rev_joints), n, dtype=np.int64)
+        for i, k in enumerate(q_idx):
+            if k >= 0:
+                q_row[k] = i
+        self._fk_plan = {
+            "names": list(index.keys()),
+            "n_trees": len(trees),
+            "parent_idx": np.asarray(parent_idx, dtype=np.int64),
+            "local_tf": np.ascontiguousarray(np.asarray(local_tf, dtype=np.float64).reshape(n, 4, 4)),
+            "axes": np.ascontiguousarray(np.asarray(axes, dtype=np.float64).reshape(n, 3)),
+            "q_idx": np.asarray(q_idx, dtype=np.int64),
+            "q_row": q_row,
+        }
+        return self._fk_plan
+
+    def _forward_kinematics_incremental(self, qs):
+        """增量正运动学：只从最早变化的关节所在条目开始重算
+
+        结果保存在 self._fk_state 的 (n+1,4,4) 缓冲区中（末尾额外一行单位阵，
+        供找不到父坐标系的关节使用），调用方不得修改，也不应长期持有。
+        拓扑顺序保证父条目总在子条目之前，从 start 往后全部重算即可覆盖所有后代。
+        """
+        plan = getattr(self, "_fk_plan", None) or self._build_fk_plan()
+        q = np.array(qs, dtype=np.float64).reshape(-1)
+        n = plan["parent_idx"].shape[0]
+
+        state = getattr(self, "_fk_state", None)
+        if state is None or state["q"].shape != q.shape:
+            start = 0
+            frames = np.empty((n + 1, 4, 4), dtype=np.float64)
+            frames[n] = _IDENTITY4
+        else:
+            frames = state["frames"]
+            changed = np.nonzero(q != state["q"])[0]
+            q_row = plan["q_row"]
+            changed = changed[changed < q_row.shape[0]]
+            start = int(q_row[changed].min()) if changed.size else n
+        if start < n:
+            _fk_kernel(q, plan["parent_idx"], plan["local_tf"], plan["axes"], plan["q_idx"], frames[:n], start)
+        self._fk_state = {"q": q, "frames": frames}
+        return frames
+
+    def forward_kinematics(self, qs=None):
+        """Compute the transformations for all links based on the tree structure"""
+        plan = getattr(self, "_fk_plan", None) or self._build_fk_plan()
+
+        if plan["n_trees"] > 1:
+            print('Warning: Multiple trees are found, all will be processed')
+
+        if qs is None:
+            q = np.zeros(0)
+        else:
+            q = np.ascontiguousarray(qs, dtype=np.float64).reshape(-1)
+
+        # 预分配输出，内核按拓扑顺序原地写入世界变换
+        out = np.empty_like(plan["local_tf"])
+        _fk_kernel(q, plan["parent_idx"], plan["local_tf"], plan["axes"], plan["q_idx"], out, 0)
+
+        return dict(zip(plan["names"], out))
 
     def get_robot_info(self, qs=None):
         """Get information about the robot links and their transformations"""
@@ -424,6 +801,10 @@ class URDFParser:
         collision_link_names = []
         collision_geometries = []
         
+        # 父坐标系与局部偏移先收集起来，循环结束后一次批量 matmul 组合
+        collision_parent_frames = []
+        joint_parent_frames = []
+
         # For joint frames
         joint_names = []
         joint_frames = []
@@ -446,19 +827,16 @@ class URDFParser:
                 T_visual = self.compute_transformation(
                     link_info["origin"]["rpy"], link_info["origin"]["xyz"]
                 )
-
-                # Combine with the link's transformation
-                T_total = T @ T_visual
                 color = link_info["color"]
     
             else: # 虚拟Link
                 mesh_file = None
-                T_total = T
+                T_visual = _IDENTITY4
                 color = None
                 
             link_names.append(name)
             link_mesh_files.append(mesh_file)
-            link_mesh_transformations.append(T_total)
+            link_mesh_transformations.append(T_visual)
             link_frames.append(T)
             link_colors.append(color)
                 
@@ -470,14 +848,15 @@ class URDFParser:
                         link_info["collision_origin"]["rpy"], link_info["collision_origin"]["xyz"]
                     )
                 else:
-                    T_collision = self.compute_transformation([0, 0, 0], [0, 0, 0])
+                    T_collision = _IDENTITY4
 
-                T_total_coll = T @ T_collision
+                T_total_coll = T_collision
 
                 if collision_type == 'mesh':
                     mesh_file = resolve_mesh_uri(link_info["collision_mesh"], self.mesh_dir)
                     collision_mesh_files.append(mesh_file)
                     collision_mesh_transformations.append(T_total_coll)
+                    collision_parent_frames.append(T)
                     collision_link_names.append(name)
                     collision_geometries.append({'type': 'mesh', 'file': mesh_file})
 
@@ -485,6 +864,7 @@ class URDFParser:
                     size = link_info.get("collision_box_size", [0, 0, 0])
                     collision_mesh_files.append(None)
                     collision_mesh_transformations.append(T_total_coll)
+                    collision_parent_frames.append(T)
                     collision_link_names.append(name)
                     collision_geometries.append({'type': 'box', 'size': size})
 
@@ -492,6 +872,7 @@ class URDFParser:
                     radius = link_info.get("collision_sphere_radius", 0)
                     collision_mesh_files.append(None)
                     collision_mesh_transformations.append(T_total_coll)
+                    collision_parent_frames.append(T)
                     collision_link_names.append(name)
                     collision_geometries.append({'type': 'sphere', 'radius': radius})
 
@@ -500,6 +881,7 @@ class URDFParser:
                     length = link_info.get("collision_cylinder_length", 0)
                     collision_mesh_files.append(None)
                     collision_mesh_transformations.append(T_total_coll)
+                    collision_parent_frames.append(T)
                     collision_link_names.append(name)
                     collision_geometries.append({'type': 'cylinder', 'radius': radius, 'length': length})
 
@@ -521,17 +903,36 @@ class URDFParser:
                 joint["origin"]["rpy"], joint["origin"]["xyz"]
             )
             
-            # Joint frame is parent * joint
-            joint_frame = T_parent @ T_joint
-            
             joint_names.append(joint["name"])
-            joint_frames.append(joint_frame)
+            joint_frames.append(T_joint)
+            joint_parent_frames.append(T_parent)
             joint_types.append(joint["type"])
             joint_axes.append(joint["axis"])
             joint_parent_links.append(parent)
             joint_child_links.append(child)
             joint_limits.append(joint["limit"])
 
+        # 记录各位姿在 FK 结果中的行号与局部偏移，供 update_robot_info 只更新位姿
+        row = {name: i for i, name in enumerate(transformations)}
+        n_rows = len(row)
+        self._pose_plan = {
+            "link_names": list(link_names),
+            "link_rows": np.asarray([row[name] for name in link_names], dtype=np.int64),
+            "link_local": np.asarray(link_mesh_transformations, dtype=np.float64).reshape(-1, 4, 4),
+            "collision_rows": np.asarray([row[name] for name in collision_link_names], dtype=np.int64),
+            "collision_local": np.asarray(collision_mesh_transformations, dtype=np.float64).reshape(-1, 4, 4),
+            "joint_rows": np.asarray([row.get(joint["parent"], n_rows) for joint in self.joints], dtype=np.int64),
+            "joint_local": np.asarray(joint_frames, dtype=np.float64).reshape(-1, 4, 4),
+        }
+
+        # Visual = link * visual_origin, Collision = link * collision_origin,
+        # Joint frame = parent * joint
+        # 所有位姿都以连续的 (N,4,4) 数组返回（SoA），便于调用方整批计算
+        link_frames = np.asarray(link_frames, dtype=np.float64).reshape(-1, 4, 4)
+        link_mesh_transformations = np.matmul(link_frames, self._pose_plan["link_local"])
+        collision_mesh_transformations = _batch_compose(collision_parent_frames, collision_mesh_transformations)
+        joint_frames = _batch_compose(joint_parent_frames, joint_frames)
+
         return (
             link_names,
             link_mesh_files,
@@ -551,8 +952,57 @@ class URDFParser:
             collision_geometries,
         )
     
+    def update_robot_info(self, prev_info, qs):
+        """只更新 get_robot_info 结果中随关节变化的位姿
+
+        网格文件、颜色、关节属性等静态字段沿用 prev_info；link 坐标系、visual / collision
+        网格位姿和关节坐标系由增量 FK 重新计算。尚未调用过 get_robot_info 时退回完整计算。
+
+        Args:
+            prev_info: 之前 get_robot_info / update_robot_info 返回的元组
+            qs: 关节角度（revolute 顺序）
+
+        Returns:
+            与 get_robot_info 相同结构的元组
+        """
+        plan = getattr(self, "_pose_plan", None)
+        if prev_info is None or plan is None:
+            return self.get_robot_info(qs=qs)
+
+        frames = self._forward_kinematics_incremental(qs)
+        # 花式索引得到独立的副本，不与 FK 缓冲区共享内存
+        link_frames = frames[plan["link_rows"]]
+        info = list(prev_info)
+        info[2] = np.matmul(link_frames, plan["link_local"])
+        info[3] = link_frames
+        info[6] = frames[plan["joint_rows"]] @ plan["joint_local"]
+        info[12] = frames[plan["collision_rows"]] @ plan["collision_local"]
+        return tuple(info)
+
+    def get_link_frames_only(self, qs=None):
+        """只计算 link 名称与 link 坐标系，跳过网格、颜色与关节元数据
+
+        Args:
+            qs: 关节角度（revolute 顺序）
+
+        Returns:
+            tuple: (link_names, link_frames)，link_frames 为 (N,4,4) ndarray
+        """
+        plan = getattr(self, "_pose_plan", None)
+        if plan is None:
+            link_names, _, _, link_frames = self.get_robot_info(qs=qs)[:4]
+            return link_names, link_frames
+
+        frames = self._forward_kinematics_incremental(qs)
+        return list(plan["link_names"]), frames[plan["link_rows"]]
+
     def build_multiple_trees(self):
         """Build multiple kinematic trees if the URDF contains disconnected structures"""
+        # 树结构在解析后不再变化，self.nodes 只构建一次，直到 invalidate_cache()
+        cached = getattr(self, "_roots_cache", None)
+        if cached is not None:
+            return list(cached)
+        
         # Create nodes for all links and joints first
         self.nodes = {}
         
@@ -585,13 +1035,19 @@ class URDFParser:
             if node.is_root and node.node_type == "link":
                 roots.append(node)
                 
-        return roots
+        self._roots_cache = roots
+        return list(roots)
     
     def identify_chains(self):
         """
         Identify all kinematic chains in the URDF.
         A chain is defined as a path from a root node to a leaf node.
         """
+        # 拓扑在解析后不再变化，结果缓存到 invalidate_cache() 为止
+        cached = getattr(self, "_chains_cache", None)
+        if cached is not None:
+            return cached
+
         # Build all trees
         trees = self.build_multiple_trees()
         chains = []
@@ -626,7 +1082,13 @@ class URDFParser:
                 
                 chains.append(chain_info)
         
-        return chains, trees
+        self._chains_cache = (chains, trees)
+        return self._chains_cache
+
+    def invalidate_cache(self):
+        """清除由拓扑派生的缓存（链、正运动学计划等），修改 links / joints 后调用"""
+        for attr in ("_roots_cache", "_chains_cache", "_chain_topology_cache", "_fk_plan", "_fk_state", "_pose_plan"):
+            setattr(self, attr, None)
     
     def print_chains(self):
         """Print all kinematic chains in the URDF"""
@@ -658,49 +1120,58 @@ class URDFParser:
                             print(f"{node.name} → ", end="")
                 print()
     
+    def _chain_topology(self):
+        """每条链的静态信息（名称、关节类型 / 轴），与 identify_chains 一同缓存"""
+        cached = getattr(self, "_chain_topology_cache", None)
+        if cached is not None:
+            return cached
+        
+        chains, trees = self.identify_chains()
+        topology = []
+        for chain in chains:
+            # Extract link and joint names in order
+            link_names = [node.name for node in chain["nodes"] if node.node_type == "link"]
+            joint_names = [node.name for node in chain["nodes"] if node.node_type == "joint"]
+            joint_nodes = [self.nodes[joint_name] for joint_name in joint_names]
+            topology.append({
+                "name": chain["name"],
+                "root": chain["root"].name,
+                "leaf": chain["leaf"].name,
+                "link_names": link_names,
+                "joint_names": joint_names,
+                "joint_types": [getattr(node, "joint_type", "unknown") for node in joint_nodes],
+                "joint_axes": [getattr(node, "joint_axis", [0, 0, 1]) for node in joint_nodes],
+            })
+        
+        self._chain_topology_cache = (topology, trees)
+        return self._chain_topology_cache
+    
     def get_chain_info(self):
         """
         Get detailed information about all kinematic chains.
         Returns a list of dictionaries, each containing information about a chain.
         """
-        chains, trees = self.identify_chains()
+        topology, trees = self._chain_topology()
         chain_info_list = []
         
         # Get transformations for all links
         transformations = self.forward_kinematics()
         
-        for chain in chains:
-            # Extract link and joint names in order
-            link_names = [node.name for node in chain["nodes"] if node.node_type == "link"]
-            joint_names = [node.name for node in chain["nodes"] if node.node_type == "joint"]
-            
-            # Get joint types and axes
-            joint_types = []
-            joint_axes = []
-            
-            for joint_name in joint_names:
-                joint_node = self.nodes[joint_name]
-                joint_types.append(getattr(joint_node, "joint_type", "unknown"))
-                joint_axes.append(getattr(joint_node, "joint_axis", [0, 0, 1]))
+        for static in topology:
+            link_names = static["link_names"]
+            joint_names = static["joint_names"]
             
-            # Get link transformations
-            link_transforms = []
-            for link_name in link_names:
-                if link_name in transformations:
-                    link_transforms.append(transformations[link_name])
-                else:
-                    link_transforms.append(np.eye(4))
-            
-            # Create detailed chain info
+            # 静态部分来自缓存，每次只重新提取 link 变换
             detailed_info = {
-                "name": chain["name"],
-                "root": chain["root"].name,
-                "leaf": chain["leaf"].name,
-                "link_names": link_names,
-                "joint_names": joint_names,
-                "joint_types": joint_types,
-                "joint_axes": joint_axes,
-                "link_transforms": link_transforms,
+                "name": static["name"],
+                "root": static["root"],
+                "leaf": static["leaf"],
+                "link_names": list(link_names),
+                "joint_names": list(joint_names),
+                "joint_types": list(static["joint_types"]),
+                "joint_axes": list(static["joint_axes"]),
+                "link_transforms": [transformations[name] if name in transformations else np.eye(4)
+                                    for name in link_names],
                 "num_links": len(link_names),
                 "num_joints": len(joint_names)
             }
@@ -719,35 +1190,23 @@ class URDFParser:
         joint_types = ['base'] + chain["joint_types"]
         link_names = chain["link_names"]
         
-        joint_positions = []
-        joint_vectors = []
-        joint_xs = []
+        # 位置 / 轴向 / x 轴都写入连续的 (N,3) 数组，供 get_mdh_parameters 整批使用
+        n = min(len(link_names), len(link_frames), len(joint_axes), len(joint_types))
+        frames = np.asarray(link_frames[:n], dtype=np.float64).reshape(n, 4, 4)
+        axes = np.asarray(joint_axes[:n], dtype=np.float64).reshape(n, 3)
+        joint_positions = frames[:, :3, 3].copy()
+        joint_vectors = np.einsum('nij,nj->ni', frames[:, :3, :3], axes)
         
-        for name, T, axis, joint_type in zip(link_names, link_frames, joint_axes, joint_types):
-
-            # Extract position and orientation
-            pos = T[:3, 3]
-            rot = T[:3, :3]@np.array(axis)
-            
-            if np.allclose(np.abs(np.array(axis)), np.array([0, 0, 1])): # z axis rotation
-                joint_x = T[:3, :3]@np.array([1, 0, 0])
-            
-            if np.allclose(np.abs(np.array(axis)), np.array([0, 1, 0])): # y axis rotation
-                joint_x = T[:3, :3]@np.array([1, 0, 0])
-                
-            if np.allclose(np.abs(np.array(axis)), np.array([1, 0, 0])): # x axis rotation
-                joint_x = T[:3, :3]@np.array([0, 1, 0])
-
-
-            joint_pos = pos
-            joint_vector = rot
-            
-            joint_positions.append(joint_pos)
-            joint_vectors.append(joint_vector)
-            joint_xs.append(joint_x)
-
+        # x 轴种子：绕 x 轴旋转取 [0,1,0]，绕 y / z 轴取 [1,0,0]（与 np.allclose 的默认容差一致）
+        # 非坐标轴方向的关节沿用前一个关节的 x 轴
+        on_axis = np.abs(np.abs(axes)[:, None, :] - np.eye(3)) <= 1e-8 + 1e-5 * np.eye(3)
+        is_x, is_y, is_z = np.all(on_axis, axis=2).T
+        seeds = np.where(is_x[:, None], [0.0, 1.0, 0.0], [1.0, 0.0, 0.0])
+        joint_xs = np.einsum('nij,nj->ni', frames[:, :3, :3], seeds)
+        source = np.maximum.accumulate(np.where(is_x | is_y | is_z, np.arange(n), 0))
+        joint_xs = joint_xs[source]
         
-        return joint_positions, joint_vectors, joint_xs, joint_types
+        return joint_positions, joint_vectors, joint_xs, joint_types[:n]
     
     def calculate_mdh_origin_position(self, joint_pos, joint_vector, joint_pos_next, joint_vector_next):
 
@@ -773,12 +1232,16 @@ class URDFParser:
         
         common_perpendicular = None
         
+        # 叉积与位置差只算一次；逐分量 |c| <= 1e-8 与 allclose(c, 0) 等价，无需构造零向量
+        cross_z = np.cross(zi, zi_next)
+        diff_pos = pi_next - pi
+        axes_parallel = bool(np.all(np.abs(cross_z) <= 1e-8))
+        
         # 情况1: zi和zi+1重合 (向量相同或相反)
-        if np.allclose(np.cross(zi, zi_next), np.zeros(3)):
+        if axes_parallel:
             # 两条线重合或平行
             # 检查是否在同一直线上
-            diff_pos = pi_next - pi
-            if np.allclose(np.cross(diff_pos, zi), np.zeros(3)):
+            if np.all(np.abs(np.cross(diff_pos, zi)) <= 1e-8):
                 # 在同一直线上，返回pi作为原点
                 return pi, 'coincident', None
 
@@ -788,16 +1251,14 @@ class URDFParser:
         else:
             # 检查是否相交
             # 计算两条直线的最短距离
-            cross_z = np.cross(zi, zi_next)
-            diff_pos = pi_next - pi
-            distance = np.abs(np.dot(diff_pos, cross_z)) / np.linalg.norm(cross_z)
+            distance = abs(diff_pos @ cross_z) / math.sqrt(cross_z @ cross_z)
             
-            if np.isclose(distance, 0):
+            if distance <= 1e-8:
                 # 情况2: 相交
                 # 解方程组找到交点
                 A = np.column_stack((zi, -zi_next))
-                b = pi_next - pi
-                t, s = np.linalg.lstsq(A, b, rcond=None)[0]
+                b = diff_pos
+                t, s = _solve_2col(A, b)
                 oi = pi + t * zi
                 # The common perpendicular is the intersection point itself
                 common_perpendicular = (oi, oi)
@@ -808,15 +1269,15 @@ class URDFParser:
         # 计算公垂线
         
         # 向量垂直于zi和zi_next
-        n = np.cross(zi, zi_next)
+        n = cross_z
         
-        if np.allclose(n, np.zeros(3)):
+        if axes_parallel:
             # 情况3: 平行
             oi = pi  # 直接使用pi作为原点，即公垂线与zi的交点
             
             # 计算公垂线的两个端点
             point1 = pi
-            point2 = pi_next - np.dot(pi_next - pi, zi) * zi
+            point2 = pi_next - np.dot(diff_pos, zi) * zi
             common_perpendicular = (point1, point2)
             
             return oi, 'parallel', common_perpendicular
@@ -827,8 +1288,9 @@ class URDFParser:
             
             # 建立方程组
             A = np.column_stack((zi, -zi_next, n))
-            b = pi_next - pi
-            t, s, _ = np.linalg.lstsq(A, b, rcond=None)[0]
+            b = diff_pos
+            # n 与 zi、zi+1 都正交，A 满秩，直接求解方阵
+            t, s, _ = np.linalg.solve(A, b)
             # 公垂线与zi的交点
             oi = pi + t * zi
             
@@ -860,159 +1322,75 @@ class URDFParser:
         
         return mdh_frames
 
-    def update_mdh_frames(self,mdh_frames, joint_values):
-        T_i_iplus1 = []
-        for i, frame in enumerate(mdh_frames): #TO DO update_mdh_frame
-            if i >0:
-                joint = joint_values[i - 1]
-                rot_z = np.eye(4)
-                rot_z[0, 0] = math.cos(joint)
-                rot_z[1, 0] = math.sin(joint)
-                rot_z[1, 1] = math.cos(joint)
-                rot_z[0, 1] = -1 * math.sin(joint)
-                transform = np.linalg.inv(mdh_frames[i-1]) @ frame @ rot_z
-                T_i_iplus1.append(transform)
-        for i, frame in enumerate(mdh_frames):
-            if i >0:
-                mdh_frames[i] = mdh_frames[i - 1] @ T_i_iplus1[i - 1]
-        return mdh_frames
-
+    def update_mdh_frames(self, mdh_frames, joint_values, out=None, rest_relative=None):
+        """Update MDH frames based on joint values.
 
-        return 0
+        Args:
+            mdh_frames: 零位时的 MDH 坐标系列表 (4x4)
+            joint_values: 关节角度值
+            out: 可选的 (N,4,4) float64 预分配缓冲区，结果直接写入其中
+            rest_relative: 可选的 mdh_rest_relative(mdh_frames) 预计算结果，
+                传入后每次只需乘上 Rz(q)
 
+        Returns:
+            list: 更新后的 4x4 坐标系（out 中各帧的视图）
+        """
+        n = len(mdh_frames)
+        if n == 0:
+            return []
+        if out is None:
+            out = np.empty((n, 4, 4), dtype=np.float64)
+        frames = np.asarray(mdh_frames, dtype=np.float64).reshape(n, 4, 4)
+        q = np.asarray(joint_values, dtype=np.float64)[np.arange(n - 1)]
+
+        # T_i_iplus1 = inv(F[i-1]) @ F[i] @ Rz(q[i-1])，前两项只依赖零位坐标系
+        if rest_relative is None:
+            T_rel = mdh_rest_relative(frames)
+        else:
+            T_rel = np.array(rest_relative, dtype=np.float64)
+        c = np.cos(q)[:, None]
+        s = np.sin(q)[:, None]
+        col0 = T_rel[:, :, 0].copy()
+        col1 = T_rel[:, :, 1]
+        T_rel[:, :, 0] = c * col0 + s * col1
+        T_rel[:, :, 1] = c * col1 - s * col0
+
+        out[0] = frames[0]
+        for i in range(1, n):
+            np.matmul(out[i - 1], T_rel[i - 1], out=out[i])
+        return list(out[:n])
 
-            
     def get_mdh_parameters(self, chain):
         """
         Get the MDH parameters of the chain.
         Returns a list of dictionaries, each containing the MDH parameters of a joint.
         """
         # https://zhuanlan.zhihu.com/p/285759868
-        joint_positions, joint_vectors, joint_xs, joint_types = self.get_joint_axes(chain)
-
-
-        # skip fixed joints
-        joint_positions = [joint_positions[i] for i, t in enumerate(joint_types) if t=='revolute' or t =='base']
-        joint_vectors = [joint_vectors[i] for i, t in enumerate(joint_types) if t=='revolute' or t =='base']
-        joint_xs = [joint_xs[i] for i, t in enumerate(joint_types) if t=='revolute' or t =='base']
-
-        num_joints = len(joint_positions) - 1 # not base
-        
-        mdh_origins = []
-        mdh_zs = []
-        mdh_xs = []
-        mdh_cases = []
-    
-        for i in range(num_joints):
-
-            # zi
-            joint_pos = joint_positions[i]
-            joint_vector = joint_vectors[i]
-            joint_x = joint_xs[i]
-
-            # zi+1
-            joint_pos_next = joint_positions[i+1]
-            joint_vector_next = joint_vectors[i+1]
-
-            # 建立第i个坐标系的原点oi
-            
-            oi, case, common_perpendicular = self.calculate_mdh_origin_position(joint_pos, joint_vector, joint_pos_next, joint_vector_next)
-            mdh_cases.append(case)
-
-            
-            mdh_origins.append(oi)
-            mdh_zs.append(joint_vector)
-            
-            if case == 'coincident':
-                xi = joint_x
-
-            if case == 'skew' or case == 'intersect':
+        joint_positions, joint_vectors, joint_xs = self._mdh_joint_axes(chain)
 
-                xi = np.cross(joint_vector, joint_vector_next)
-                xi = xi / np.linalg.norm(xi)
-                
-            if case == 'parallel':
-                xi = common_perpendicular[1] - common_perpendicular[0]
-                xi = xi / np.linalg.norm(xi)
-
-            mdh_xs.append(xi)
+        # 所有相邻关节对一次性分类并求原点 / x 轴，再整批计算 MDH 参数
+        origins, zs, xs, _ = batch_mdh_axes(joint_positions, joint_vectors, joint_xs)
+        mdh_parameters = batch_mdh_parameters(origins, zs, xs).tolist()
 
-        # 最后一个joint
-        mdh_origins.append(joint_positions[-1])
-        mdh_zs.append(joint_vectors[-1])
-        mdh_xs.append(joint_xs[-1])
+        return list(origins), list(zs), list(xs), mdh_parameters
 
-        mdh_parameters = []
+    def get_mdh_parameters_batch(self, chains):
+        """多条链的 get_mdh_parameters，所有链拼接后只调用一次批量内核
 
-        for i in range(num_joints):
-            
-            # oi-1
-            o_prev = mdh_origins[i]
-            # zi-1, unit vector from oi-1
-            z_prev = mdh_zs[i]
-            # xi-1, unit vector from oi-1
-            x_prev = mdh_xs[i]
-
-            # oi
-            oi = mdh_origins[i+1]
-            # zi, unit vector from oi
-            zi = mdh_zs[i+1]
-            # xi, unit vector from oi
-            xi = mdh_xs[i+1]
-            
-            case = mdh_cases[i]
+        Returns:
+            list: 每条链与 get_mdh_parameters 相同的 (origins, zs, xs, parameters)
+        """
+        results = batch_mdh_chains([self._mdh_joint_axes(chain) for chain in chains])
+        return [(list(origins), list(zs), list(xs), params.tolist())
+                for origins, zs, xs, params in results]
 
-            # theta, 绕着zi轴，从xi-1转动到xi的角度
-               
-            # d, 沿着zi轴，从xi-1到xi的距离
-            
-            # a，沿着xi-1轴，从zi-1到zi的距离
-                
-            # alpha, 绕着xi-1轴，从zi-1转动到zi的角度
-            
-            
-            """theta"""          
-            # Project xi-1 and xi onto the plane perpendicular to zi
-            p_prev = x_prev - np.dot(x_prev, zi) * zi
-            pi = xi - np.dot(xi, zi) * zi
-                
-            # Normalize the projected vectors
-            pi_norm = pi / np.linalg.norm(pi)
-            p_prev_norm = p_prev / np.linalg.norm(p_prev)
-            
-            # Calculate cosine and sine of the angle
-            cos_theta = np.dot(p_prev_norm, pi_norm)
-            sin_theta = np.dot(np.cross(p_prev_norm, pi_norm), zi)
-            
-            # Compute the directed angle using arctan2
-            theta = np.arctan2(sin_theta, cos_theta)
-            
-            """d"""
-            d = (oi - o_prev).dot(zi)
-            
-            """a"""
-            a = (oi - o_prev).dot(x_prev)
-        
-            """alpha"""
-            # Project zi-1 and zi onto the plane perpendicular to xi-1
-            p_prev = z_prev - np.dot(z_prev, x_prev) * x_prev
-            pi = zi - np.dot(zi, x_prev) * x_prev
-            
-            # Normalize the projected vectors
-            pi_norm = pi / np.linalg.norm(pi)
-            p_prev_norm = p_prev / np.linalg.norm(p_prev)
-            
-            # Calculate cosine and sine of the angle
-            cos_theta = np.dot(p_prev_norm, pi_norm)
-            sin_theta = np.dot(np.cross(p_prev_norm, pi_norm), x_prev)
-            
-            # Compute the directed angle using arctan2
-            alpha = np.arctan2(sin_theta, cos_theta)            
-            
-            mdh_parameters.append([theta, d, a, alpha])
+    def _mdh_joint_axes(self, chain):
+        """get_joint_axes 的结果去掉 fixed 关节，只保留 base 与 revolute"""
+        joint_positions, joint_vectors, joint_xs, joint_types = self.get_joint_axes(chain)
 
-        # 最后一个joint的x轴
-        return mdh_origins, mdh_zs, mdh_xs, mdh_parameters
+        # skip fixed joints
+        keep = np.array([t=='revolute' or t =='base' for t in joint_types], dtype=bool)
+        return joint_positions[keep], joint_vectors[keep], joint_xs[keep]
 
 
 if __name__ == "__main__":
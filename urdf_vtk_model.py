@@ -1,10 +1,109 @@
 import vtk
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+# 按扩展名分派网格读取器，未列出的扩展名按 STL 处理
+_MESH_READERS = {
+    '.obj': vtk.vtkOBJReader,
+    '.ply': vtk.vtkPLYReader,
+    '.stl': vtk.vtkSTLReader,
+}
+
+
+def _mesh_cache_key(mesh_file):
+    """网格缓存键 (绝对路径, mtime)；文件不可访问时返回 None"""
+    path = os.path.abspath(mesh_file)
+    try:
+        return (path, os.path.getmtime(path))
+    except OSError:
+        return None
+
+
+def _read_mesh(mesh_file):
+    """读取单个网格文件为独立的 vtkPolyData（不访问缓存，可在工作线程中调用）"""
+    _, file_extension = os.path.splitext(mesh_file)
+    reader = _MESH_READERS.get(file_extension.lower(), vtk.vtkSTLReader)()
+    reader.SetFileName(mesh_file)
+    reader.Update()
+
+    polydata = vtk.vtkPolyData()
+    polydata.ShallowCopy(reader.GetOutput())
+    return polydata
+
+
+def load_mesh_polydata(mesh_file, cache=None):
+    """读取网格文件为 vtkPolyData，可选地通过 cache 复用已读取的结果
+
+    Args:
+        mesh_file: 网格文件路径（按扩展名选择读取器，其余按 STL 处理）
+        cache: dict，键为 (绝对路径, mtime)，值为 vtkPolyData；为 None 时不缓存
+
+    Returns:
+        vtkPolyData
+    """
+    key = _mesh_cache_key(mesh_file) if cache is not None else None
+    if key is not None and key in cache:
+        return cache[key]
+
+    polydata = _read_mesh(mesh_file)
+    if key is not None:
+        cache[key] = polydata
+    return polydata
+
+
+def preload_meshes(mesh_files, cache, max_workers=None):
+    """用线程池并行读取尚未缓存的网格文件并写入 cache
+
+    VTK 读取器在文件读取与解析期间释放 GIL，多个网格的 I/O 可以重叠；
+    mapper / actor 的创建仍由调用方在主线程完成。读取失败的文件被跳过，
+    之后由 URDFModel 按原有路径重新读取并报告错误。
+
+    Args:
+        mesh_files: 网格文件路径序列（None 项会被忽略）
+        cache: dict，与 load_mesh_polydata 共用的缓存
+        max_workers: 线程数，默认 os.cpu_count()
+    """
+    pending = {}
+    for mesh_file in mesh_files:
+        if mesh_file is None:
+            continue
+        key = _mesh_cache_key(mesh_file)
+        if key is not None and key not in cache:
+            pending[key] = mesh_file
+    if not pending:
+        return
+
+    def read(mesh_file):
+        try:
+            return _read_mesh(mesh_file)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        for key, polydata in zip(pending, executor.map(read, pending.values())):
+            if polydata is not None:
+                cache[key] = polydata
+
+
+def z_axis_endpoints(frames, axis_length=0.05):
+    """z 轴末端的世界坐标：原点 + axis_length * z 轴方向
+
+    Args:
+        frames: 4x4 或 (N,4,4) 变换矩阵
+        axis_length: 坐标轴长度
+
+    Returns:
+        (3,) 或 (N,3) ndarray
+    """
+    return frames[..., :3, 3] + axis_length * frames[..., :3, 2]
+
 
 class URDFModel:
     """Class to represent a URDF link with its mesh and transformation"""
 
-    def __init__(self, name, mesh_file, mesh_transform, link_frame, color=None, axis_text=None):
+    def __init__(self, name, mesh_file, mesh_transform, link_frame, color=None, axis_text=None,
+                 mesh_cache=None):
         self.name = name
         self.mesh_file = mesh_file
         self.mesh_transform = mesh_transform  # 4x4 transformation matrix
@@ -19,29 +118,23 @@ class URDFModel:
             self.source.SetThetaResolution(20)
             self.source.Update()
             color = [1.0, 0, 0]
+            polydata = self.source.GetOutput()
         else:
-            # Get file extension to determine the appropriate reader
-            _, file_extension = os.path.splitext(mesh_file)
-            file_extension = file_extension.lower()
-            
-            if file_extension == '.obj':
-                # Create the OBJ reader for mesh file
-                self.source = vtk.vtkOBJReader()
-                self.source.SetFileName(mesh_file)
-                self.source.Update()
-            else:
-                # Default to STL reader for mesh file (or any other extension)
-                self.source = vtk.vtkSTLReader()
-                self.source.SetFileName(mesh_file)
-                self.source.Update()
+            # 同一网格文件的 vtkPolyData 在多个 actor / 多次加载间共享
+            self.source = None
+            polydata = load_mesh_polydata(mesh_file, mesh_cache)
 
         # Create mapper and actor
         self.mapper = vtk.vtkPolyDataMapper()
-        self.mapper.SetInputConnection(self.source.GetOutputPort())
+        self.mapper.SetInputData(polydata)
 
         self.actor = vtk.vtkActor()
         self.actor.SetMapper(self.mapper)
 
+        # 持久的 vtkTransform，位姿更新时原地写入矩阵，不再每次新建
+        self.transform = vtk.vtkTransform()
+        self.actor.SetUserTransform(self.transform)
+
         # Set color for the actor
         if color is None:
             self.set_random_color()
@@ -66,10 +159,12 @@ class URDFModel:
 
             # Create coordinate axes for this link
             self.axes_actor, self.text_actor = self.create_axes_actor(self.link_frame, axis_text=axis_text)
+            self.axes_transform = self.axes_actor.GetUserTransform()
         
         else:
             self.axes_actor = None
             self.text_actor = None
+            self.axes_transform = None
 
 
     def set_random_color(self):
@@ -110,12 +205,24 @@ class URDFModel:
 
     def apply_transform(self, transform_matrix):
         """Apply a 4x4 transformation matrix to the actor"""
-        # Convert numpy matrix to vtk transform
-        vtk_transform = vtk.vtkTransform()
-        vtk_transform.SetMatrix(transform_matrix.flatten())
+        # Write the numpy matrix into the actor's persistent transform
+        self.transform.SetMatrix(transform_matrix.ravel())
+
+    def update_frame(self, transform_matrix, axis_length=0.05, anchor=None):
+        """Move the axes and text actors to a new 4x4 frame
+
+        Args:
+            transform_matrix: 4x4 transformation matrix
+            axis_length: Same axis length as used in create_axes_actor
+            anchor: Precomputed world position of the z-axis end (None to compute here)
+        """
+        if self.axes_transform is not None:
+            self.axes_transform.SetMatrix(transform_matrix.ravel())
 
-        # Apply the transform to the actor
-        self.actor.SetUserTransform(vtk_transform)
+        if self.text_actor is not None:
+            if anchor is None:
+                anchor = z_axis_endpoints(transform_matrix, axis_length)
+            self.text_actor.SetAttachmentPoint(anchor[0], anchor[1], anchor[2])
 
     def set_transparency(self, transparency):
         """Set the transparency of the model (1.0 = opaque, 0.0 = transparent)"""
@@ -144,7 +251,7 @@ class URDFModel:
 
         # Create transform
         vtk_transform = vtk.vtkTransform()
-        vtk_transform.SetMatrix(transform_matrix.flatten())
+        vtk_transform.SetMatrix(transform_matrix.ravel())
         axes.SetUserTransform(vtk_transform)
         
         # Create text actor if text is provided